@@ -7,10 +7,14 @@ Processes multiple videos sequentially with:
 - Retry/recovery on failure with exponential backoff
 - Automatic highlight clip extraction
 - Comprehensive logging
+- Optional offline Batch-API mode (--offline-batch): vision and synthesis
+  requests for the whole queue are submitted as batch jobs between passes
 
 Usage:
     python batch_processor.py
     python batch_processor.py --reprocess
+    python batch_processor.py --transcriber openai
+    python batch_processor.py --offline-batch openai
     
     Or run in background:
     nohup python batch_processor.py > batch_output.log 2>&1 &
@@ -32,6 +36,8 @@ sys.path.append(os.path.join(SCRIPT_DIR, 'scripts'))
 
 from validate_output import validate_video_output, ValidationResult
 from extract_clips import extract_clips_from_analysis
+from batch_submission import OfflineBatchSession, create_submitter, DEFERRED_EXIT_CODE
+from openai_gateway import get_client
 
 # Load .env file
 def load_env():
@@ -48,14 +54,22 @@ def load_env():
 load_env()
 
 
+# Offline passes: collect triage -> collect escalations -> collect synthesis -> write outputs (+1 for failed batch lines)
+MAX_OFFLINE_ROUNDS = 5
+
+
 class BatchProcessor:
-    def __init__(self, reprocess: bool = False):
+    def __init__(self, reprocess: bool = False, transcriber: str = 'auto', offline_batch: str = None):
         self.base_dir = SCRIPT_DIR
         self.videos_dir = os.path.join(os.path.dirname(SCRIPT_DIR), 'videos')
         self.output_dir = os.path.join(SCRIPT_DIR, 'output')
         self.log_file = os.path.join(SCRIPT_DIR, 'batch_log.txt')
         self.summary_file = os.path.join(SCRIPT_DIR, 'batch_summary.md')
         self.reprocess = reprocess
+        self.transcriber = transcriber
+        self.offline_batch = offline_batch
+        self.offline_dir = os.path.join(self.output_dir, 'offline_batch')
+        self.offline_completed = set()
         
         self.results = {
             'full_success': [],
@@ -103,10 +117,14 @@ class BatchProcessor:
         name = ''.join(c if c.isalnum() or c == '_' else '_' for c in name)
         return name
     
-    def process_video(self, video_path: str, segment_duration: int = 150) -> tuple:
+    def process_video(self, video_path: str, segment_duration: int = 150, offline: bool = False) -> tuple:
         """
         Process a single video using run_video.py
         Returns (success: bool, exit_code: int, error_message: str)
+        With offline=True, exit code DEFERRED_EXIT_CODE means requests were queued for the batch.
+        Offline passes run without frame and fingerprint reuse: a video finishing between
+        rounds would otherwise change what later videos reuse, and with it their batch
+        composition and request keys, so they would be deferred again every round.
         """
         run_script = os.path.join(SCRIPT_DIR, 'run_video.py')
         
@@ -114,11 +132,15 @@ class BatchProcessor:
             sys.executable,
             run_script,
             video_path,
-            '--segment-duration', str(segment_duration)
+            '--segment-duration', str(segment_duration),
+            '--transcriber', self.transcriber
         ]
         
         if self.reprocess:
             cmd.append('--reprocess')
+
+        if offline:
+            cmd.extend(['--offline-session', self.offline_dir, '--no-frame-reuse', '--no-fingerprint-reuse'])
         
         try:
             result = subprocess.run(
@@ -168,6 +190,46 @@ class BatchProcessor:
 
         return success, exit_code, error
     
+    def needs_processing(self, video_filename: str) -> bool:
+        analysis_json = os.path.join(self.output_dir, self.get_output_dir_name(video_filename),
+                                     'analysis', 'simple_director_analysis.json')
+        return self.reprocess or not os.path.exists(analysis_json)
+
+    def run_offline_rounds(self, videos: list):
+        """
+        Offline batch mode: run the queue with requests deferred, submit what was
+        queued as batch jobs, ingest the answers and run the waiting videos again.
+        Videos still unfinished afterwards fall through to the normal synchronous path.
+        """
+        session = OfflineBatchSession(self.offline_dir)
+        submitter = create_submitter(self.offline_batch, get_client(os.environ.get('OPENAI_API_KEY')))
+
+        waiting = [video for video in videos if self.needs_processing(video)]
+        for round_num in range(1, MAX_OFFLINE_ROUNDS + 1):
+            if not waiting:
+                break
+            self.log(f"\nOffline batch round {round_num}: {len(waiting)} video(s)")
+
+            still_waiting = []
+            for video in waiting:
+                success, exit_code, error = self.process_video(os.path.join(self.videos_dir, video), offline=True)
+                if success:
+                    self.offline_completed.add(video)
+                    self.log(f"  {video}: complete")
+                elif exit_code == DEFERRED_EXIT_CODE:
+                    still_waiting.append(video)
+                else:
+                    self.log(f"  {video}: failed in offline mode (exit {exit_code}), will run synchronously")
+            waiting = still_waiting
+
+            if waiting:
+                self.log(f"  Submitting {session.pending_count()} queued requests ({self.offline_batch} batch)...")
+                succeeded, failed = session.run_round(submitter, log=self.log)
+                self.log(f"  Round {round_num}: {succeeded} answered, {failed} failed")
+
+        if waiting:
+            self.log(f"  {len(waiting)} video(s) still waiting after {MAX_OFFLINE_ROUNDS} rounds, running synchronously")
+
     def diagnose_and_fix(self, video_path: str, validation: ValidationResult) -> str:
         """
         Attempt to diagnose and fix validation failures
@@ -217,7 +279,9 @@ class BatchProcessor:
         
         # Check if already processed (skip unless --reprocess flag is set)
         analysis_json = os.path.join(output_path, 'analysis', 'simple_director_analysis.json')
-        if os.path.exists(analysis_json) and not self.reprocess:
+        if video_filename in self.offline_completed:
+            self.log(f"  Analyzed in offline batch mode, validating...")
+        elif os.path.exists(analysis_json) and not self.reprocess:
             self.log(f"  Already processed, skipping to clip extraction...")
             result['status'] = 'already_processed'
         else:
@@ -313,6 +377,8 @@ class BatchProcessor:
             f.write(f"Duration: {hours}h {minutes}m\n")
             if self.reprocess:
                 f.write(f"Mode: Reprocess (forced re-analysis)\n")
+            if self.offline_batch:
+                f.write(f"Offline batch: {self.offline_batch} ({len(self.offline_completed)} videos via batch jobs)\n")
             f.write("\n")
             
             f.write("## Results\n\n")
@@ -356,7 +422,7 @@ class BatchProcessor:
         # Initialize log
         with open(self.log_file, 'w') as f:
             f.write(f"=== BATCH PROCESSING STARTED: {self.results['start_time'].strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-            f.write(f"=== Model: GPT-5.1 | Reprocess: {self.reprocess} ===\n\n")
+            f.write(f"=== Model: GPT-5.1 | Reprocess: {self.reprocess} | Transcriber: {self.transcriber} | Offline batch: {self.offline_batch} ===\n\n")
         
         self.log("Loading video queue...")
         videos = self.load_queue()
@@ -367,6 +433,9 @@ class BatchProcessor:
         
         self.log(f"Found {len(videos)} videos to process")
         self.log(f"Using GPT-5.1 for analysis (2h timeout per video)\n")
+
+        if self.offline_batch:
+            self.run_offline_rounds(videos)
         
         # Process each video
         for i, video in enumerate(videos, 1):
@@ -393,9 +462,13 @@ class BatchProcessor:
 def main():
     parser = argparse.ArgumentParser(description='Pete Dye Story - Batch Video Processor')
     parser.add_argument('--reprocess', action='store_true', help='Force re-analysis of already-processed videos')
+    parser.add_argument('--transcriber', choices=['openai', 'local', 'auto'], default='auto',
+                        help='Speech-to-text backend passed to run_video.py (default: auto = OpenAI with local overflow on rate limits)')
+    parser.add_argument('--offline-batch', choices=['openai'],
+                        help='Submit vision/synthesis requests for the whole queue as batch jobs (openai: Batch API)')
     args = parser.parse_args()
     
-    processor = BatchProcessor(reprocess=args.reprocess)
+    processor = BatchProcessor(reprocess=args.reprocess, transcriber=args.transcriber, offline_batch=args.offline_batch)
     asyncio.run(processor.run())
 
 
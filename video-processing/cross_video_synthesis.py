@@ -49,6 +49,9 @@ def load_env():
 
 load_env()
 
+sys.path.append(os.path.join(SCRIPT_DIR, 'scripts'))
+from openai_gateway import call_openai, get_client
+
 
 # ---------------------------------------------------------------------------
 # Scanning & loading
@@ -458,13 +461,11 @@ def generate_narrative_synthesis(
         return None
 
     try:
-        from openai import OpenAI
+        client = get_client(api_key)
     except ImportError:
         print("  openai package not installed — skipping GPT-5.1 narrative synthesis.")
         return None
 
-    client = OpenAI(api_key=api_key)
-
     # Build a concise context payload (trim to avoid exceeding context window)
     top_characters = character_profiles.get('characters', [])[:10]
     char_summary = "\n".join(
@@ -490,11 +491,22 @@ def generate_narrative_synthesis(
     cr = coverage_report
     gaps = ", ".join(cr.get('footage_gaps', [])) or "None detected"
 
-    prompt = f"""You are a documentary researcher synthesizing findings across an entire video archive
+    # Static brief first (cacheable across runs), the archive's aggregated data last
+    instructions = """You are a documentary researcher synthesizing findings across an entire video archive
 for "The Pete Dye Story" — the 25-year journey (1978-2004) of building the Pete Dye Golf Club
 in West Virginia.
 
-Here is the aggregated data from {cr['total_videos']} processed videos:
+Write a 600-800 word NARRATIVE SYNTHESIS for the producer from the aggregated data in the user message. Cover:
+1. The overall arc of the story as told through the footage
+2. Which characters emerge as central and why
+3. Key thematic threads and how they weave through the archive
+4. Notable gaps or areas where additional footage/interviews would strengthen the documentary
+5. Recommendations for the narrative structure of the final documentary
+
+Write in a professional but engaging tone, as if preparing a research brief for a documentary director.
+"""
+
+    prompt = f"""Here is the aggregated data from {cr['total_videos']} processed videos:
 
 ## Coverage
 - Total videos analyzed: {cr['total_videos']}
@@ -511,24 +523,17 @@ Here is the aggregated data from {cr['total_videos']} processed videos:
 
 ## Timeline (sample of {len(timeline_events)} events)
 {timeline_summary}
-
----
-
-Write a 600-800 word NARRATIVE SYNTHESIS for the producer. Cover:
-1. The overall arc of the story as told through the footage
-2. Which characters emerge as central and why
-3. Key thematic threads and how they weave through the archive
-4. Notable gaps or areas where additional footage/interviews would strengthen the documentary
-5. Recommendations for the narrative structure of the final documentary
-
-Write in a professional but engaging tone, as if preparing a research brief for a documentary director.
 """
 
     try:
         print("  Sending to GPT-5.1 for narrative synthesis...")
-        response = client.chat.completions.create(
+        response = call_openai(
+            'synthesis', client.chat.completions,
             model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
+            messages=[
+                {"role": "system", "content": instructions},
+                {"role": "user", "content": prompt}
+            ],
             max_completion_tokens=8000,
             temperature=0.3,
         )
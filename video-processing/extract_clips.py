@@ -11,24 +11,46 @@ Extracts highlight clips from processed videos based on:
 Priority system (highest first):
     5 - Chapters featuring Pete Dye
     4 - Highlights with emotional tone (emotional/proud/heartfelt)
-    3 - Chapters with any named characters
+    3 - Chapters with any named characters; top-scoring local windows
     2 - Other chapters
-    1 - Segment-based clips
+    1 - Segment-based clips; other scored windows
     0 - Evenly-spaced filler clips
 
+Scored windows come from the local highlight scoring engine
+(scripts/highlight_scoring.py): audio energy, applause, motion, speech
+density, character-name hits and per-frame vision events combined per
+second. The same scores snap LLM highlight timestamps to the strongest
+nearby window.
+
 Backward compatible: falls back to regex-based extraction when
-the new structured fields are absent (legacy synthesis_text format).
+the new structured fields are absent (legacy synthesis_text format),
+and to segments scored from per-frame vision records (or keywords, for
+videos processed before frame records) when no local features are available.
 
 Extracts up to 10 clips per video.
 """
 
 import os
+import sys
 import json
 import re
 import subprocess
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+# Add scripts folder to path
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(SCRIPT_DIR, 'scripts'))
+
+from highlight_scoring import (
+    HighlightScores, load_characters, rank_windows, refine_start, score_video
+)
+from timed_transcript import TimedTranscript
+from frame_records import FrameRecord, load_frame_records
+
+# Mean combined score (robust z units) above which a window counts as a top pick
+SCORED_WINDOW_HIGH = 1.0
+
 
 @dataclass
 class ClipInfo:
@@ -228,13 +250,40 @@ def _extract_highlights_legacy(video_analysis: dict) -> List[ClipInfo]:
     return clips
 
 
-def extract_clips_from_segments(analysis_data: dict) -> List[ClipInfo]:
+def score_frame_records(records: List[FrameRecord]) -> Tuple[int, str]:
+    """Priority and description for a segment from its structured frame records"""
+    priority = 0
+    description = ""
+    event_types = {record.event_type for record in records}
+
+    if any('pete dye' in person.lower() for record in records for person in record.people):
+        priority += 3
+        description = "Pete Dye content"
+    if 'construction' in event_types:
+        priority += 2
+        description = description or "Construction activity"
+    if 'interview' in event_types or any(record.speaking for record in records):
+        priority += 1
+        description = description or "Interview/dialogue"
+    if event_types & {'ceremony', 'award'}:
+        priority += 2
+        description = description or "Opening/ceremony"
+    if event_types & {'golf_course', 'tournament'}:
+        priority += 1
+        description = description or "Golf course footage"
+    return priority, description
+
+
+def extract_clips_from_segments(analysis_data: dict,
+                                frame_records: Optional[List[FrameRecord]] = None) -> List[ClipInfo]:
     """
     Extract clip info from raw_segments array (fallback / legacy data).
 
     Reads from analysis_data["raw_segments"]. Each segment has:
       - timestamp_range: "H:MM:SS - H:MM:SS"
       - multimodal_analysis: free-text analysis of visual/audio content
+    Segments are scored from the frame records inside their range when
+    available, otherwise by keywords in the free text.
     """
     clips = []
 
@@ -255,6 +304,19 @@ def extract_clips_from_segments(analysis_data: dict) -> List[ClipInfo]:
         start, end = match.groups()
         start_secs = parse_timestamp(start)
 
+        if frame_records:
+            end_secs = parse_timestamp(end)
+            segment_records = [r for r in frame_records if start_secs <= r.seconds < end_secs]
+            priority, description = score_frame_records(segment_records)
+            if priority > 0 and description:
+                clips.append(ClipInfo(
+                    start_time=seconds_to_timestamp(start_secs),
+                    duration="120",
+                    description=description,
+                    priority=min(priority, 1)
+                ))
+            continue
+
         # Score content by keyword matching
         priority = 0
         description = ""
@@ -297,6 +359,73 @@ def extract_clips_from_segments(analysis_data: dict) -> List[ClipInfo]:
     return clips
 
 
+def extract_clips_from_scores(scores: HighlightScores, max_clips: int = 10,
+                              clip_duration: int = 90,
+                              transcript: Optional[TimedTranscript] = None,
+                              weights: Dict[str, float] = None,
+                              frame_records: Optional[List[FrameRecord]] = None) -> List[ClipInfo]:
+    """
+    Rank non-overlapping windows of the local highlight score.
+
+    Windows whose mean score is clearly above the video's typical level get
+    priority 3; the rest get the segment-level priority 1. Each window is
+    named after the feature contributing most to its score (weighted robust
+    z units, as in the combined score, so tracks with larger raw units do
+    not always win). Dialogue windows add their opening words when a
+    transcript is available; frame-event windows are described from the
+    frame records inside them.
+    """
+    contributions = scores.contributions(weights)
+    contributions.pop('audio_energy', None)
+
+    clips = []
+    for start_secs, mean_score in rank_windows(scores.score, clip_duration, max_clips):
+        if mean_score <= 0:
+            break
+
+        # Describe the window by its strongest contributing feature
+        strongest = max(
+            contributions,
+            key=lambda name: float(contributions[name][start_secs:start_secs + clip_duration].mean()),
+            default=None
+        )
+        description = {
+            'applause': "Applause moment",
+            'character_hits': "Named characters",
+            'speech_density': "Dialogue",
+            'motion': "Action",
+            'frame_events': "Key scene",
+        }.get(strongest, "Scored moment")
+
+        if frame_records and strongest == 'frame_events':
+            window_records = [r for r in frame_records if start_secs <= r.seconds < start_secs + clip_duration]
+            description = score_frame_records(window_records)[1] or description
+
+        if transcript is not None and strongest in ('speech_density', 'character_hits'):
+            opening = transcript.text_between(start_secs, start_secs + clip_duration, fallback=False).split()[:6]
+            if opening:
+                description = f"{description} - {' '.join(opening)}"
+
+        clips.append(ClipInfo(
+            start_time=seconds_to_timestamp(start_secs),
+            duration=str(clip_duration),
+            description=description,
+            priority=3 if mean_score >= SCORED_WINDOW_HIGH else 1
+        ))
+
+    return clips
+
+
+def refine_clip_starts(clips: List[ClipInfo], scores: HighlightScores, search: int = 30):
+    """Snap LLM-provided clip starts to the best-scoring window nearby (in place)"""
+    for clip in clips:
+        start_secs = parse_timestamp(clip.start_time)
+        dur_secs = int(clip.duration) if clip.duration.isdigit() else parse_timestamp(clip.duration)
+        if start_secs >= scores.duration:
+            continue
+        clip.start_time = seconds_to_timestamp(refine_start(scores, start_secs, dur_secs, search))
+
+
 # ---------------------------------------------------------------------------
 # Filler / utility functions
 # ---------------------------------------------------------------------------
@@ -397,30 +526,51 @@ def extract_clips_from_analysis(video_path: str, output_dir: str, max_clips: int
     os.makedirs(clips_dir, exist_ok=True)
 
     analysis_path = os.path.join(output_dir, 'analysis', 'simple_director_analysis.json')
+    video_duration = get_video_duration(video_path)
 
     # Load analysis data
     if not os.path.exists(analysis_path):
         # No analysis — generate evenly spaced clips
-        duration = get_video_duration(video_path)
-        if duration > 0:
-            clip_infos = generate_evenly_spaced_clips(duration, min(5, max_clips))
+        if video_duration > 0:
+            clip_infos = generate_evenly_spaced_clips(video_duration, min(5, max_clips))
         else:
             return []
     else:
         with open(analysis_path, 'r') as f:
             analysis_data = json.load(f)
 
+        # Local feature scores (audio, motion, speech, names) - no API calls
+        scores = None
+        transcript = None
+        frame_records = load_frame_records(os.path.join(output_dir, 'analysis'))
+        try:
+            transcript = TimedTranscript.load(os.path.join(output_dir, 'analysis'), video_duration)
+            characters = load_characters(os.path.join(SCRIPT_DIR, 'characters.json'))
+            scores = score_video(output_dir, video_duration, video_path=video_path,
+                                 characters=characters, analysis_data=analysis_data, transcript=transcript,
+                                 frame_records=frame_records)
+        except Exception as e:
+            print(f"Highlight scoring unavailable: {e}")
+
         # Collect clips from multiple sources (priority handled per-function)
         all_clips = []
         all_clips.extend(extract_clips_from_chapters(analysis_data))
-        all_clips.extend(extract_clips_from_highlights(analysis_data))
-        all_clips.extend(extract_clips_from_segments(analysis_data))
+
+        highlight_clips = extract_clips_from_highlights(analysis_data)
+        if scores is not None:
+            refine_clip_starts(highlight_clips, scores)
+        all_clips.extend(highlight_clips)
+
+        if scores is not None:
+            all_clips.extend(extract_clips_from_scores(scores, max_clips, transcript=transcript,
+                                                       frame_records=frame_records))
+        else:
+            all_clips.extend(extract_clips_from_segments(analysis_data, frame_records))
 
         # If we don't have enough clips, add evenly spaced fillers
         if len(all_clips) < max_clips:
-            duration = get_video_duration(video_path)
-            if duration > 0:
-                filler_clips = generate_evenly_spaced_clips(duration, max_clips - len(all_clips))
+            if video_duration > 0:
+                filler_clips = generate_evenly_spaced_clips(video_duration, max_clips - len(all_clips))
                 all_clips.extend(filler_clips)
 
         # Sort by priority (highest first) and deduplicate by start time
@@ -449,7 +599,6 @@ def extract_clips_from_analysis(video_path: str, output_dir: str, max_clips: int
 
     # Clamp all clip timestamps to the actual video duration
     # (GPT-5.1 sometimes hallucinates timestamps beyond the video end)
-    video_duration = get_video_duration(video_path)
     if video_duration > 0:
         valid_clip_infos = []
         for clip in clip_infos:
@@ -39,7 +39,7 @@ scripts_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts
 sys.path.append(scripts_path)
 
 from simple_director import SimpleDirector
-from openai import OpenAI
+from openai_gateway import call_openai, get_client, prompt_cache_usage
 
 
 REVIEW_SCHEMA = {
@@ -178,11 +178,13 @@ def load_existing_transcript(output_dir: str) -> str:
 
 def run_comparison(analysis: dict, transcript: str, outline: str, model: str = "gpt-5.1") -> dict:
     """Send analysis + outline to GPT-5.1 for structured editorial comparison."""
-    client = OpenAI(api_key=os.environ.get('OPENAI_API_KEY'))
+    client = get_client(os.environ.get('OPENAI_API_KEY'))
 
     video_analysis = analysis.get('video_analysis', {})
     analysis_json = json.dumps(video_analysis, indent=2)
 
+    # Instructions and the outline are the same for every rough cut: they form the
+    # leading, cacheable prefix; the rough cut's own analysis and transcript come last.
     system_message = (
         "You are an experienced documentary film editor reviewing a rough cut against a "
         "story outline. Your job is to produce specific, actionable editorial guidance — "
@@ -190,32 +192,32 @@ def run_comparison(analysis: dict, transcript: str, outline: str, model: str = "
         "editor can locate the moments you're discussing.\n\n"
         "The outline defines a 3-act documentary structure with specific emotional anchor "
         "moments, themes, and central characters. Compare what's in the rough cut to what "
-        "the outline calls for, and produce clear instructions for the editor."
-    )
-
-    user_message = (
-        "Compare this rough cut analysis against the documentary outline below. "
-        "Produce a structured editorial review.\n\n"
-        "=== ROUGH CUT ANALYSIS (structured) ===\n"
-        f"{analysis_json}\n\n"
-        "=== ROUGH CUT FULL TRANSCRIPT ===\n"
-        f"{transcript}\n\n"
-        "=== DOCUMENTARY OUTLINE ===\n"
-        f"{outline}\n\n"
-        "Based on the above, produce your editorial review. For each act, identify what "
+        "the outline calls for, and produce clear instructions for the editor.\n\n"
+        "Compare the rough cut analysis in the user message against the documentary outline "
+        "below and produce a structured editorial review. For each act, identify what "
         "the rough cut covers and what's missing relative to the outline. Check whether "
         "the 3 key emotional moments (Pete names the club, the bell on #12, Opening Day) "
         "are present and positioned correctly. Assess the 5 themes (Perseverance, "
         "Partnership, WV Pride, Heritage, Legacy) and 4 central characters (James D. "
         "LaRosa, Jimmy LaRosa, Pete Dye, Alice Dye). Then provide a prioritized list of "
         "the most impactful editorial changes, written as direct instructions to the editor. "
-        "Reference specific timestamps from the rough cut where possible."
+        "Reference specific timestamps from the rough cut where possible.\n\n"
+        "=== DOCUMENTARY OUTLINE ===\n"
+        f"{outline}"
+    )
+
+    user_message = (
+        "=== ROUGH CUT ANALYSIS (structured) ===\n"
+        f"{analysis_json}\n\n"
+        "=== ROUGH CUT FULL TRANSCRIPT ===\n"
+        f"{transcript}"
     )
 
     print(f"   Sending to {model} for editorial comparison...")
     start = time.time()
 
-    response = client.chat.completions.create(
+    response = call_openai(
+        'synthesis', client.chat.completions,
         model=model,
         messages=[
             {"role": "system", "content": system_message},
@@ -235,6 +237,9 @@ def run_comparison(analysis: dict, transcript: str, outline: str, model: str = "
 
     elapsed = time.time() - start
     print(f"   Comparison complete in {elapsed:.0f}s")
+    prompt_tokens, cached_tokens = prompt_cache_usage(response)
+    if prompt_tokens:
+        print(f"   Prompt cache: {cached_tokens:,} of {prompt_tokens:,} prompt tokens cached")
 
     return json.loads(response.choices[0].message.content)
 
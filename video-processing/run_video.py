@@ -7,6 +7,13 @@ Usage:
     python run_video.py path/to/video.mp4 --model gpt-5.1
     python run_video.py path/to/video.mp4 --skip-diarization
     python run_video.py path/to/video.mp4 --segment-duration 300
+    python run_video.py path/to/video.mp4 --no-speech-gate
+    python run_video.py path/to/video.mp4 --transcriber local
+    python run_video.py path/to/video.mp4 --no-fingerprint-reuse
+    python run_video.py path/to/video.mp4 --vision-concurrency 4
+    python run_video.py path/to/video.mp4 --reprocess --no-vision-cache
+    python run_video.py path/to/video.mp4 --no-cascade
+    python run_video.py path/to/video.mp4 --no-frame-reuse
 
 Requirements:
     - OPENAI_API_KEY in .env file or environment
@@ -38,6 +45,8 @@ scripts_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts
 sys.path.append(scripts_path)
 
 from simple_director import SimpleDirector
+from batch_submission import OfflineBatchSession, DEFERRED_EXIT_CODE
+from openai_gateway import set_offline_session
 
 
 def print_usage():
@@ -55,6 +64,21 @@ OPTIONS:
     --model MODEL           AI model: gpt-5.1 (default) or gpt-4o (legacy)
     --skip-diarization      Skip speaker diarization for videos with no speech
     --reprocess             Force re-analysis even if output already exists
+    --no-speech-gate        Transcribe the whole audio track (skip local speech detection)
+    --transcriber NAME      openai (default), local (offline faster-whisper on CPU),
+                            or auto (OpenAI, overflowing to local when rate-limited)
+    --no-fingerprint-reuse  Transcribe everything, even audio already transcribed
+                            in another video (duplicate discs, compilations)
+    --vision-concurrency N  Max vision batches in flight across all segments (default: 8)
+    --no-vision-cache       Re-send every vision batch, even ones answered before
+                            (cached by frame hashes + prompt + model)
+    --no-cascade            Send every frame to GPT-5.1 (skip the gpt-4.1-mini triage pass
+                            that only escalates frames with people, text, ceremonies or doubt)
+    --no-frame-reuse        Analyze every frame, even footage already analyzed in another
+                            video (matched by perceptual hash; see scripts/frame_index.py)
+    --offline-session DIR   Offline batch mode (used by batch_processor.py --offline-batch):
+                            queue vision/synthesis requests in DIR instead of sending them,
+                            exit with code 3 until every request has been answered
 
 EXAMPLES:
     python run_video.py media/construction_footage.mp4
@@ -85,7 +109,11 @@ OUTPUT:
 
 async def run_analysis(video_path: str, segment_duration: int = 150,
                        model: str = 'gpt-5.1', enable_diarization: bool = False,
-                       reprocess: bool = False):
+                       reprocess: bool = False, speech_gate: bool = True,
+                       transcriber: str = 'openai', fingerprint_reuse: bool = True,
+                       vision_concurrency: int = 8, vision_cache: bool = True,
+                       offline_session: str = None, vision_cascade: bool = True,
+                       frame_reuse: bool = True):
     """Run video analysis on the specified file"""
     
     # Check for API key
@@ -112,6 +140,21 @@ async def run_analysis(video_path: str, segment_duration: int = 150,
         print(f"Diarization: ENABLED (adds ~3-5 min)")
     if reprocess:
         print(f"Mode: REPROCESS (forcing re-analysis)")
+    if not speech_gate:
+        print(f"Speech gate: DISABLED (transcribing full audio track)")
+    print(f"Transcriber: {transcriber}")
+    if not fingerprint_reuse:
+        print(f"Fingerprint reuse: DISABLED (transcribing duplicate audio again)")
+    print(f"Vision concurrency: {vision_concurrency} batches in flight")
+    if offline_session:
+        print(f"Offline batch session: {offline_session}")
+        set_offline_session(OfflineBatchSession(offline_session))
+    if not vision_cache:
+        print(f"Vision cache: DISABLED (re-sending every frame batch)")
+    if not vision_cascade:
+        print(f"Vision cascade: DISABLED (every frame to GPT-5.1)")
+    if not frame_reuse:
+        print(f"Frame reuse: DISABLED (analyzing footage already seen in other videos)")
     print()
 
     # Initialize director with model and diarization options
@@ -120,7 +163,14 @@ async def run_analysis(video_path: str, segment_duration: int = 150,
         openai_api_key,
         base_dir=base_dir,
         model=model,
-        enable_diarization=enable_diarization
+        enable_diarization=enable_diarization,
+        speech_gate=speech_gate,
+        transcriber=transcriber,
+        fingerprint_reuse=fingerprint_reuse,
+        vision_concurrency=vision_concurrency,
+        vision_cache=vision_cache,
+        vision_cascade=vision_cascade,
+        frame_reuse=frame_reuse
     )
 
     # Run analysis
@@ -136,6 +186,21 @@ def main():
     parser.add_argument('--model', choices=['gpt-4o', 'gpt-5.1'], default='gpt-5.1', help='AI model to use (default: gpt-5.1)')
     parser.add_argument('--diarize', action='store_true', help='Enable speaker diarization (slower, adds ~3-5 min per video)')
     parser.add_argument('--reprocess', action='store_true', help='Force re-analysis even if output already exists')
+    parser.add_argument('--no-speech-gate', action='store_true', help='Transcribe the full audio track instead of only detected speech')
+    parser.add_argument('--transcriber', choices=['openai', 'local', 'auto'], default='openai',
+                        help='Speech-to-text backend: openai (default), local (faster-whisper CPU) or auto (local overflow on rate limits)')
+    parser.add_argument('--no-fingerprint-reuse', action='store_true',
+                        help='Do not reuse transcripts of audio already transcribed in other videos')
+    parser.add_argument('--vision-concurrency', type=int, default=8,
+                        help='Max vision batches in flight across all segments (default: 8)')
+    parser.add_argument('--no-vision-cache', action='store_true',
+                        help='Do not reuse cached responses for identical vision batches')
+    parser.add_argument('--no-cascade', action='store_true',
+                        help='Send every frame to GPT-5.1 instead of triaging batches with a cheaper model first')
+    parser.add_argument('--no-frame-reuse', action='store_true',
+                        help='Do not reuse frame analyses of footage already analyzed in other videos')
+    parser.add_argument('--offline-session', metavar='DIR',
+                        help='Queue vision/synthesis requests for the Batch API in DIR (see batch_processor.py --offline-batch)')
     args = parser.parse_args()
 
     # Run the analysis
@@ -147,10 +212,21 @@ def main():
         segment_duration=args.segment_duration,
         model=args.model,
         enable_diarization=args.diarize,
-        reprocess=args.reprocess
+        reprocess=args.reprocess,
+        speech_gate=not args.no_speech_gate,
+        transcriber=args.transcriber,
+        fingerprint_reuse=not args.no_fingerprint_reuse,
+        vision_concurrency=args.vision_concurrency,
+        vision_cache=not args.no_vision_cache,
+        offline_session=args.offline_session,
+        vision_cascade=not args.no_cascade,
+        frame_reuse=not args.no_frame_reuse
     ))
     
-    if result:
+    if result and result.get('deferred'):
+        print(f"\nWaiting for the offline batch ({result['waiting_for']}).")
+        sys.exit(DEFERRED_EXIT_CODE)
+    elif result:
         print("\n" + "=" * 50)
         print("ANALYSIS COMPLETE!")
         print("=" * 50)
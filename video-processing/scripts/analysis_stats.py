@@ -0,0 +1,64 @@
+"""
+Analysis Stats - Counters for One Video's Analysis
+Vision cache, cascade and prompt-cache counters scoped to a single
+SimpleDirector.analyze_video run.
+
+Part of the Pete Dye Story video processing system.
+
+The VisionCache, VisionCascade and the OpenAI gateway's controller are
+shared by every video analyzed on one director (analyze_videos runs several
+at once), so their own counters are cumulative across all of them. Each
+analyze_video creates one AnalysisStats and passes it down to the vision
+batchers and acall_openai; its numbers are what that video's analysis
+metadata records.
+
+Usage:
+    run_stats = AnalysisStats(triage_model)
+    ... pass run_stats= through process_video_visual_only* / acall_openai ...
+    metadata['vision_cascade'] = run_stats.cascade.stats()
+"""
+
+import threading
+
+from openai_gateway import prompt_cache_usage
+from vision_cascade import VisionCascade, TRIAGE_MODEL
+
+
+class AnalysisStats:
+    """Per-video vision cache hits, cascade escalations and prompt-cache usage"""
+
+    def __init__(self, triage_model: str = TRIAGE_MODEL):
+        self.cascade = VisionCascade(triage_model)     # its counters only, for this video
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._prompt_cache = {}                        # kind -> {requests, prompt_tokens, cached_tokens}
+        self._lock = threading.Lock()
+
+    def record_cache(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def record_usage(self, kind: str, response):
+        """Tally prompt and cached prompt tokens of a completed request"""
+        prompt_tokens, cached_tokens = prompt_cache_usage(response)
+        if not prompt_tokens:
+            return
+        with self._lock:
+            entry = self._prompt_cache.setdefault(kind, {'requests': 0, 'prompt_tokens': 0, 'cached_tokens': 0})
+            entry['requests'] += 1
+            entry['prompt_tokens'] += prompt_tokens
+            entry['cached_tokens'] += cached_tokens
+
+    def cache_stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.cache_hits, 'misses': self.cache_misses}
+
+    def prompt_cache(self) -> dict:
+        with self._lock:
+            return {
+                kind: dict(entry, hit_rate=round(entry['cached_tokens'] / entry['prompt_tokens'], 3))
+                for kind, entry in self._prompt_cache.items()
+            }
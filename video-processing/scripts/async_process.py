@@ -0,0 +1,37 @@
+"""
+Async Process - ffmpeg / ffprobe Without Blocking the Event Loop
+Thin wrappers over asyncio.create_subprocess_exec.
+
+Part of the Pete Dye Story video processing system.
+
+SimpleDirector.analyze_video is a coroutine; a subprocess.run() inside it
+stalls every other segment (and every other video) sharing the loop until
+ffmpeg exits. These helpers await the process instead.
+
+Usage:
+    returncode, stdout, stderr = await run_process(['ffmpeg', '-i', src, ...])
+    duration = await probe_duration(path)
+"""
+
+import asyncio
+from typing import List, Tuple
+
+
+async def run_process(cmd: List[str]) -> Tuple[int, str, str]:
+    """Run cmd to completion; returns (returncode, stdout, stderr)"""
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    return process.returncode, stdout.decode(errors='replace'), stderr.decode(errors='replace')
+
+
+async def probe_duration(path: str) -> float:
+    """Container duration in seconds via ffprobe (0.0 when it cannot be read)"""
+    try:
+        _, stdout, _ = await run_process(
+            ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', '-of', 'csv=p=0', path]
+        )
+        return float(stdout.strip())
+    except Exception:
+        return 0.0
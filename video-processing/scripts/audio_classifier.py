@@ -0,0 +1,260 @@
+"""
+Audio Scene Classifier
+Lightweight spectral classifier that labels audio windows as speech, music,
+applause or noise using NumPy FFT features (no API calls).
+
+Part of the Pete Dye Story video processing system.
+
+Used by SimpleDirector to:
+  - Gate transcription: only speech windows are sent to gpt-4o-transcribe
+  - Save per-second labels (audio_labels.json) so highlight scoring can use
+    applause peaks and audio energy
+
+Features per window (computed on 32ms sub-frames, 16ms hop):
+  - Energy (dBFS) and sub-frame energy variation
+  - Spectral flatness (noise-like vs tonal)
+  - Spectral centroid
+  - Syllabic modulation: share of envelope energy at 2-8 Hz (speech rhythm)
+"""
+
+import json
+import subprocess
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+SAMPLE_RATE = 8000          # Plenty for speech/music/applause discrimination
+WINDOW_SECONDS = 1.0        # One label per second
+FRAME_LENGTH = 256          # 32ms sub-frames at 8kHz
+FRAME_HOP = 128             # 16ms hop
+
+LABELS = ('speech', 'music', 'applause', 'noise')
+
+# Heuristic thresholds (hand-set, not fitted to labelled audio; the director
+# transcribes the whole track when no speech is found at all)
+SILENCE_DB = -45.0          # Windows quieter than this are noise
+APPLAUSE_FLATNESS = 0.30    # Applause is broadband and noise-like
+APPLAUSE_CENTROID_HZ = 1400.0
+APPLAUSE_ENERGY_STD = 1.0   # Claps fluctuate; steady tape hiss does not
+SPEECH_MODULATION = 0.30    # Share of envelope energy in the 2-8 Hz band
+SPEECH_ENERGY_STD = 4.0     # dB spread across sub-frames (syllables and pauses)
+MUSIC_FLATNESS = 0.12       # Music is tonal (low flatness)
+MUSIC_ENERGY_STD = 3.5      # ...and has a steady envelope
+
+
+def decode_audio_pcm(audio_path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode any audio/video file to mono int16 PCM using ffmpeg"""
+    cmd = [
+        'ffmpeg', '-v', 'quiet', '-i', audio_path,
+        '-ac', '1', '-ar', str(sample_rate),
+        '-f', 's16le', '-'
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise Exception(f"Failed to decode audio: {result.stderr.decode(errors='ignore')}")
+    return np.frombuffer(result.stdout, dtype=np.int16)
+
+
+@dataclass
+class AudioClassification:
+    """Per-window audio labels plus the features highlight scoring needs"""
+    window_seconds: float
+    labels: List[str]
+    energy_db: np.ndarray
+    applause_score: np.ndarray
+    speech_score: np.ndarray = field(default=None)
+
+    @property
+    def duration(self) -> float:
+        return len(self.labels) * self.window_seconds
+
+    def summary(self) -> dict:
+        """Seconds of audio per label"""
+        return {label: self.labels.count(label) * self.window_seconds for label in LABELS}
+
+    def speech_fraction(self) -> float:
+        if not self.labels:
+            return 0.0
+        return self.labels.count('speech') / len(self.labels)
+
+    def speech_spans(self, pad: float = 0.5, merge_gap: float = 2.0, min_length: float = 1.0) -> List[Tuple[float, float]]:
+        """
+        Merge consecutive speech windows into (start, end) spans in seconds.
+
+        Spans are padded so words at the edges are not clipped, and spans
+        separated by less than merge_gap are joined to keep sentences whole.
+        """
+        spans = []
+        for i, label in enumerate(self.labels):
+            if label != 'speech':
+                continue
+            start = max(0.0, i * self.window_seconds - pad)
+            end = min(self.duration, (i + 1) * self.window_seconds + pad)
+            if spans and start - spans[-1][1] <= merge_gap:
+                spans[-1] = (spans[-1][0], end)
+            else:
+                spans.append((start, end))
+
+        return [(s, e) for s, e in spans if e - s >= min_length]
+
+    def applause_peaks(self, min_score: float = 0.5) -> List[float]:
+        """Start times (seconds) of applause windows that are local maxima"""
+        scores = self.applause_score
+        if len(scores) == 0:
+            return []
+        padded = np.concatenate(([-np.inf], scores, [-np.inf]))
+        is_peak = (scores >= padded[:-2]) & (scores > padded[2:]) & (scores >= min_score)
+        labels = np.array(self.labels)
+        is_peak &= labels == 'applause'
+        return [float(i * self.window_seconds) for i in np.flatnonzero(is_peak)]
+
+    def to_dict(self) -> dict:
+        return {
+            'window_seconds': self.window_seconds,
+            'labels': self.labels,
+            'energy_db': [round(float(v), 2) for v in self.energy_db],
+            'applause_score': [round(float(v), 3) for v in self.applause_score],
+            'speech_score': [round(float(v), 3) for v in self.speech_score] if self.speech_score is not None else [],
+            'speech_spans': [[round(s, 2), round(e, 2)] for s, e in self.speech_spans()],
+            'applause_peaks': self.applause_peaks(),
+            'summary': self.summary()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AudioClassification':
+        return cls(
+            window_seconds=float(data.get('window_seconds', WINDOW_SECONDS)),
+            labels=list(data.get('labels', [])),
+            energy_db=np.asarray(data.get('energy_db', []), dtype=np.float32),
+            applause_score=np.asarray(data.get('applause_score', []), dtype=np.float32),
+            speech_score=np.asarray(data.get('speech_score', []), dtype=np.float32)
+        )
+
+
+def _frame_features(block: np.ndarray, sample_rate: int) -> dict:
+    """Compute sub-frame features for a (windows, samples) block; arrays are (windows, frames)"""
+    num_frames = 1 + (block.shape[1] - FRAME_LENGTH) // FRAME_HOP
+    idx = np.arange(FRAME_LENGTH)[None, :] + FRAME_HOP * np.arange(num_frames)[:, None]
+    frames = block[:, idx] * np.hanning(FRAME_LENGTH).astype(np.float32)
+
+    power = np.abs(np.fft.rfft(frames, axis=-1)) ** 2 + 1e-10
+    freqs = np.fft.rfftfreq(FRAME_LENGTH, d=1.0 / sample_rate)
+
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=-1) + 1e-10)
+    flatness = np.exp(np.mean(np.log(power), axis=-1)) / np.mean(power, axis=-1)
+    centroid = np.sum(power * freqs, axis=-1) / np.sum(power, axis=-1)
+
+    return {'energy_db': energy_db, 'flatness': flatness, 'centroid': centroid}
+
+
+def _modulation_ratio(envelope: np.ndarray, frame_rate: float) -> np.ndarray:
+    """Share of envelope modulation energy in the 2-8 Hz syllabic band, per window row"""
+    env = envelope - envelope.mean(axis=1, keepdims=True)
+    spectrum = np.abs(np.fft.rfft(env, axis=1)) ** 2
+    mod_freqs = np.fft.rfftfreq(env.shape[1], d=1.0 / frame_rate)
+    band = (mod_freqs >= 2.0) & (mod_freqs <= 8.0)
+    total = spectrum[:, 1:].sum(axis=1) + 1e-10
+    return spectrum[:, band].sum(axis=1) / total
+
+
+def classify_samples(samples: np.ndarray, sample_rate: int = SAMPLE_RATE,
+                     window_seconds: float = WINDOW_SECONDS) -> AudioClassification:
+    """Label fixed-length windows of a mono PCM signal"""
+    window_len = int(window_seconds * sample_rate)
+    num_windows = len(samples) // window_len
+    if num_windows == 0:
+        return AudioClassification(window_seconds, [], np.zeros(0), np.zeros(0), np.zeros(0))
+
+    frame_rate = sample_rate / FRAME_HOP
+
+    labels = []
+    energy_out, applause_out, speech_out = [], [], []
+
+    # Process in blocks of windows to bound memory on multi-hour tapes
+    block_windows = 120
+    for block_start in range(0, num_windows, block_windows):
+        block_end = min(block_start + block_windows, num_windows)
+        n = block_end - block_start
+        block = samples[block_start * window_len:block_end * window_len].astype(np.float32) / 32768.0
+        block = block.reshape(n, window_len)
+
+        feats = _frame_features(block, sample_rate)
+        frame_energy = feats['energy_db']
+        flatness = feats['flatness'].mean(axis=1)
+        centroid = feats['centroid'].mean(axis=1)
+
+        window_db = 10 * np.log10(np.mean(block ** 2, axis=1) + 1e-10)
+        energy_std = frame_energy.std(axis=1)
+        modulation = _modulation_ratio(np.power(10.0, frame_energy / 20.0), frame_rate)
+
+        audible = window_db >= SILENCE_DB
+        applause = audible * (
+            np.clip(flatness / APPLAUSE_FLATNESS, 0, 2) * 0.5
+            + np.clip(centroid / APPLAUSE_CENTROID_HZ, 0, 2) * 0.25
+            + np.clip(energy_std / APPLAUSE_ENERGY_STD, 0, 2) * 0.25
+        )
+        speech = audible * (
+            np.clip(modulation / SPEECH_MODULATION, 0, 2) * 0.5
+            + np.clip(energy_std / SPEECH_ENERGY_STD, 0, 2) * 0.5
+        ) * np.clip(1 - flatness, 0, 1)
+
+        for i in range(n):
+            if not audible[i]:
+                label = 'noise'
+            elif flatness[i] >= APPLAUSE_FLATNESS and centroid[i] >= APPLAUSE_CENTROID_HZ and energy_std[i] >= APPLAUSE_ENERGY_STD:
+                label = 'applause'
+            elif modulation[i] >= SPEECH_MODULATION and energy_std[i] >= SPEECH_ENERGY_STD:
+                label = 'speech'
+            elif flatness[i] <= MUSIC_FLATNESS and energy_std[i] < MUSIC_ENERGY_STD:
+                label = 'music'
+            elif speech[i] >= 1.0:
+                label = 'speech'
+            else:
+                label = 'noise'
+            labels.append(label)
+
+        energy_out.append(window_db)
+        applause_out.append(np.clip(applause / 2.0, 0, 1))
+        speech_out.append(np.clip(speech / 2.0, 0, 1))
+
+    labels = _smooth_labels(labels)
+
+    return AudioClassification(
+        window_seconds=window_seconds,
+        labels=labels,
+        energy_db=np.concatenate(energy_out).astype(np.float32),
+        applause_score=np.concatenate(applause_out).astype(np.float32),
+        speech_score=np.concatenate(speech_out).astype(np.float32)
+    )
+
+
+def _smooth_labels(labels: List[str]) -> List[str]:
+    """Replace isolated single-window labels with their neighbours' label"""
+    smoothed = list(labels)
+    for i in range(1, len(labels) - 1):
+        if labels[i - 1] == labels[i + 1] and labels[i] != labels[i - 1]:
+            smoothed[i] = labels[i - 1]
+    return smoothed
+
+
+def classify_audio(audio_path: str, window_seconds: float = WINDOW_SECONDS) -> AudioClassification:
+    """Decode an audio file and label every window"""
+    samples = decode_audio_pcm(audio_path, SAMPLE_RATE)
+    return classify_samples(samples, SAMPLE_RATE, window_seconds)
+
+
+def save_audio_labels(classification: AudioClassification, path: str):
+    """Save per-window labels to JSON (read back by highlight scoring)"""
+    with open(path, 'w') as f:
+        json.dump(classification.to_dict(), f, indent=2)
+
+
+def load_audio_labels(path: str) -> Optional[AudioClassification]:
+    """Load audio_labels.json, or None if missing/unreadable"""
+    try:
+        with open(path, 'r') as f:
+            return AudioClassification.from_dict(json.load(f))
+    except (OSError, json.JSONDecodeError):
+        return None
@@ -0,0 +1,281 @@
+"""
+Audio Fingerprint Index - Reuse Transcripts Across Duplicate Sources
+Spectral-peak hashing (Shazam-style) computed locally with NumPy, stored in an
+archive-wide SQLite index.
+
+Part of the Pete Dye Story video processing system.
+
+The archive contains overlapping material (multi-disc transfers, "Highlights"
+compilations, re-transfers). When a span of a new video matches audio that
+was already transcribed, SimpleDirector reuses those words - shifted to the
+new timestamps - and only sends the unmatched spans to the transcriber.
+
+How it works:
+  1. Log-magnitude STFT at 8 kHz; local spectral maxima become peaks
+  2. Each peak is paired with a few later peaks: hash = (f1, f2, dt)
+  3. Matching hashes vote for a time offset per source video; runs of
+     consistent votes become matched spans
+"""
+
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from audio_classifier import decode_audio_pcm
+from records import Word
+from word_store import WordStore, WORDS_FILENAME
+
+
+SAMPLE_RATE = 8000
+N_FFT = 1024
+HOP = 256
+FRAME_SECONDS = HOP / SAMPLE_RATE   # 32ms
+
+PEAK_FREQ_NEIGHBORHOOD = 15         # bins each side
+PEAK_TIME_NEIGHBORHOOD = 10         # frames each side
+PEAKS_PER_SECOND = 12
+FAN_OUT = 5                         # Target peaks paired with each anchor
+MAX_PAIR_FRAMES = 63                # ~2s look-ahead (6 bits)
+BLOCK_FRAMES = 4096                 # ~2 min of spectrogram per block
+
+MIN_MATCH_HITS = 25                 # Hash votes needed for a span
+MIN_MATCH_SECONDS = 10.0
+MIN_HITS_PER_SECOND = 0.5           # Density guard against chance alignments
+MAX_GAP_SECONDS = 4.0               # Split a run when votes stop for this long
+OFFSET_TOLERANCE = 1                # frames
+
+INDEX_FILENAME = "audio_fingerprints.sqlite"
+
+
+@dataclass
+class AudioFingerprint:
+    """Peak-pair hashes and their anchor frame indices"""
+    hashes: np.ndarray   # int64
+    frames: np.ndarray   # int32
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+
+@dataclass
+class FingerprintMatch:
+    """A span of the new audio that duplicates a span of an indexed source"""
+    source: str
+    start: float          # seconds in the new audio
+    end: float
+    offset: float         # source_time = new_time + offset
+    hits: int
+
+
+def _sliding_max(values: np.ndarray, radius: int, axis: int) -> np.ndarray:
+    """Max over a centered window of 2*radius+1 along one axis (edge-padded)"""
+    pad = [(0, 0)] * values.ndim
+    pad[axis] = (radius, radius)
+    padded = np.pad(values, pad, mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1, axis=axis)
+    return windows.max(axis=-1)
+
+
+def _block_peaks(samples: np.ndarray, first_frame: int, num_frames: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Peak (frame, bin) pairs for one block of the spectrogram"""
+    # Pad the block with neighbourhood context so peaks at the edges are judged fairly
+    ctx_start = max(0, first_frame - PEAK_TIME_NEIGHBORHOOD)
+    total_frames = 1 + (len(samples) - N_FFT) // HOP
+    ctx_end = min(total_frames, first_frame + num_frames + PEAK_TIME_NEIGHBORHOOD)
+
+    idx = np.arange(N_FFT)[None, :] + HOP * np.arange(ctx_start, ctx_end)[:, None]
+    frames = samples[idx] * np.hanning(N_FFT).astype(np.float32)
+    spec = np.log(np.abs(np.fft.rfft(frames, axis=1)) + 1e-6).astype(np.float32)
+
+    local_max = _sliding_max(_sliding_max(spec, PEAK_FREQ_NEIGHBORHOOD, 1), PEAK_TIME_NEIGHBORHOOD, 0)
+    is_peak = (spec == local_max) & (spec > np.median(spec) + 2.0)
+    is_peak[:, :2] = False  # DC / rumble
+
+    # Drop the context rows again
+    lo = first_frame - ctx_start
+    is_peak = is_peak[lo:lo + num_frames]
+    spec = spec[lo:lo + num_frames]
+
+    peak_frames, peak_bins = np.nonzero(is_peak)
+    budget = int(PEAKS_PER_SECOND * num_frames * FRAME_SECONDS)
+    if len(peak_frames) > budget:
+        keep = np.argsort(spec[peak_frames, peak_bins])[-budget:]
+        peak_frames, peak_bins = peak_frames[keep], peak_bins[keep]
+
+    return peak_frames + first_frame, peak_bins
+
+
+def fingerprint_samples(samples: np.ndarray) -> AudioFingerprint:
+    """Fingerprint mono int16 PCM at SAMPLE_RATE"""
+    samples = samples.astype(np.float32) / 32768.0
+    total_frames = 1 + (len(samples) - N_FFT) // HOP if len(samples) >= N_FFT else 0
+
+    all_frames, all_bins = [], []
+    for first in range(0, total_frames, BLOCK_FRAMES):
+        frames, bins = _block_peaks(samples, first, min(BLOCK_FRAMES, total_frames - first))
+        all_frames.append(frames)
+        all_bins.append(bins)
+
+    if not all_frames:
+        return AudioFingerprint(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int32))
+
+    peak_frames = np.concatenate(all_frames)
+    peak_bins = np.concatenate(all_bins)
+    order = np.lexsort((peak_bins, peak_frames))
+    peak_frames, peak_bins = peak_frames[order], peak_bins[order]
+
+    # Pair each anchor with the next FAN_OUT peaks inside the look-ahead window
+    hashes, anchors = [], []
+    for k in range(1, FAN_OUT + 1):
+        dt = peak_frames[k:] - peak_frames[:-k]
+        valid = (dt > 0) & (dt <= MAX_PAIR_FRAMES)
+        f1 = peak_bins[:-k][valid].astype(np.int64)
+        f2 = peak_bins[k:][valid].astype(np.int64)
+        hashes.append((f1 << 16) | (f2 << 6) | dt[valid].astype(np.int64))
+        anchors.append(peak_frames[:-k][valid])
+
+    return AudioFingerprint(np.concatenate(hashes), np.concatenate(anchors).astype(np.int32))
+
+
+def fingerprint_audio(audio_path: str) -> AudioFingerprint:
+    """Decode an audio file and fingerprint it"""
+    return fingerprint_samples(decode_audio_pcm(audio_path, SAMPLE_RATE))
+
+
+def subtract_spans(spans: List[Tuple[float, float]], taken: List[Tuple[float, float]],
+                   min_length: float = 1.0) -> List[Tuple[float, float]]:
+    """Parts of `spans` not covered by `taken`, dropping slivers shorter than min_length"""
+    taken = sorted(taken)
+    remaining = []
+    for start, end in spans:
+        cursor = start
+        for t_start, t_end in taken:
+            if t_end <= cursor or t_start >= end:
+                continue
+            if t_start - cursor >= min_length:
+                remaining.append((cursor, t_start))
+            cursor = max(cursor, t_end)
+        if end - cursor >= min_length:
+            remaining.append((cursor, end))
+    return remaining
+
+
+class AudioFingerprintIndex:
+    """Archive-wide SQLite index of fingerprints for videos with saved transcripts"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.output_dir = os.path.dirname(path)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sources (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS hashes (
+                hash INTEGER NOT NULL,
+                source_id INTEGER NOT NULL,
+                frame INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS hashes_by_hash ON hashes(hash);
+            CREATE INDEX IF NOT EXISTS hashes_by_source ON hashes(source_id);
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def add_source(self, name: str, fingerprint: AudioFingerprint):
+        """Index (or re-index) a video whose transcript words were saved"""
+        with self.conn:
+            row = self.conn.execute("SELECT id FROM sources WHERE name = ?", (name,)).fetchone()
+            if row:
+                source_id = row[0]
+                self.conn.execute("DELETE FROM hashes WHERE source_id = ?", (source_id,))
+            else:
+                source_id = self.conn.execute("INSERT INTO sources (name) VALUES (?)", (name,)).lastrowid
+            self.conn.executemany(
+                "INSERT INTO hashes (hash, source_id, frame) VALUES (?, ?, ?)",
+                zip(fingerprint.hashes.tolist(), [source_id] * len(fingerprint), fingerprint.frames.tolist())
+            )
+
+    def find_matches(self, fingerprint: AudioFingerprint, exclude: str = None) -> List[FingerprintMatch]:
+        """Spans of the fingerprinted audio that duplicate indexed sources, non-overlapping"""
+        if not len(fingerprint):
+            return []
+
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS query (hash INTEGER, frame INTEGER)")
+        self.conn.execute("DELETE FROM query")
+        self.conn.executemany("INSERT INTO query VALUES (?, ?)",
+                              zip(fingerprint.hashes.tolist(), fingerprint.frames.tolist()))
+        rows = self.conn.execute("""
+            SELECT s.name, q.frame, h.frame - q.frame
+            FROM query q
+            JOIN hashes h ON h.hash = q.hash
+            JOIN sources s ON s.id = h.source_id
+            WHERE s.name != ?
+        """, (exclude or '',)).fetchall()
+        self.conn.execute("DELETE FROM query")
+
+        by_source = {}
+        for name, frame, offset in rows:
+            by_source.setdefault(name, []).append((frame, offset))
+
+        candidates = []
+        for name, pairs in by_source.items():
+            candidates.extend(self._source_spans(name, np.array(pairs, dtype=np.int64)))
+
+        # Strongest spans win; weaker ones only keep the parts nobody else claimed
+        accepted: List[FingerprintMatch] = []
+        for match in sorted(candidates, key=lambda m: m.hits, reverse=True):
+            for start, end in subtract_spans([(match.start, match.end)], [(m.start, m.end) for m in accepted],
+                                             min_length=MIN_MATCH_SECONDS):
+                accepted.append(FingerprintMatch(match.source, start, end, match.offset, match.hits))
+
+        return sorted(accepted, key=lambda m: m.start)
+
+    @staticmethod
+    def _source_spans(name: str, pairs: np.ndarray) -> List[FingerprintMatch]:
+        """Turn (query_frame, offset) votes for one source into matched spans"""
+        frames, offsets = pairs[:, 0], pairs[:, 1]
+        values, counts = np.unique(offsets, return_counts=True)
+
+        spans = []
+        claimed = np.zeros(len(offsets), dtype=bool)
+        for i in np.argsort(counts)[::-1]:
+            if counts[i] < MIN_MATCH_HITS:
+                break
+            near = (np.abs(offsets - values[i]) <= OFFSET_TOLERANCE) & ~claimed
+            if near.sum() < MIN_MATCH_HITS:
+                continue
+            claimed |= near
+
+            hit_frames = np.sort(frames[near])
+            breaks = np.flatnonzero(np.diff(hit_frames) * FRAME_SECONDS > MAX_GAP_SECONDS)
+            for run in np.split(hit_frames, breaks + 1):
+                start, end = run[0] * FRAME_SECONDS, (run[-1] + 1) * FRAME_SECONDS
+                duration = end - start
+                if (len(run) >= MIN_MATCH_HITS and duration >= MIN_MATCH_SECONDS
+                        and len(run) / duration >= MIN_HITS_PER_SECOND):
+                    spans.append(FingerprintMatch(name, float(start), float(end),
+                                                  float(values[i] * FRAME_SECONDS), len(run)))
+        return spans
+
+    def reuse_words(self, match: FingerprintMatch) -> Optional[dict]:
+        """Source words inside a matched span, shifted onto the new timeline"""
+        words_path = os.path.join(self.output_dir, match.source, 'analysis', WORDS_FILENAME)
+        if not os.path.exists(words_path):
+            return None
+
+        store = WordStore.load(words_path)
+        indices = store.overlapping(match.start + match.offset, match.end + match.offset)
+        # Keep only words whose start lies inside the span so nothing is duplicated at the edges
+        indices = indices[(store.starts[indices] >= match.start + match.offset)
+                          & (store.starts[indices] < match.end + match.offset)]
+        words = [
+            Word(text, float(store.starts[i]) - match.offset, float(store.ends[i]) - match.offset)
+            for i, text in zip(indices, store.texts(indices))
+        ]
+        return {'start': match.start, 'text': ' '.join(w.word for w in words), 'words': words}
@@ -0,0 +1,98 @@
+"""
+Batch Planner - Token-Budget Sizing for Vision Batches
+Packs frames into vision requests by estimated tokens instead of a fixed count.
+
+Part of the Pete Dye Story video processing system.
+
+Every batcher used to send 20 frames per request, whatever the frames cost.
+The planner estimates each frame locally:
+
+  input:  image tokens (85 at detail=low) + its text line + the speech it
+          adds to the batch's transcript window (chars / 4)
+  output: OUTPUT_TOKENS_PER_FRAME for its JSON frame record
+
+and fills each batch until the next frame would push the input past
+INPUT_TOKEN_CEILING or the expected output past OUTPUT_TOKEN_CEILING.
+Quiet footage (no speech) gets fewer, fuller requests; talk-heavy footage is
+split before the prompt or the response overflows. Each batch also gets a
+max_completion_tokens sized to its frame count, so responses are not cut off.
+
+Usage:
+    plans = plan_batches([estimate_frame_tokens(frame_text) for ...], fixed_tokens)
+    for plan in plans:
+        frames[plan.start:plan.end], plan.max_completion_tokens
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = {'low': 85, 'high': 765}
+FRAME_LINE_TOKENS = 15              # "Frame at 00:01:04 (64.0s) -- AUDIO: ..." framing
+PROMPT_TOKENS = 300                 # Instructions at the top of every vision request
+OUTPUT_TOKENS_PER_FRAME = 150
+OUTPUT_OVERHEAD_TOKENS = 200
+OUTPUT_SAFETY_FACTOR = 1.5
+MIN_COMPLETION_TOKENS = 1000
+
+INPUT_TOKEN_CEILING = 8000
+OUTPUT_TOKEN_CEILING = 6000            # Expected response size; max_completion_tokens adds headroom
+MAX_FRAMES_PER_BATCH = 48
+
+
+@dataclass
+class BatchPlan:
+    """Frames [start, end) of one vision request and its token estimates"""
+    start: int
+    end: int
+    input_tokens: int
+    max_completion_tokens: int
+
+    @property
+    def frame_count(self) -> int:
+        return self.end - self.start
+
+
+def text_tokens(text: str) -> int:
+    return len(text or '') // CHARS_PER_TOKEN
+
+
+def estimate_frame_tokens(speech_text: str = '', detail: str = 'low') -> int:
+    """Input tokens one frame adds: image + text line + its speech (in the line and the transcript window)"""
+    return IMAGE_TOKENS.get(detail, IMAGE_TOKENS['high']) + FRAME_LINE_TOKENS + 2 * text_tokens(speech_text)
+
+
+def completion_tokens_for(frame_count: int) -> int:
+    """max_completion_tokens for a batch, with headroom over the expected response"""
+    expected = OUTPUT_OVERHEAD_TOKENS + frame_count * OUTPUT_TOKENS_PER_FRAME
+    return max(MIN_COMPLETION_TOKENS, int(expected * OUTPUT_SAFETY_FACTOR))
+
+
+def plan_batches(frame_tokens: List[int], fixed_tokens: int,
+                 input_ceiling: int = INPUT_TOKEN_CEILING,
+                 output_ceiling: int = OUTPUT_TOKEN_CEILING,
+                 max_frames: int = MAX_FRAMES_PER_BATCH) -> List[BatchPlan]:
+    """
+    Greedily pack consecutive frames into batches under the token ceilings.
+
+    frame_tokens: estimated input tokens of each frame, in frame order
+    fixed_tokens: per-request cost shared by the batch (PROMPT_TOKENS, transcript margin)
+    A single frame over the ceiling still gets a batch of its own.
+    """
+    output_frames = max(1, (output_ceiling - OUTPUT_OVERHEAD_TOKENS) // OUTPUT_TOKENS_PER_FRAME)
+    max_frames = max(1, min(max_frames, output_frames))
+
+    plans = []
+    start = 0
+    while start < len(frame_tokens):
+        end = start
+        total = fixed_tokens
+        while end < len(frame_tokens) and end - start < max_frames:
+            if end > start and total + frame_tokens[end] > input_ceiling:
+                break
+            total += frame_tokens[end]
+            end += 1
+        plans.append(BatchPlan(start, end, total, completion_tokens_for(end - start)))
+        start = end
+    return plans
@@ -0,0 +1,312 @@
+"""
+Batch Submission - Offline Batch-API Mode for Overnight Runs
+Vision and synthesis requests are collected, submitted in bulk and replayed.
+
+Part of the Pete Dye Story video processing system.
+
+With an OfflineBatchSession installed (run_video.py --offline-session DIR),
+call_openai() stops sending chat requests:
+
+  - a request already answered is replayed from the session store
+  - a new vision / synthesis request is recorded as pending and raises
+    DeferredRequest; the director stops and run_video.py exits with
+    DEFERRED_EXIT_CODE
+  - transcription (not available in the Batch API) runs live once and its
+    response is stored, so later passes do not transcribe again
+
+batch_processor.py --offline-batch then writes the pending requests as JSONL,
+submits them through a BatchSubmitter, polls, ingests the results and runs
+the queue again. Pass 1 collects vision requests, pass 2 replays them and
+collects synthesis, pass 3 replays everything and writes the normal
+simple_director_analysis.json outputs.
+
+Submitters:
+  - OpenAIBatchSubmitter: the OpenAI Batch API (/v1/chat/completions, 24h window)
+  - LocalBatchSubmitter: a file-based stand-in that answers each line with a
+    responder function (for tests; it never calls the API itself)
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from typing import Callable, Iterator, List, Tuple
+
+
+SESSION_FILENAME = "session.sqlite"
+DEFERRED_EXIT_CODE = 3
+DEFERRED_KINDS = {'vision', 'synthesis'}
+BATCH_ENDPOINT = "/v1/chat/completions"
+MAX_BATCH_REQUESTS = 50000
+MAX_BATCH_BYTES = 180 * 1024 * 1024     # Batch API input files are limited to 200 MB
+POLL_INTERVAL = 60
+
+
+class DeferredRequest(Exception):
+    """Raised instead of sending a request that goes out with the next offline batch"""
+
+    def __init__(self, key: str):
+        super().__init__(f"Deferred to offline batch ({key[:12]})")
+        self.key = key
+
+
+def _hash_upload(value):
+    """json.dumps default: file objects are keyed by their content"""
+    if hasattr(value, 'read'):
+        position = value.tell()
+        digest = hashlib.sha256(value.read()).hexdigest()
+        value.seek(position)
+        return f"file:{digest}"
+    return str(value)
+
+
+def _type_name(obj) -> str:
+    cls = type(obj)
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _replay(type_name: str, body: str):
+    """Rebuild a parsed SDK response (pydantic model) or plain text from the store"""
+    if type_name == 'builtins.str':
+        return body
+    module_name, class_name = type_name.rsplit('.', 1)
+    cls = getattr(importlib.import_module(module_name), class_name)
+    return cls.model_validate_json(body)
+
+
+CHAT_COMPLETION_TYPE = 'openai.types.chat.chat_completion.ChatCompletion'
+
+
+class OfflineBatchSession:
+    """Request/response store shared by every run_video.py pass over the queue"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, SESSION_FILENAME)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    body TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS pending (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    batch_id TEXT
+                );
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def request_key(kwargs: dict) -> str:
+        canonical = json.dumps(kwargs, sort_keys=True, default=_hash_upload)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def lookup(self, key: str):
+        """The stored parsed response for a request, or None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT type, body FROM responses WHERE key = ?", (key,)).fetchone()
+        return _replay(*row) if row else None
+
+    def defer(self, key: str, kind: str, kwargs: dict):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO pending (key, kind, request) VALUES (?, ?, ?)",
+                (key, kind, json.dumps(kwargs))
+            )
+
+    def record(self, key: str, kind: str, parsed, text: str):
+        """Store a live response so the next pass replays it"""
+        body = parsed if isinstance(parsed, str) else text
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, kind, type, body) VALUES (?, ?, ?, ?)",
+                (key, kind, _type_name(parsed), body)
+            )
+
+    def pending_count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+
+    def write_batch_files(self) -> List[Tuple[str, List[str]]]:
+        """Unsubmitted requests as Batch API JSONL files (split by size and count)"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT key, request FROM pending WHERE batch_id IS NULL ORDER BY kind").fetchall()
+
+        files = []
+        handle, path, keys, size = None, None, [], 0
+        for key, request in rows:
+            line = json.dumps({
+                'custom_id': key, 'method': 'POST', 'url': BATCH_ENDPOINT, 'body': json.loads(request)
+            }) + '\n'
+            if handle is None or size + len(line) > MAX_BATCH_BYTES or len(keys) >= MAX_BATCH_REQUESTS:
+                if handle is not None:
+                    handle.close()
+                    files.append((path, keys))
+                path = os.path.join(self.directory, f"requests_{uuid.uuid4().hex[:8]}.jsonl")
+                handle, keys, size = open(path, 'w'), [], 0
+            handle.write(line)
+            keys.append(key)
+            size += len(line)
+        if handle is not None:
+            handle.close()
+            files.append((path, keys))
+        return files
+
+    def mark_submitted(self, keys: List[str], batch_id: str):
+        with self._connect() as conn:
+            conn.executemany("UPDATE pending SET batch_id = ? WHERE key = ?", [(batch_id, key) for key in keys])
+
+    def ingest(self, batch_id: str, results: Iterator[dict]) -> Tuple[int, int]:
+        """Store successful responses; failed requests go back to the unsubmitted pool"""
+        succeeded = failed = 0
+        with self._connect() as conn:
+            for line in results:
+                key = line.get('custom_id')
+                response = line.get('response') or {}
+                if response.get('status_code') == 200 and not line.get('error'):
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, kind, type, body) "
+                        "SELECT key, kind, ?, ? FROM pending WHERE key = ?",
+                        (CHAT_COMPLETION_TYPE, json.dumps(response['body']), key)
+                    )
+                    conn.execute("DELETE FROM pending WHERE key = ?", (key,))
+                    succeeded += 1
+                else:
+                    failed += 1
+            # Anything the batch did not answer (errors, expiry) is submitted again next round
+            conn.execute("UPDATE pending SET batch_id = NULL WHERE batch_id = ?", (batch_id,))
+        return succeeded, failed
+
+    def run_round(self, submitter: 'BatchSubmitter', log: Callable[[str], None] = print) -> Tuple[int, int]:
+        """Submit every pending request, wait for all batches and ingest the results"""
+        batch_ids = []
+        for path, keys in self.write_batch_files():
+            batch_id = submitter.submit(path)
+            self.mark_submitted(keys, batch_id)
+            batch_ids.append(batch_id)
+            log(f"  Submitted {len(keys)} requests as batch {batch_id}")
+
+        totals = [0, 0]
+        for batch_id in batch_ids:
+            submitter.wait(batch_id, log)
+            succeeded, failed = self.ingest(batch_id, submitter.results(batch_id))
+            totals[0] += succeeded
+            totals[1] += failed
+            log(f"  Batch {batch_id}: {succeeded} answered, {failed} failed")
+        return totals[0], totals[1]
+
+
+class BatchSubmitter:
+    """Submit a JSONL request file, poll it, and read back Batch API output lines"""
+
+    def submit(self, jsonl_path: str) -> str:
+        raise NotImplementedError
+
+    def status(self, batch_id: str) -> str:
+        """'completed', 'failed', 'expired', 'cancelled' or an in-progress state"""
+        raise NotImplementedError
+
+    def results(self, batch_id: str) -> Iterator[dict]:
+        """Output lines: {'custom_id', 'response': {'status_code', 'body'}, 'error'}"""
+        raise NotImplementedError
+
+    def wait(self, batch_id: str, log: Callable[[str], None] = print, poll_interval: float = POLL_INTERVAL) -> str:
+        while True:
+            status = self.status(batch_id)
+            if status in ('completed', 'failed', 'expired', 'cancelled'):
+                return status
+            log(f"  Batch {batch_id}: {status}, checking again in {poll_interval:.0f}s")
+            time.sleep(poll_interval)
+
+
+class OpenAIBatchSubmitter(BatchSubmitter):
+    """The OpenAI Batch API (half price, results within the completion window)"""
+
+    def __init__(self, openai_client, completion_window: str = "24h"):
+        self.client = openai_client
+        self.completion_window = completion_window
+
+    def submit(self, jsonl_path: str) -> str:
+        with open(jsonl_path, 'rb') as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def results(self, batch_id: str) -> Iterator[dict]:
+        batch = self.client.batches.retrieve(batch_id)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if line.strip():
+                    yield json.loads(line)
+
+
+class LocalBatchSubmitter(BatchSubmitter):
+    """
+    File-based stand-in: each batch is a folder with input.jsonl and, once
+    answered, output.jsonl. responder(body) -> chat completion dict.
+    """
+
+    def __init__(self, directory: str, responder: Callable[[dict], dict]):
+        self.directory = directory
+        self.responder = responder
+        os.makedirs(directory, exist_ok=True)
+
+    def _batch_dir(self, batch_id: str) -> str:
+        return os.path.join(self.directory, batch_id)
+
+    def submit(self, jsonl_path: str) -> str:
+        batch_id = f"local_{uuid.uuid4().hex[:12]}"
+        os.makedirs(self._batch_dir(batch_id))
+        with open(jsonl_path, 'r') as src, open(os.path.join(self._batch_dir(batch_id), 'input.jsonl'), 'w') as dst:
+            dst.write(src.read())
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        output_path = os.path.join(self._batch_dir(batch_id), 'output.jsonl')
+        if not os.path.exists(output_path):
+            self._answer(batch_id, output_path)
+        return 'completed'
+
+    def _answer(self, batch_id: str, output_path: str):
+        lines = []
+        with open(os.path.join(self._batch_dir(batch_id), 'input.jsonl'), 'r') as f:
+            for line in f:
+                request = json.loads(line)
+                try:
+                    body = self.responder(request['body'])
+                    lines.append({'custom_id': request['custom_id'], 'response': {'status_code': 200, 'body': body}, 'error': None})
+                except Exception as e:
+                    lines.append({'custom_id': request['custom_id'], 'response': None, 'error': {'message': str(e)}})
+        with open(output_path, 'w') as f:
+            f.writelines(json.dumps(line) + '\n' for line in lines)
+
+    def results(self, batch_id: str) -> Iterator[dict]:
+        with open(os.path.join(self._batch_dir(batch_id), 'output.jsonl'), 'r') as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def create_submitter(name: str, openai_client) -> BatchSubmitter:
+    """Build a submitter by CLI name: 'openai' (Batch API)"""
+    if name == 'openai':
+        return OpenAIBatchSubmitter(openai_client)
+    raise ValueError(f"Unknown batch submitter: {name}")
@@ -10,18 +10,41 @@ Models used:
   - gpt-4o-transcribe-diarize: Speaker-diarized audio transcription
   - whisper-1: Timestamped word-level transcription
   - gpt-5.1: Vision analysis of video frames
+  - gpt-4.1-mini: Optional triage of every vision batch (vision_cascade.py)
+
+Transcription goes through a pluggable backend (transcription_backends.py),
+so a local faster-whisper engine can replace or back up the OpenAI models.
+
+The per-segment entry points (process_video_fast, process_video_visual_only*)
+and the transcription methods are coroutines: vision and speech-to-text
+requests go out on AsyncOpenAI, ffmpeg and ffprobe run as asyncio
+subprocesses, and only frame decoding runs on this transcriber's executor.
 """
 
+import asyncio
+import bisect
+import itertools
 import cv2
 import base64
 import json
 from datetime import timedelta
 import os
-import subprocess
-from openai import OpenAI
 from concurrent.futures import ThreadPoolExecutor
 import time
 
+from transcription_backends import OpenAITranscriptionBackend
+from word_store import WordStore
+from interval_index import IntervalIndex
+from timed_transcript import TimedTranscript
+from vision_dispatcher import get_vision_dispatcher
+from openai_gateway import acall_openai, classify_error, get_async_client
+from async_process import run_process, probe_duration
+from batch_submission import DeferredRequest
+from batch_planner import plan_batches, estimate_frame_tokens, text_tokens, completion_tokens_for, PROMPT_TOKENS
+from frame_records import FRAME_RECORDS_RESPONSE_FORMAT, parse_frame_records, render_lines
+from vision_cascade import TRIAGE_RESPONSE_FORMAT, TRIAGE_INSTRUCTIONS, parse_triage
+from frame_index import frame_hash
+
 
 class FastMultimodalVideoTranscriber:
     """
@@ -29,168 +52,201 @@ class FastMultimodalVideoTranscriber:
     - GPT-4o-transcribe for audio transcription
     - GPT-4o-transcribe-diarize for speaker diarization
     - GPT-5.1 (vision) for visual analysis
-    - Parallel processing for speed
+    - Parallel processing for speed (asyncio; CPU and blocking work on explicit executors)
     """
 
     # Set to True to see every frame extraction line
     VERBOSE_FRAMES = False
 
-    def __init__(self, openai_api_key):
-        self.openai_client = OpenAI(api_key=openai_api_key)
+    # Seconds of speech before/after a batch's frames included in its prompt
+    TRANSCRIPT_WINDOW_MARGIN = 15.0
+
+    # Extra rounds for vision batches that still fail after request-level retries
+    BATCH_REQUEUE_ROUNDS = 1
+
+    VISION_MODEL = "gpt-5.1"
 
-    def extract_audio_from_video(self, video_path, output_audio="temp_audio.mp3", save_persistent=False):
-        """Extract audio from video file using ffmpeg"""
+    # Gated transcription: non-speech gaps up to this long are sent along with the
+    # speech around them (one request per window, sentences keep their context);
+    # only longer stretches of music/applause/silence are skipped
+    SPAN_BRIDGE_GAP = 45.0
+
+    # Audio chunks of one transcription sent at once (the gateway still caps requests in flight)
+    CHUNK_CONCURRENCY = 4
+
+    def __init__(self, openai_api_key, transcription_backend=None, vision_cache=None, vision_cascade=None):
+        # Requests use the shared AsyncOpenAI client of the running loop (see openai_gateway.get_async_client)
+        self.openai_api_key = openai_api_key
+        # Frame decoding / audio analysis (CPU) stays off the event loop
+        self.cpu_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="decode")
+        # Speech-to-text engine (OpenAI by default; see transcription_backends.py)
+        self.transcription_backend = transcription_backend or OpenAITranscriptionBackend(openai_api_key)
+        # Optional VisionCache: identical frames + prompt + parameters skip the API
+        self.vision_cache = vision_cache
+        # Optional VisionCascade: a cheaper model triages each batch, only flagged frames reach GPT-5.1
+        self.vision_cascade = vision_cascade
+
+    async def extract_audio_async(self, video_path, output_audio="temp_audio.mp3"):
+        """Extract audio from video file with ffmpeg (an asyncio subprocess)"""
         if self.VERBOSE_FRAMES:
             print("Extracting audio from video...")
 
-        command = [
-            'ffmpeg', '-i', video_path,
-            '-acodec', 'mp3',
-            '-y',  # Overwrite output file
-            output_audio
-        ]
-
-        result = subprocess.run(command, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"FFmpeg error: {result.stderr}")
-            raise Exception(f"Failed to extract audio: {result.stderr}")
+        returncode, _, stderr = await run_process(['ffmpeg', '-i', video_path, '-acodec', 'mp3', '-y', output_audio])
+        if returncode != 0:
+            print(f"FFmpeg error: {stderr}")
+            raise Exception(f"Failed to extract audio: {stderr}")
 
         if self.VERBOSE_FRAMES:
             print(f"Audio extracted to {output_audio}")
         return output_audio
 
-    def _get_audio_duration(self, audio_path):
-        """Get audio duration in seconds using ffprobe"""
-        try:
-            result = subprocess.run(
-                ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', '-of', 'csv=p=0', audio_path],
-                capture_output=True, text=True
-            )
-            return float(result.stdout.strip())
-        except Exception:
-            return 0.0
+    async def get_audio_duration_async(self, audio_path):
+        """Audio duration in seconds via ffprobe (0.0 when it cannot be read)"""
+        return await probe_duration(audio_path)
+
+    async def extract_frames_async(self, video_path, frame_interval=4, start=0.0, end=None):
+        """extract_frames_with_timestamps() on the decode executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.cpu_executor, self.extract_frames_with_timestamps, video_path, frame_interval, "frames", start, end
+        )
 
-    def transcribe_audio_openai(self, audio_path):
+    async def reuse_indexed_frames(self, frames_data, frame_reuse=None, time_offset=0.0):
+        """
+        Split frames into records reused from other videos (frame_index.FrameReuse)
+        and the frames that still need vision analysis.
+        """
+        if frame_reuse is None or not frames_data:
+            return [], frames_data
+        loop = asyncio.get_running_loop()
+        reused, novel = await loop.run_in_executor(self.cpu_executor, frame_reuse.match, frames_data, time_offset)
+        if reused:
+            print(f"Reusing {len(reused)}/{len(frames_data)} frame analyses from indexed videos")
+        return reused, novel
+
+    async def _cut_audio(self, audio_path, chunk_path, start_time, duration):
+        """Write [start_time, start_time + duration) of the audio to chunk_path (64 kbps mp3)"""
+        await run_process([
+            'ffmpeg', '-ss', str(start_time), '-i', audio_path,
+            '-t', str(duration),
+            '-acodec', 'mp3', '-ab', '64k',  # Lower bitrate to reduce size
+            '-y', chunk_path
+        ])
+
+    async def transcribe_audio_openai(self, audio_path, audio_duration=None):
         """Transcribe audio using OpenAI's APIs, with chunking for large files"""
         # Check file size (25MB limit) AND duration (1400s limit for gpt-4o-transcribe)
         file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
-        audio_duration = self._get_audio_duration(audio_path)
+        if audio_duration is None:
+            audio_duration = await probe_duration(audio_path)
 
         if file_size_mb > 24 or audio_duration > 1350:
             if self.VERBOSE_FRAMES:
                 print(f"Audio needs chunking (size: {file_size_mb:.1f}MB, duration: {audio_duration:.0f}s)")
-            return self.transcribe_large_audio(audio_path)
-
-        with open(audio_path, "rb") as audio_file:
-            high_quality_response = self.openai_client.audio.transcriptions.create(
-                model="gpt-4o-transcribe",
-                file=audio_file,
-                response_format="text",
-                prompt="This is archival footage from the Pete Dye Golf Club story (1978-2004). Content may include: construction footage, family gatherings, interviews, celebrations, award ceremonies, tournaments, or social events. Speakers may include Pete Dye, the LaRosa family, friends, dignitaries, or professional golfers. Transcribe accurately based on what you hear."
-            )
-
-            audio_file.seek(0)
+            return await self.transcribe_large_audio(audio_path, audio_duration)
 
-            
-            timestamped_response = self.openai_client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="verbose_json",
-                timestamp_granularities=["word"],
-                prompt="Archival footage from Pete Dye Golf Club including construction, interviews, celebrations, family events, and tournaments."
-            )
+        transcript_text, words = await self.transcription_backend.transcribe(
+            audio_path,
+            prompt="This is archival footage from the Pete Dye Golf Club story (1978-2004). Content may include: construction footage, family gatherings, interviews, celebrations, award ceremonies, tournaments, or social events. Speakers may include Pete Dye, the LaRosa family, friends, dignitaries, or professional golfers. Transcribe accurately based on what you hear.",
+            word_prompt="Archival footage from Pete Dye Golf Club including construction, interviews, celebrations, family events, and tournaments."
+        )
 
         return {
-            'high_quality_transcript': high_quality_response.text if hasattr(high_quality_response, 'text') else str(high_quality_response),
-            'timestamped_transcript': timestamped_response.words if hasattr(timestamped_response, 'words') else []
+            'high_quality_transcript': transcript_text,
+            'timestamped_transcript': words
         }
 
-    def transcribe_large_audio(self, audio_path):
+    async def transcribe_large_audio(self, audio_path, total_duration=None):
         """Transcribe large audio files by splitting into chunks"""
-        import subprocess
-        import tempfile
-        import shutil
-
         # Get audio duration
-        result = subprocess.run(
-            ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', '-of', 'csv=p=0', audio_path],
-            capture_output=True, text=True
-        )
-        total_duration = float(result.stdout.strip())
+        if total_duration is None:
+            total_duration = await probe_duration(audio_path)
         print(f"Total audio duration: {total_duration/60:.1f} minutes")
 
         # Split into 10-minute chunks (should be under 25MB each)
         chunk_duration = 600  # 10 minutes
+        windows = []
+        start_time = 0
+        while start_time < total_duration:
+            windows.append((start_time, min(chunk_duration, total_duration - start_time)))
+            start_time += chunk_duration
+
+        return await self._transcribe_chunks(audio_path, windows)
+
+    async def transcribe_audio_spans(self, audio_path, spans, max_chunk_duration=600, keep_out=None):
+        """
+        Transcribe only the given (start, end) spans of an audio file.
+
+        Used to gate transcription to speech windows found by the audio
+        classifier. Nearby spans are packed into windows of up to
+        max_chunk_duration, bridging gaps up to SPAN_BRIDGE_GAP; a gap is never
+        bridged across a keep_out range (audio whose transcript is reused).
+        Word timestamps stay absolute (relative to the full audio).
+        """
+        keep_out = keep_out or []
+        windows = []   # (start, end)
+        for span_start, span_end in sorted(spans):
+            if windows:
+                window_start, window_end = windows[-1]
+                gap_clear = not any(k_start < span_start and k_end > window_end for k_start, k_end in keep_out)
+                if (span_start - window_end <= self.SPAN_BRIDGE_GAP and gap_clear
+                        and span_end - window_start <= max_chunk_duration):
+                    windows[-1] = (window_start, max(window_end, span_end))
+                    continue
+            start_time = span_start
+            while start_time < span_end:
+                end_time = min(start_time + max_chunk_duration, span_end)
+                windows.append((start_time, end_time))
+                start_time = end_time
+
+        speech_seconds = sum(end - start for start, end in spans)
+        window_seconds = sum(end - start for start, end in windows)
+        print(f"Transcribing {len(spans)} speech spans ({speech_seconds/60:.1f} minutes of speech) "
+              f"in {len(windows)} windows ({window_seconds/60:.1f} minutes of audio)")
+        return self._transcribe_chunks(audio_path, [(start, end - start) for start, end in windows])
+
+    async def _transcribe_chunks(self, audio_path, windows):
+        """Cut (start, duration) windows out of the audio and transcribe each, offsetting word timestamps"""
+        import tempfile
+        import shutil
+
         chunk_dir = tempfile.mkdtemp(prefix="audio_chunks_")
 
         try:
             chunks = []
-            start_time = 0
-            chunk_num = 0
-
-            while start_time < total_duration:
-                chunk_path = os.path.join(chunk_dir, f"chunk_{chunk_num:03d}.mp3")
-                duration = min(chunk_duration, total_duration - start_time)
-
-                # Extract chunk with ffmpeg
-                subprocess.run([
-                    'ffmpeg', '-i', audio_path,
-                    '-ss', str(start_time),
-                    '-t', str(duration),
-                    '-acodec', 'mp3', '-ab', '64k',  # Lower bitrate to reduce size
-                    '-y', chunk_path
-                ], capture_output=True, text=True)
 
+            for chunk_num, (start_time, duration) in enumerate(windows):
                 chunks.append({
-                    'path': chunk_path,
+                    'path': os.path.join(chunk_dir, f"chunk_{chunk_num:03d}.mp3"),
                     'start_time': start_time,
                     'duration': duration
                 })
 
-                print(f"  Created chunk {chunk_num}: {start_time/60:.1f} - {(start_time + duration)/60:.1f} min")
-                start_time += chunk_duration
-                chunk_num += 1
+            print(f"Splitting into {len(chunks)} chunks, transcribing {self.CHUNK_CONCURRENCY} at a time...")
+            semaphore = asyncio.Semaphore(self.CHUNK_CONCURRENCY)
+
+            async def transcribe_chunk(chunk_num, chunk):
+                async with semaphore:
+                    await self._cut_audio(audio_path, chunk['path'], chunk['start_time'], chunk['duration'])
+                    print(f"  Created chunk {chunk_num}: {chunk['start_time']/60:.1f} - "
+                          f"{(chunk['start_time'] + chunk['duration'])/60:.1f} min")
+                    return await self.transcription_backend.transcribe(
+                        chunk['path'],
+                        prompt="Archival footage from Pete Dye Golf Club story (1978-2004). May include construction, interviews, celebrations, family events, or tournaments.",
+                        word_prompt="Pete Dye Golf Club archival footage including construction, celebrations, interviews, and events."
+                    )
 
-            print(f"Split into {len(chunks)} chunks, now transcribing...")
+            # Transcribe chunks concurrently; results come back in chunk order
+            results = await asyncio.gather(*(transcribe_chunk(i, chunk) for i, chunk in enumerate(chunks)))
 
-            # Transcribe each chunk
             all_transcripts = []
             all_words = []
 
-            for i, chunk in enumerate(chunks):
-                print(f"  Transcribing chunk {i+1}/{len(chunks)}...")
-
-                with open(chunk['path'], 'rb') as audio_file:
-                    # High-quality transcript
-                    response = self.openai_client.audio.transcriptions.create(
-                        model="gpt-4o-transcribe",
-                        file=audio_file,
-                        response_format="text",
-                        prompt="Archival footage from Pete Dye Golf Club story (1978-2004). May include construction, interviews, celebrations, family events, or tournaments."
-                    )
+            for chunk, (transcript_text, words) in zip(chunks, results):
+                all_transcripts.append(transcript_text)
 
-                    transcript_text = response.text if hasattr(response, 'text') else str(response)
-                    all_transcripts.append(transcript_text)
-
-                    # Get timestamped version too
-                    audio_file.seek(0)
-                    timestamped = self.openai_client.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=audio_file,
-                        response_format="verbose_json",
-                        timestamp_granularities=["word"],
-                        prompt="Pete Dye Golf Club archival footage including construction, celebrations, interviews, and events."
-                    )
-
-                    # Adjust timestamps for chunk offset
-                    if hasattr(timestamped, 'words'):
-                        for word in timestamped.words:
-                            adjusted_word = {
-                                'word': getattr(word, 'word', ''),
-                                'start': getattr(word, 'start', 0) + chunk['start_time'],
-                                'end': getattr(word, 'end', 0) + chunk['start_time']
-                            }
-                            all_words.append(adjusted_word)
+                # Adjust timestamps for chunk offset
+                all_words.extend(word.shifted(chunk['start_time']) for word in words)
 
             # Combine all transcripts
             full_transcript = '\n\n'.join(all_transcripts)
@@ -198,21 +254,25 @@ class FastMultimodalVideoTranscriber:
 
             return {
                 'high_quality_transcript': full_transcript,
-                'timestamped_transcript': all_words
+                'timestamped_transcript': all_words,
+                'text_chunks': [
+                    {'start': chunk['start_time'], 'text': text}
+                    for chunk, text in zip(chunks, all_transcripts)
+                ]
             }
 
         finally:
             # Cleanup chunk files
             shutil.rmtree(chunk_dir, ignore_errors=True)
 
-    def transcribe_audio_diarized(self, audio_path):
+    async def transcribe_audio_diarized(self, audio_path):
         """
         Transcribe audio with speaker diarization using OpenAI's diarize model.
 
         Returns:
             dict with keys:
                 - text (str): Full transcript text
-                - segments (list[dict]): Speaker-labeled segments, each with:
+                - segments (list[SpeakerTurn]): Speaker-labeled turns, each with:
                     - speaker (str): Speaker label (e.g. "A", "B")
                     - text (str): What the speaker said
                     - start (float): Start time in seconds
@@ -224,68 +284,27 @@ class FastMultimodalVideoTranscriber:
 
         if file_size_mb > 24:
             print(f"Audio file too large ({file_size_mb:.1f} MB), splitting into chunks for diarization...")
-            return self._transcribe_large_audio_diarized(audio_path)
-
-        with open(audio_path, "rb") as audio_file:
-            try:
-                response = self.openai_client.audio.transcriptions.create(
-                    model="gpt-4o-transcribe-diarize",
-                    file=audio_file,
-                    response_format="diarized_json",
-                    chunking_strategy="auto"
-                )
-            except Exception as e:
-                print(f"Diarization error: {e}")
-                return {"text": "", "segments": []}
-
-        # Parse the response
-        if hasattr(response, 'text'):
-            text = response.text
-        elif isinstance(response, dict) and 'text' in response:
-            text = response['text']
-        else:
-            text = str(response) if response else ""
-
-        segments = []
-        raw_segments = None
-        if hasattr(response, 'segments'):
-            raw_segments = response.segments
-        elif isinstance(response, dict) and 'segments' in response:
-            raw_segments = response['segments']
-
-        if raw_segments:
-            for seg in raw_segments:
-                if isinstance(seg, dict):
-                    segments.append({
-                        'speaker': seg.get('speaker', 'unknown'),
-                        'text': seg.get('text', ''),
-                        'start': float(seg.get('start', 0)),
-                        'end': float(seg.get('end', 0)),
-                        'id': seg.get('id', '')
-                    })
-                else:
-                    segments.append({
-                        'speaker': getattr(seg, 'speaker', 'unknown'),
-                        'text': getattr(seg, 'text', ''),
-                        'start': float(getattr(seg, 'start', 0)),
-                        'end': float(getattr(seg, 'end', 0)),
-                        'id': getattr(seg, 'id', '')
-                    })
-
-        print(f"Diarization complete: {len(segments)} segments, {len(set(s['speaker'] for s in segments))} speakers")
+            return await self._transcribe_large_audio_diarized(audio_path)
+
+        try:
+            result = await self.transcription_backend.transcribe_diarized(audio_path)
+        except Exception as e:
+            print(f"Diarization error: {e}")
+            return {"text": "", "segments": []}
+
+        text = result['text']
+        segments = result['segments']
+
+        print(f"Diarization complete: {len(segments)} segments, {len(set(s.speaker for s in segments))} speakers")
         return {"text": text, "segments": segments}
 
-    def _transcribe_large_audio_diarized(self, audio_path):
+    async def _transcribe_large_audio_diarized(self, audio_path):
         """Transcribe large audio files with diarization by splitting into chunks"""
         import tempfile
         import shutil
 
         # Get audio duration
-        result = subprocess.run(
-            ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', '-of', 'csv=p=0', audio_path],
-            capture_output=True, text=True
-        )
-        total_duration = float(result.stdout.strip())
+        total_duration = await probe_duration(audio_path)
         print(f"Total audio duration: {total_duration/60:.1f} minutes")
 
         # Split into 10-minute chunks
@@ -302,13 +321,7 @@ class FastMultimodalVideoTranscriber:
                 duration = min(chunk_duration, total_duration - start_time)
 
                 # Extract chunk with ffmpeg
-                subprocess.run([
-                    'ffmpeg', '-i', audio_path,
-                    '-ss', str(start_time),
-                    '-t', str(duration),
-                    '-acodec', 'mp3', '-ab', '64k',
-                    '-y', chunk_path
-                ], capture_output=True, text=True)
+                await self._cut_audio(audio_path, chunk_path, start_time, duration)
 
                 chunks.append({
                     'path': chunk_path,
@@ -329,71 +342,36 @@ class FastMultimodalVideoTranscriber:
             for i, chunk in enumerate(chunks):
                 print(f"  Diarizing chunk {i+1}/{len(chunks)}...")
 
-                with open(chunk['path'], 'rb') as audio_file:
-                    try:
-                        response = self.openai_client.audio.transcriptions.create(
-                            model="gpt-4o-transcribe-diarize",
-                            file=audio_file,
-                            response_format="diarized_json",
-                            chunking_strategy="auto"
-                        )
-                    except Exception as e:
-                        print(f"  Diarization error on chunk {i}: {e}")
-                        continue
-
-                # Extract text
-                if hasattr(response, 'text'):
-                    chunk_text = response.text
-                elif isinstance(response, dict) and 'text' in response:
-                    chunk_text = response['text']
-                else:
-                    chunk_text = str(response) if response else ""
+                try:
+                    result = await self.transcription_backend.transcribe_diarized(chunk['path'])
+                except Exception as e:
+                    print(f"  Diarization error on chunk {i}: {e}")
+                    continue
 
+                chunk_text = result['text']
                 if chunk_text:
                     all_text_parts.append(chunk_text)
 
-                # Extract and adjust segments
-                raw_segments = None
-                if hasattr(response, 'segments'):
-                    raw_segments = response.segments
-                elif isinstance(response, dict) and 'segments' in response:
-                    raw_segments = response['segments']
-
-                if raw_segments:
-                    for seg in raw_segments:
-                        if isinstance(seg, dict):
-                            seg_start = float(seg.get('start', 0))
-                            seg_end = float(seg.get('end', 0))
-                            seg_speaker = seg.get('speaker', 'unknown')
-                            seg_text = seg.get('text', '')
-                            seg_id = seg.get('id', '')
-                        else:
-                            seg_start = float(getattr(seg, 'start', 0))
-                            seg_end = float(getattr(seg, 'end', 0))
-                            seg_speaker = getattr(seg, 'speaker', 'unknown')
-                            seg_text = getattr(seg, 'text', '')
-                            seg_id = getattr(seg, 'id', '')
-
-                        # Adjust timestamps by chunk offset
-                        all_segments.append({
-                            'speaker': seg_speaker,
-                            'text': seg_text,
-                            'start': seg_start + chunk['start_time'],
-                            'end': seg_end + chunk['start_time'],
-                            'id': seg_id if seg_id else f"seg_{segment_counter}"
-                        })
-                        segment_counter += 1
+                # Adjust timestamps by chunk offset
+                for seg in result['segments']:
+                    all_segments.append(seg.shifted(chunk['start_time'], id=seg.id or f"seg_{segment_counter}"))
+                    segment_counter += 1
 
             full_text = '\n\n'.join(all_text_parts)
-            print(f"Diarization complete: {len(all_segments)} segments, {len(set(s['speaker'] for s in all_segments))} speakers")
+            print(f"Diarization complete: {len(all_segments)} segments, {len(set(s.speaker for s in all_segments))} speakers")
 
             return {"text": full_text, "segments": all_segments}
 
         finally:
             shutil.rmtree(chunk_dir, ignore_errors=True)
 
-    def extract_frames_with_timestamps(self, video_path, frame_interval=4, output_dir="frames"):
-        """Extract frames every N seconds from video and save to disk - OPTIMIZED"""
+    def extract_frames_with_timestamps(self, video_path, frame_interval=4, output_dir="frames", start=0.0, end=None):
+        """
+        Extract frames every N seconds from video and save to disk - OPTIMIZED
+
+        start/end limit sampling to [start, end) of the file, seeking in the source
+        itself; 'seconds' and 'timestamp' stay times within video_path.
+        """
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
@@ -409,11 +387,14 @@ class FastMultimodalVideoTranscriber:
             print(f"Extracting frames every {frame_interval} seconds...")
 
         # Calculate frame positions to extract
+        end = duration if end is None else min(end, duration)
         frame_positions = []
-        for seconds in range(0, int(duration), frame_interval):
+        seconds = start
+        while seconds < end:
             frame_num = int(seconds * fps)
             if frame_num < total_frames:
                 frame_positions.append((frame_num, seconds))
+            seconds += frame_interval
 
         if self.VERBOSE_FRAMES:
             print(f"Will extract {len(frame_positions)} frames")
@@ -445,6 +426,7 @@ class FastMultimodalVideoTranscriber:
                     'timestamp': str(timedelta(seconds=int(timestamp_seconds))),
                     'seconds': timestamp_seconds,
                     'frame_data': frame_b64,
+                    'phash': frame_hash(frame),
                     'filename': frame_filename,
                     'filepath': frame_path
                 })
@@ -455,33 +437,37 @@ class FastMultimodalVideoTranscriber:
         cap.release()
         return frames_data
 
-    def sync_audio_video_data(self, frames_data, audio_transcript):
+    def sync_audio_video_data(self, frames_data, audio_transcript, frame_interval=4):
         """Synchronize audio transcript with video frames"""
         print("Synchronizing audio and video data...")
 
         synchronized_data = []
-        words = audio_transcript['timestamped_transcript'] if isinstance(audio_transcript['timestamped_transcript'], list) else []
+        raw_words = audio_transcript['timestamped_transcript']
+        if isinstance(raw_words, WordStore):
+            raw_words = list(raw_words)
+        elif not isinstance(raw_words, list):
+            raw_words = []
 
-        for frame in frames_data:
-            frame_start_time = frame['seconds']
-            frame_end_time = frame_start_time + 4  # 4-second frame interval
+        # Sort by start once; a running max of end times lets each frame
+        # binary-search the first word that can still overlap it
+        words = sorted(((w.start, w.end, w.word) for w in raw_words), key=lambda w: w[0])
 
-            # Find audio segments within this frame's time window
-            frame_audio_words = []
-            frame_audio_text = ""
+        starts = [w[0] for w in words]
+        end_max = list(itertools.accumulate((w[1] for w in words), max))
 
-            for word in words:
-                word_start = getattr(word, 'start', word.get('start', 0) if isinstance(word, dict) else 0)
-                word_end = getattr(word, 'end', word.get('end', 0) if isinstance(word, dict) else 0)
-                word_text = getattr(word, 'word', word.get('word', '') if isinstance(word, dict) else '')
-
-                if (word_start <= frame_end_time and word_end >= frame_start_time):
-                    frame_audio_words.append({
-                        'word': word_text,
-                        'start': word_start,
-                        'end': word_end
-                    })
-                    frame_audio_text += word_text + " "
+        for frame in frames_data:
+            frame_start_time = frame['seconds']
+            frame_end_time = frame_start_time + frame_interval
+
+            # Words with start <= frame end and end >= frame start
+            lo = bisect.bisect_left(end_max, frame_start_time)
+            hi = bisect.bisect_right(starts, frame_end_time)
+            frame_audio_words = [
+                {'word': word_text, 'start': word_start, 'end': word_end}
+                for word_start, word_end, word_text in words[lo:hi]
+                if word_end >= frame_start_time
+            ]
+            frame_audio_text = " ".join(w['word'] for w in frame_audio_words)
 
             synchronized_data.append({
                 'timestamp': frame['timestamp'],
@@ -495,88 +481,205 @@ class FastMultimodalVideoTranscriber:
 
         return synchronized_data
 
-    def send_batch_to_openai_vision(self, batch_data, batch_num, high_quality_transcript):
-        """Send a batch of frames to GPT-5.1 Vision for analysis"""
+    async def _vision_call(self, request, parse, run_stats=None):
+        """
+        Send one vision request and parse its content, answering from the vision cache when possible.
+        run_stats (analysis_stats.AnalysisStats) counts cache hits and prompt-cache usage for one video.
+        """
+        key = None
+        if self.vision_cache is not None:
+            key = self.vision_cache.key(request)
+            cached = self.vision_cache.get(key)
+            if run_stats is not None:
+                run_stats.record_cache(cached is not None)
+            if cached is not None:
+                try:
+                    return parse(cached)
+                except ValueError:
+                    pass  # Unusable entry; ask again
+
+        response = await acall_openai('vision', get_async_client(self.openai_api_key).chat.completions,
+                                      run_stats=run_stats, **request)
+        result = response.choices[0].message.content
+
+        # parse raises ValueError on truncated/invalid JSON, which is then never cached
+        parsed = parse(result)
+        if key is not None:
+            self.vision_cache.put(key, result, model=request['model'])
+        return parsed
+
+    @staticmethod
+    def _vision_request(model, content, response_format, max_completion_tokens):
+        return {
+            'model': model,
+            'messages': [{"role": "user", "content": content}],
+            'max_completion_tokens': max_completion_tokens,
+            'temperature': 0.1,
+            'response_format': response_format
+        }
+
+    async def _vision_records(self, header, frame_parts, batch_data, time_offset=0.0, max_completion_tokens=4000, run_stats=None):
+        """
+        FrameRecords for one batch. header: the prompt's leading content parts -
+        header[0] the static instructions (byte-identical across batches, so the
+        request prefix can be served from the provider's prompt cache), then the
+        batch's own context; frame_parts: the content parts of each frame in
+        batch_data, in order.
+        """
+        if self.vision_cascade is not None:
+            return await self._cascade_records(header, frame_parts, batch_data, time_offset, max_completion_tokens, run_stats)
+
+        content = header + [part for parts in frame_parts for part in parts]
+        request = self._vision_request(self.VISION_MODEL, content, FRAME_RECORDS_RESPONSE_FORMAT, max_completion_tokens)
+        return await self._vision_call(request, lambda result: parse_frame_records(result, batch_data, time_offset), run_stats)
+
+    async def _cascade_records(self, header, frame_parts, batch_data, time_offset=0.0, max_completion_tokens=4000, run_stats=None):
+        """Triage the batch with the cheap model, then re-send only the escalated frames to GPT-5.1"""
+        # Triage instructions are static too: they extend the cached prefix
+        content = header[:1] + [TRIAGE_INSTRUCTIONS] + header[1:] + [part for parts in frame_parts for part in parts]
+        request = self._vision_request(self.vision_cascade.triage_model, content, TRIAGE_RESPONSE_FORMAT, max_completion_tokens)
+        triage_failed = False
+        try:
+            triaged = await self._vision_call(request, lambda result: parse_triage(result, batch_data, time_offset), run_stats)
+        except ValueError:
+            triaged = {}  # Unusable triage: the whole batch goes to the full model
+            triage_failed = True
+
+        records = []
+        escalate = []
+        for i, data in enumerate(batch_data):
+            record, needs_detail = triaged.get(data['seconds'], (None, True))
+            if needs_detail:
+                escalate.append(i)
+            else:
+                records.append(record)
+        self.vision_cascade.record(len(batch_data), len(escalate), triage_failed)
+        if run_stats is not None:
+            run_stats.cascade.record(len(batch_data), len(escalate), triage_failed)
+
+        if escalate:
+            escalated_data = [batch_data[i] for i in escalate]
+            content = header + [part for i in escalate for part in frame_parts[i]]
+            request = self._vision_request(
+                self.VISION_MODEL, content, FRAME_RECORDS_RESPONSE_FORMAT,
+                min(max_completion_tokens, completion_tokens_for(len(escalate)))
+            )
+            records.extend(await self._vision_call(
+                request, lambda result: parse_frame_records(result, escalated_data, time_offset), run_stats
+            ))
+        return sorted(records, key=lambda record: record.seconds)
+
+    @staticmethod
+    async def _attempt_batch(batch_fn, args):
+        try:
+            return await batch_fn(*args), None
+        except Exception as e:
+            return None, e
+
+    async def _run_vision_batches(self, batch_fn, arg_tuples, time_offset=0.0):
+        """
+        Run batch_fn(*args) for every batch through the shared dispatcher.
+
+        Batches that raise (after call_openai's own retries) are requeued once the
+        rest have finished; batches that still fail become failure records
+        instead of silently missing frames. Returns (FrameRecords, failures).
+        """
+        dispatcher = get_vision_dispatcher()
+        results = await dispatcher.run_ordered(self._attempt_batch, [(batch_fn, args) for args in arg_tuples])
+
+        for _ in range(self.BATCH_REQUEUE_ROUNDS):
+            # Deferred batches (offline batch mode) are answered by the next Batch API round
+            failed = [i for i, (_, error) in enumerate(results)
+                      if error is not None and not isinstance(error, DeferredRequest)]
+            if not failed:
+                break
+            print(f"Requeuing {len(failed)} failed vision batch(es)...")
+            retried = await dispatcher.run_ordered(self._attempt_batch, [(batch_fn, arg_tuples[i]) for i in failed])
+            for i, result in zip(failed, retried):
+                results[i] = result
+
+        records = []
+        failures = []
+        for args, (batch_records, error) in zip(arg_tuples, results):
+            if error is None:
+                records.extend(batch_records)
+                continue
+            batch_data, batch_num = args[0], args[1]
+            error_kind = classify_error(error)
+            if error_kind != 'deferred':
+                print(f"Vision batch {batch_num} failed ({error_kind}): {error}")
+            failures.append({
+                'batch_num': batch_num,
+                'start_seconds': time_offset + batch_data[0]['seconds'],
+                'end_seconds': time_offset + batch_data[-1]['seconds'],
+                'frames': len(batch_data),
+                'error_kind': error_kind,
+                'error': str(error)[:300]
+            })
+        return records, failures
+
+    async def send_batch_to_openai_vision(self, batch_data, batch_num, transcript_excerpt, max_completion_tokens=4000, time_offset=0.0,
+                                          run_stats=None):
+        """Send a batch of frames to GPT-5.1 Vision for analysis; returns FrameRecords (raises on failure)"""
         if self.VERBOSE_FRAMES:
             print(f"Processing batch {batch_num} ({len(batch_data)} frames) with GPT-5.1 Vision...")
 
         # Build the message content with text and images
-        content = [{
+        header = [{
             "type": "text",
-            "text": f"""Analyze this video segment from the Pete Dye Golf Club archival collection (1978-2004).
+            "text": """Analyze this video segment from the Pete Dye Golf Club archival collection (1978-2004).
 This footage may contain: construction, interviews, family gatherings, ceremonies, celebrations, tournaments, award events, or social occasions.
 
-FULL AUDIO TRANSCRIPT:
-{high_quality_transcript[:3000]}
-
-For each frame, provide:
-1. **Visual Scene**: What is happening visually (people, setting, activity)
-2. **People**: Who appears to be present (describe appearance, clothing, approximate age)
-3. **Audio Context**: Relevant spoken words from transcript for this timeframe
-4. **Event Type**: What type of event/activity this appears to be
-5. **Era Estimate**: Approximate time period based on visual cues
-
-Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [type]"""
+Return one record per frame, using each frame's timestamp exactly as given:
+- scene: What is happening visually (setting, activity, era cues)
+- people: Who appears to be present (describe appearance, clothing, approximate age)
+- event_type: What type of event/activity this appears to be
+- speaking / audio: Whether someone speaks, and the relevant spoken words for this timeframe
+- speaker: Who is speaking, if identifiable (otherwise empty)"""
+        }, {
+            "type": "text",
+            "text": f"AUDIO TRANSCRIPT (around these frames):\n{transcript_excerpt or '(no speech)'}"
         }]
 
+        frame_parts = []
         for data in batch_data:
             speech_indicator = "SPEECH" if data['has_speech'] else "NO SPEECH"
 
-            content.append({
+            frame_parts.append([{
                 "type": "text",
                 "text": f"\n=== FRAME AT {data['timestamp']} ===\n{speech_indicator}\nAUDIO TEXT: \"{data['audio_text']}\""
-            })
-
-            content.append({
+            }, {
                 "type": "image_url",
                 "image_url": {
                     "url": f"data:image/jpeg;base64,{data['frame_data']}",
                     "detail": "low"  # Use low detail for faster processing
                 }
-            })
+            }])
 
-        try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-5.1",
-                messages=[{"role": "user", "content": content}],
-                max_completion_tokens=4000,
-                temperature=0.1
-            )
+        return await self._vision_records(header, frame_parts, batch_data, time_offset, max_completion_tokens, run_stats)
 
-            return {
-                'batch_num': batch_num,
-                'content': response.choices[0].message.content
-            }
-        except Exception as e:
-            print(f"Error in batch {batch_num}: {e}")
-            return None
-
-    def send_multimodal_analysis_batched(self, synchronized_data, high_quality_transcript):
-        """Send frames in batches for parallel processing using OpenAI Vision"""
+    async def send_multimodal_analysis_batched(self, synchronized_data, transcript, frame_interval=4, time_offset=0.0):
+        """Send frames in batches for parallel processing using OpenAI Vision; returns (FrameRecords, failed batches)"""
         print("Preparing batched multimodal analysis with GPT-5.1 Vision...")
 
-        # Split into batches of 20 frames each (smaller batches for OpenAI)
-        batch_size = 20
-        batches = [synchronized_data[i:i+batch_size] for i in range(0, len(synchronized_data), batch_size)]
-
-        print(f"Processing {len(batches)} batches...")
-
-        # Process batches (can be parallelized but being careful with rate limits)
-        batch_results = []
-        for i, batch in enumerate(batches):
-            result = self.send_batch_to_openai_vision(batch, i+1, high_quality_transcript)
-            if result:
-                batch_results.append(result)
-
-        # Combine batch results
-        combined_analysis = "\n\n".join([
-            f"=== BATCH {result['batch_num']} ANALYSIS ===\n{result['content']}"
-            for result in sorted(batch_results, key=lambda x: x['batch_num'])
-        ])
-
-        return combined_analysis
+        # Pack frames into batches by estimated tokens (see batch_planner.py)
+        plans = self._plan_batches(synchronized_data, transcript, frame_interval)
+
+        print(f"Processing {len(plans)} batches...")
+
+        # Fan out to the pipeline-wide dispatcher (it caps requests in flight)
+        return await self._run_vision_batches(
+            self.send_batch_to_openai_vision,
+            [
+                (synchronized_data[plan.start:plan.end], i + 1,
+                 self._batch_transcript(transcript, synchronized_data[plan.start:plan.end], frame_interval),
+                 plan.max_completion_tokens, time_offset)
+                for i, plan in enumerate(plans)
+            ],
+            time_offset
+        )
 
-    def process_video_fast(self, video_path, frame_interval=4):
+    async def process_video_fast(self, video_path, frame_interval=4, time_offset=0.0):
         """OPTIMIZED: Main processing pipeline with parallel execution"""
         if self.VERBOSE_FRAMES:
             print(f"Fast processing video: {video_path}")
@@ -585,34 +688,36 @@ Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [
         # Parallel audio and video extraction
         print("Starting parallel audio and video extraction...")
 
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            # Create unique audio filename for each segment to avoid overwriting
-            video_basename = os.path.splitext(os.path.basename(video_path))[0]
-            unique_audio_path = f"temp_audio_{video_basename}.mp3"
-            audio_future = executor.submit(self.extract_audio_from_video, video_path, unique_audio_path)
-            frames_future = executor.submit(self.extract_frames_with_timestamps, video_path, frame_interval)
+        # Create unique audio filename for each segment to avoid overwriting
+        video_basename = os.path.splitext(os.path.basename(video_path))[0]
+        unique_audio_path = f"temp_audio_{video_basename}.mp3"
 
-            # Both happen simultaneously
-            audio_path = audio_future.result()
-            frames_data = frames_future.result()
+        # Both happen simultaneously
+        audio_path, frames_data = await asyncio.gather(
+            self.extract_audio_async(video_path, unique_audio_path),
+            self.extract_frames_async(video_path, frame_interval)
+        )
 
         extraction_time = time.time() - start_time
         print(f"Extraction completed in {extraction_time:.1f} seconds")
 
         # Audio transcription
         transcription_start = time.time()
-        audio_transcript = self.transcribe_audio_openai(audio_path)
+        audio_transcript = await self.transcribe_audio_openai(audio_path)
         transcription_time = time.time() - transcription_start
         print(f"Audio transcription completed in {transcription_time:.1f} seconds")
 
         # Synchronization
-        synchronized_data = self.sync_audio_video_data(frames_data, audio_transcript)
+        synchronized_data = self.sync_audio_video_data(frames_data, audio_transcript, frame_interval)
+        timed_transcript = TimedTranscript.from_transcript(audio_transcript, await self.get_audio_duration_async(audio_path))
 
         # Batched visual analysis with OpenAI
         analysis_start = time.time()
-        multimodal_analysis = self.send_multimodal_analysis_batched(
+        frame_records, failed_batches = await self.send_multimodal_analysis_batched(
             synchronized_data,
-            audio_transcript['high_quality_transcript']
+            timed_transcript,
+            frame_interval,
+            time_offset
         )
         analysis_time = time.time() - analysis_start
         print(f"Video analysis completed in {analysis_time:.1f} seconds")
@@ -628,7 +733,9 @@ Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [
         return {
             'processing_time': total_time,
             'frames_count': len(frames_data),
-            'multimodal_analysis': multimodal_analysis,
+            'multimodal_analysis': render_lines(frame_records),
+            'frame_records': frame_records,
+            'failed_batches': failed_batches,
             'audio_transcript': audio_transcript['high_quality_transcript'],
             'optimization_summary': {
                 'extraction_time': extraction_time,
@@ -637,10 +744,17 @@ Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [
             }
         }
 
-    def process_video_visual_only(self, video_path, frame_interval=4, full_transcript=None):
+    async def process_video_visual_only(self, video_path, frame_interval=4, full_transcript=None, time_offset=0.0, frame_reuse=None,
+                                        start=0.0, end=None, run_stats=None):
         """
         Process video with VISUAL analysis only, using provided full transcript for audio context.
         This eliminates audio extraction/transcription per segment.
+
+        full_transcript may be a TimedTranscript, in which case each frame also gets
+        the words spoken during its window (time_offset = file start within the full video).
+        frame_reuse (frame_index.FrameReuse) skips frames already analyzed in other videos.
+        start/end sample only [start, end) of video_path (a segment of the source, read in place).
+        run_stats (analysis_stats.AnalysisStats) collects this video's cache/cascade counters.
         """
         start_time = time.time()
         if self.VERBOSE_FRAMES:
@@ -649,7 +763,7 @@ Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [
         # Extract frames for visual analysis
         if self.VERBOSE_FRAMES:
             print("Extracting frames for visual analysis...")
-        frames_data = self.extract_frames_with_timestamps(video_path, frame_interval)
+        frames_data = await self.extract_frames_async(video_path, frame_interval, start, end)
         if self.VERBOSE_FRAMES:
             print(f"Extracted {len(frames_data)} frames")
 
@@ -657,8 +771,8 @@ Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [
             return {'error': 'No frames extracted', 'processing_time': time.time() - start_time}
 
         # Use visual analysis with full transcript context
-        multimodal_analysis = self.create_multimodal_analysis_with_transcript(
-            frames_data, full_transcript
+        frame_records, failed_batches = await self.create_multimodal_analysis_with_transcript(
+            frames_data, full_transcript, frame_interval, time_offset, frame_reuse, run_stats
         )
 
         total_time = time.time() - start_time
@@ -668,12 +782,15 @@ Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [
         return {
             'processing_time': total_time,
             'frames_count': len(frames_data),
-            'multimodal_analysis': multimodal_analysis,
+            'multimodal_analysis': render_lines(frame_records) or "No visual analysis available",
+            'frame_records': frame_records,
+            'failed_batches': failed_batches,
             'audio_transcript': full_transcript,
             'success': True
         }
 
-    def process_video_visual_only_with_diarization(self, video_path, frame_interval=4, full_transcript=None, diarization_segments=None):
+    async def process_video_visual_only_with_diarization(self, video_path, frame_interval=4, full_transcript=None, diarization_segments=None, time_offset=0.0,
+                                                         frame_reuse=None, start=0.0, end=None, run_stats=None):
         """
         Process video with VISUAL analysis only, using provided full transcript AND
         speaker diarization segments for richer audio context.
@@ -682,8 +799,13 @@ Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [
             video_path: Path to the video file
             frame_interval: Seconds between frame extractions
             full_transcript: Dict with 'high_quality_transcript' key (or None)
-            diarization_segments: List of diarization segment dicts with keys:
-                speaker, text, start, end, id (or None to fall back to standard processing)
+            diarization_segments: IntervalIndex over the diarization segments, or a list of
+                SpeakerTurn records
+                (or None to fall back to standard processing)
+            time_offset: Start of this file within the full video (diarization times are absolute)
+            frame_reuse: Optional frame_index.FrameReuse for frames already analyzed in other videos
+            start, end: Sample only [start, end) of video_path (a segment of the source, read in place)
+            run_stats: Optional analysis_stats.AnalysisStats for this video's cache/cascade counters
         """
         start_time = time.time()
         if self.VERBOSE_FRAMES:
@@ -692,27 +814,23 @@ Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [
         # Extract frames for visual analysis
         if self.VERBOSE_FRAMES:
             print("Extracting frames for visual analysis...")
-        frames_data = self.extract_frames_with_timestamps(video_path, frame_interval)
+        frames_data = await self.extract_frames_async(video_path, frame_interval, start, end)
         if self.VERBOSE_FRAMES:
             print(f"Extracted {len(frames_data)} frames")
 
         if not frames_data:
             return {'error': 'No frames extracted', 'processing_time': time.time() - start_time}
 
-        high_quality_text = ''
-        if full_transcript:
-            high_quality_text = full_transcript.get('high_quality_transcript', '') if isinstance(full_transcript, dict) else str(full_transcript)
-
         # If no diarization segments, fall back to standard visual-only processing
         if not diarization_segments:
             print("No diarization segments provided, falling back to standard visual-only processing")
-            multimodal_analysis = self.create_multimodal_analysis_with_transcript(
-                frames_data, full_transcript
+            frame_records, failed_batches = await self.create_multimodal_analysis_with_transcript(
+                frames_data, full_transcript, frame_interval, time_offset, frame_reuse, run_stats
             )
         else:
             print(f"Using {len(diarization_segments)} diarization segments for speaker context")
-            multimodal_analysis = self._create_analysis_with_diarization(
-                frames_data, high_quality_text, diarization_segments
+            frame_records, failed_batches = await self._create_analysis_with_diarization(
+                frames_data, full_transcript, diarization_segments, frame_interval, time_offset, frame_reuse, run_stats
             )
 
         total_time = time.time() - start_time
@@ -721,47 +839,70 @@ Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [
         return {
             'processing_time': total_time,
             'frames_count': len(frames_data),
-            'multimodal_analysis': multimodal_analysis,
+            'multimodal_analysis': render_lines(frame_records) or "No visual analysis available",
+            'frame_records': frame_records,
+            'failed_batches': failed_batches,
             'audio_transcript': full_transcript,
             'diarization_segments': diarization_segments,
             'success': True
         }
 
-    def _create_analysis_with_diarization(self, frames_data, high_quality_text, diarization_segments):
-        """Create multimodal analysis using frames, transcript, and diarization segments"""
-        batch_size = 20
-        all_analyses = []
-
-        for i in range(0, len(frames_data), batch_size):
-            batch = frames_data[i:i + batch_size]
-            batch_num = i // batch_size + 1
+    async def _create_analysis_with_diarization(self, frames_data, full_transcript, diarization_segments, frame_interval=4, time_offset=0.0,
+                                                frame_reuse=None, run_stats=None):
+        """Create multimodal analysis using frames, transcript, and diarization segments; returns (FrameRecords, failed batches)"""
+        # Build the overlap index once for all batches (callers may pass a shared one)
+        if not isinstance(diarization_segments, IntervalIndex):
+            diarization_segments = IntervalIndex(diarization_segments)
 
-            analysis = self._process_frames_batch_with_diarization(
-                batch, batch_num, high_quality_text, diarization_segments
-            )
-            if analysis:
-                all_analyses.append(analysis)
+        # Words spoken in each frame's window (reused records keep them as their audio):
+        # from the word timeline when there is one, otherwise from the overlapping turns
+        timed = isinstance(full_transcript, TimedTranscript) and len(full_transcript) > 0
+        for frame in frames_data:
+            frame_start = time_offset + frame['seconds']
+            if timed:
+                frame['audio_text'] = full_transcript.text_between(
+                    frame_start, frame_start + frame_interval, inclusive=True, fallback=False
+                )
+            else:
+                frame['audio_text'] = " ".join(
+                    f"Speaker {seg.label}: {seg.text.strip()}"
+                    for seg in diarization_segments.overlapping(frame_start, frame_start + frame_interval)
+                    if seg.text.strip()
+                )
 
-        return '\n\n'.join(all_analyses) if all_analyses else "No visual analysis available"
+        # Footage already analyzed in another video keeps its records; only novel frames are batched
+        reused, frames_data = await self.reuse_indexed_frames(frames_data, frame_reuse, time_offset)
+        if not frames_data:
+            return reused, []
+
+        plans = self._plan_batches(frames_data, full_transcript, frame_interval, time_offset)
+        records, failures = await self._run_vision_batches(
+            self._process_frames_batch_with_diarization,
+            [
+                (frames_data[plan.start:plan.end], i + 1,
+                 self._batch_transcript(full_transcript, frames_data[plan.start:plan.end], frame_interval, time_offset),
+                 diarization_segments, frame_interval, time_offset, plan.max_completion_tokens, run_stats)
+                for i, plan in enumerate(plans)
+            ],
+            time_offset
+        )
+        return sorted(reused + records, key=lambda record: record.seconds), failures
 
-    def _process_frames_batch_with_diarization(self, batch_data, batch_num, full_transcript_text, diarization_segments):
-        """Process a batch of frames with diarization context using GPT-5.1 Vision"""
+    async def _process_frames_batch_with_diarization(self, batch_data, batch_num, transcript_excerpt, diarization_index, frame_interval=4, time_offset=0.0,
+                                               max_completion_tokens=4000, run_stats=None):
+        """Process a batch of frames with diarization context using GPT-5.1 Vision; returns FrameRecords"""
         # Build per-frame speaker context from diarization segments
         frame_speaker_contexts = []
         for data in batch_data:
-            frame_start = data['seconds']
-            frame_end = frame_start + 4  # 4-second window
+            frame_start = time_offset + data['seconds']
+            frame_end = frame_start + frame_interval
 
             # Find diarization segments overlapping this frame's time window
             overlapping = []
-            for seg in diarization_segments:
-                seg_start = seg.get('start', 0)
-                seg_end = seg.get('end', 0)
-                if seg_start <= frame_end and seg_end >= frame_start:
-                    speaker = seg.get('speaker', 'unknown')
-                    text = seg.get('text', '').strip()
-                    if text:
-                        overlapping.append(f"Speaker {speaker}: \"{text}\"")
+            for seg in diarization_index.overlapping(frame_start, frame_end):
+                text = seg.text.strip()
+                if text:
+                    overlapping.append(f"Speaker {seg.label}: \"{text}\"")
 
             if overlapping:
                 speaker_text = " | ".join(overlapping)
@@ -775,116 +916,151 @@ Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [
                 'frame_data': data['frame_data']
             })
 
-        content = [{
+        header = [{
             "type": "text",
-            "text": f"""Analyze these video frames from Pete Dye Golf Club archival footage (1978-2004).
+            "text": """Analyze these video frames from Pete Dye Golf Club archival footage (1978-2004).
 Content types include: construction, interviews, family gatherings, grand opening ceremonies, award events, golf tournaments, celebrity visits, Christmas parties, and more.
 
-COMPLETE AUDIO TRANSCRIPT:
-{full_transcript_text[:2000]}
-
 SPEAKER-IDENTIFIED DIALOGUE is provided per frame below, showing WHO is speaking WHEN.
 
-For each frame, provide:
-1. **Visual Scene**: What is happening visually
-2. **People**: Who is visible (describe them for identification)
-3. **Speaker & Dialogue**: Who is speaking and what they say (using speaker labels)
-4. **Event Type**: Type of event/activity
-5. **Narrative Flow**: How this fits the overall story
-
-Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | SPEAKER: [speaker] says "[words]" | EVENT: [type]"""
+Return one record per frame, using each frame's timestamp exactly as given:
+- scene: What is happening visually, and how it fits the overall story
+- people: Who is visible (describe them for identification)
+- speaking / speaker / audio: Who is speaking (using speaker labels) and what they say
+- event_type: Type of event/activity"""
+        }, {
+            "type": "text",
+            "text": f"AUDIO TRANSCRIPT (around these frames):\n{transcript_excerpt or '(no speech)'}"
         }]
 
-        for ctx in frame_speaker_contexts:
-            content.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/jpeg;base64,{ctx['frame_data']}",
-                    "detail": "low"
-                }
-            })
-            content.append({
-                "type": "text",
-                "text": f"Frame at {ctx['timestamp']} ({ctx['seconds']:.1f}s) -- DIALOGUE: {ctx['speaker_context']}"
-            })
-
-        try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-5.1",
-                messages=[{"role": "user", "content": content}],
-                max_completion_tokens=4000,
-                temperature=0.1
-            )
-
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"Exception in diarized batch {batch_num}: {e}")
-            return None
+        frame_parts = [[{
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/jpeg;base64,{ctx['frame_data']}",
+                "detail": "low"
+            }
+        }, {
+            "type": "text",
+            "text": f"Frame at {ctx['timestamp']} ({ctx['seconds']:.1f}s) -- DIALOGUE: {ctx['speaker_context']}"
+        }] for ctx in frame_speaker_contexts]
+
+        return await self._vision_records(header, frame_parts, batch_data, time_offset, max_completion_tokens, run_stats)
+
+    @staticmethod
+    def _transcript_text(full_transcript):
+        """High-quality text from a TimedTranscript, transcript dict or plain string"""
+        if not full_transcript:
+            return ''
+        if isinstance(full_transcript, TimedTranscript):
+            return full_transcript.text
+        if isinstance(full_transcript, dict):
+            return full_transcript.get('high_quality_transcript', '')
+        return str(full_transcript)
+
+    def _batch_transcript(self, full_transcript, batch_data, frame_interval=4, time_offset=0.0, max_chars=2000):
+        """
+        Speech covering one batch's frames plus TRANSCRIPT_WINDOW_MARGIN on each side.
 
-    def create_multimodal_analysis_with_transcript(self, frames_data, full_transcript):
-        """Create multimodal analysis using frames and provided full transcript"""
-        high_quality_text = full_transcript.get('high_quality_transcript', '') if full_transcript else ''
+        Uses the word timeline of a TimedTranscript (time_offset = file start within
+        the full video). Untimed transcripts cannot be windowed and keep the leading
+        max_chars of the text.
+        """
+        if not isinstance(full_transcript, TimedTranscript):
+            return self._transcript_text(full_transcript)[:max_chars]
 
-        # Process frames in batches
-        batch_size = 20
-        all_analyses = []
+        window_start = time_offset + batch_data[0]['seconds'] - self.TRANSCRIPT_WINDOW_MARGIN
+        window_end = time_offset + batch_data[-1]['seconds'] + frame_interval + self.TRANSCRIPT_WINDOW_MARGIN
+        # With a word timeline, an empty window means silence; estimate only when there are no words
+        return full_transcript.text_between(window_start, window_end, fallback=not len(full_transcript))
 
-        for i in range(0, len(frames_data), batch_size):
-            batch = frames_data[i:i + batch_size]
-            batch_num = i // batch_size + 1
+    def _plan_batches(self, frames_data, full_transcript, frame_interval=4, time_offset=0.0):
+        """Token-budgeted batches over frames_data, estimated from each frame's speech"""
+        timed = isinstance(full_transcript, TimedTranscript) and len(full_transcript) > 0
 
-            analysis = self.process_frames_batch_with_transcript(batch, batch_num, high_quality_text)
-            if analysis:
-                all_analyses.append(analysis)
+        frame_tokens = []
+        for frame in frames_data:
+            speech = frame.get('audio_text')
+            if speech is None and timed:
+                frame_start = time_offset + frame['seconds']
+                speech = full_transcript.text_between(frame_start, frame_start + frame_interval, inclusive=True, fallback=False)
+            frame_tokens.append(estimate_frame_tokens(speech or ''))
+
+        # Shared per request: the prompt plus the transcript margin (or the untimed excerpt)
+        if timed and full_transcript.duration > 0:
+            margin_chars = 2 * self.TRANSCRIPT_WINDOW_MARGIN * len(full_transcript.text) / full_transcript.duration
+            fixed_tokens = PROMPT_TOKENS + int(margin_chars) // 4
+        else:
+            fixed_tokens = PROMPT_TOKENS + text_tokens(self._batch_transcript(full_transcript, frames_data[:1]))
+
+        return plan_batches(frame_tokens, fixed_tokens)
+
+    async def create_multimodal_analysis_with_transcript(self, frames_data, full_transcript, frame_interval=4, time_offset=0.0, frame_reuse=None,
+                                                         run_stats=None):
+        """Create multimodal analysis using frames and provided full transcript; returns (FrameRecords, failed batches)"""
+        # Words spoken in each frame's window, when the transcript is time-indexed
+        if isinstance(full_transcript, TimedTranscript):
+            for frame in frames_data:
+                frame_start = time_offset + frame['seconds']
+                frame['audio_text'] = full_transcript.text_between(
+                    frame_start, frame_start + frame_interval, inclusive=True, fallback=False
+                )
 
-        return '\n\n'.join(all_analyses) if all_analyses else "No visual analysis available"
+        # Footage already analyzed in another video keeps its records; only novel frames are batched
+        reused, frames_data = await self.reuse_indexed_frames(frames_data, frame_reuse, time_offset)
+        if not frames_data:
+            return reused, []
+
+        # Process frames in token-budgeted batches, all submitted at once to the shared dispatcher
+        plans = self._plan_batches(frames_data, full_transcript, frame_interval, time_offset)
+        records, failures = await self._run_vision_batches(
+            self.process_frames_batch_with_transcript,
+            [
+                (frames_data[plan.start:plan.end], i + 1,
+                 self._batch_transcript(full_transcript, frames_data[plan.start:plan.end], frame_interval, time_offset),
+                 plan.max_completion_tokens, time_offset, run_stats)
+                for i, plan in enumerate(plans)
+            ],
+            time_offset
+        )
+        return sorted(reused + records, key=lambda record: record.seconds), failures
 
-    def process_frames_batch_with_transcript(self, batch_data, batch_num, full_transcript_text):
-        """Process a batch of frames with full transcript context using GPT-5.1 Vision"""
-        content = [{
+    async def process_frames_batch_with_transcript(self, batch_data, batch_num, transcript_excerpt, max_completion_tokens=4000, time_offset=0.0,
+                                                   run_stats=None):
+        """Process a batch of frames with the transcript of its time window using GPT-5.1 Vision; returns FrameRecords"""
+        header = [{
             "type": "text",
-            "text": f"""Analyze these video frames from Pete Dye Golf Club archival footage (1978-2004).
+            "text": """Analyze these video frames from Pete Dye Golf Club archival footage (1978-2004).
 Content types include: construction, interviews, family gatherings, grand opening ceremonies, award events, golf tournaments, celebrity visits, Christmas parties, and more.
 
-COMPLETE AUDIO TRANSCRIPT:
-{full_transcript_text[:2000]}
-
-For each frame, provide:
-1. **Visual Scene**: What is happening visually
-2. **People**: Who is visible (describe them for identification)
-3. **Audio Context**: What is being said at this point in the transcript
-4. **Event Type**: Type of event/activity
-5. **Narrative Flow**: How this fits the overall story
-
-Format: [HH:MM:SS] VISUAL: [scene] | PEOPLE: [who] | AUDIO: "[words]" | EVENT: [type]"""
+Return one record per frame, using each frame's timestamp exactly as given:
+- scene: What is happening visually, and how it fits the overall story
+- people: Who is visible (describe them for identification)
+- speaking / audio: Whether someone speaks, and what is being said at this point in the transcript
+- speaker: Who is speaking, if identifiable (otherwise empty)
+- event_type: Type of event/activity"""
+        }, {
+            "type": "text",
+            "text": f"AUDIO TRANSCRIPT (around these frames):\n{transcript_excerpt or '(no speech)'}"
         }]
 
         # Add frame data
+        frame_parts = []
         for data in batch_data:
-            content.append({
+            frame_text = f"Frame at {data['timestamp']} ({data['seconds']:.1f}s)"
+            if data.get('audio_text'):
+                frame_text += f" -- AUDIO: \"{data['audio_text']}\""
+            frame_parts.append([{
                 "type": "image_url",
                 "image_url": {
                     "url": f"data:image/jpeg;base64,{data['frame_data']}",
                     "detail": "low"
                 }
-            })
-            content.append({
+            }, {
                 "type": "text",
-                "text": f"Frame at {data['timestamp']} ({data['seconds']:.1f}s)"
-            })
+                "text": frame_text
+            }])
 
-        try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-5.1",
-                messages=[{"role": "user", "content": content}],
-                max_completion_tokens=4000,
-                temperature=0.1
-            )
-
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"Exception in batch {batch_num}: {e}")
-            return None
+        return await self._vision_records(header, frame_parts, batch_data, time_offset, max_completion_tokens, run_stats)
 
 
 def main():
@@ -903,7 +1079,7 @@ def main():
     if os.path.exists(video_path):
         print("RUNNING OPTIMIZED MULTIMODAL PROCESSING")
         print("-" * 70)
-        results = transcriber.process_video_fast(video_path, frame_interval=4)
+        results = asyncio.run(transcriber.process_video_fast(video_path, frame_interval=4))
         print(f"\nTotal processing time: {results['processing_time']:.1f} seconds")
     else:
         print(f"Test video not found: {video_path}")
@@ -0,0 +1,239 @@
+"""
+Frame Hash Index - Reuse Frame Analysis Across Videos
+Perceptual hashes (dHash) of every analyzed frame in an archive-wide SQLite
+index, so footage that reappears in another video is not described twice.
+
+Part of the Pete Dye Story video processing system.
+
+Compilation tapes ("Some Highlites of the Pete Dye - LaRosa Golf Course",
+"Highlights And Interviews") re-use shots from the dated construction tapes.
+Each sampled frame gets a 64-bit difference hash (grayscale 9x8, one bit per
+horizontal gradient). Before a segment's vision batches are planned:
+
+  1. Every frame is compared with the indexed frames of other videos
+     (Hamming distance <= MAX_HAMMING)
+  2. Consecutive frames that match the same source video at a consistent
+     time offset form runs; runs of at least MIN_RUN_FRAMES are accepted
+     (a single similar-looking field or sky is not enough)
+  3. Frames in accepted runs reuse the source's FrameRecord (scene, people,
+     event type), re-timed to the new video with its own speech; only the
+     remaining frames are sent for vision analysis
+
+After a video is saved, its frames and records are added to the index
+(output/frame_hashes.sqlite). The reuse ratio per video is saved as
+`frame_reuse` in the analysis metadata.
+
+Usage:
+    index = FrameHashIndex(os.path.join(output_dir, INDEX_FILENAME))
+    reuse = FrameReuse(index, video_name)
+    reused, novel = reuse.match(frames_data, time_offset)
+    index.add_source(video_name, reuse.hashes, frame_records)
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from frame_records import FrameRecord
+
+
+INDEX_FILENAME = "frame_hashes.sqlite"
+
+MAX_HAMMING = 10                # bits of 64 that may differ (re-encodes, tape noise)
+MIN_RUN_FRAMES = 3              # consecutive matching frames needed (~12s at 4s spacing)
+OFFSET_TOLERANCE = 6.0          # seconds; frames of a shot are sampled at different phases
+MAX_RUN_GAP = 8.0               # seconds between matched frames inside one run
+
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def frame_hash(image: np.ndarray) -> int:
+    """64-bit difference hash of a BGR (or grayscale) frame, as a signed int for SQLite"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view('>u8')[0].astype(np.int64))
+
+
+def hamming_distances(hashes: np.ndarray, value: int) -> np.ndarray:
+    """Bit differences between value and every int64 hash"""
+    xor = np.bitwise_xor(hashes, np.int64(value))
+    return _POPCOUNT[xor.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+class FrameHashIndex:
+    """Archive-wide SQLite index of frame hashes and the frame records analyzed for them"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Matching runs on executor threads; every use of the connection holds the lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sources (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS frames (
+                id INTEGER PRIMARY KEY,
+                source_id INTEGER NOT NULL,
+                seconds REAL NOT NULL,
+                hash INTEGER NOT NULL,
+                record TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS frames_by_source ON frames(source_id);
+        """)
+        self._hashes = None     # loaded on the first lookup
+
+    def _load(self):
+        """Hashes of every indexed frame, held in memory for vectorized comparison"""
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT f.id, s.name, f.seconds, f.hash FROM frames f JOIN sources s ON s.id = f.source_id
+            """).fetchall()
+        self._ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self._sources = [row[1] for row in rows]
+        self._seconds = np.array([row[2] for row in rows], dtype=np.float64)
+        self._hashes = np.array([row[3] for row in rows], dtype=np.int64)
+
+    def __len__(self) -> int:
+        if self._hashes is None:
+            self._load()
+        return len(self._hashes)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def add_source(self, name: str, hashes: Dict[float, int], records: List[FrameRecord]):
+        """Index (or re-index) a video: its frame hashes by absolute second, joined with its records"""
+        rows = [(record.seconds, hashes[record.seconds], json.dumps(record.to_row()))
+                for record in records if record.seconds in hashes]
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT id FROM sources WHERE name = ?", (name,)).fetchone()
+            if row:
+                source_id = row[0]
+                self.conn.execute("DELETE FROM frames WHERE source_id = ?", (source_id,))
+            else:
+                source_id = self.conn.execute("INSERT INTO sources (name) VALUES (?)", (name,)).lastrowid
+            self.conn.executemany(
+                "INSERT INTO frames (source_id, seconds, hash, record) VALUES (?, ?, ?, ?)",
+                [(source_id, seconds, value, record) for seconds, value, record in rows]
+            )
+        self._hashes = None
+
+    def candidates(self, value: int, exclude: str = None) -> List[Tuple[str, float, int, int]]:
+        """(source, source seconds, frame id, distance) of indexed frames within MAX_HAMMING"""
+        if not len(self):
+            return []
+        distances = hamming_distances(self._hashes, value)
+        near = np.flatnonzero(distances <= MAX_HAMMING)
+        return [(self._sources[i], float(self._seconds[i]), int(self._ids[i]), int(distances[i]))
+                for i in near if self._sources[i] != exclude]
+
+    def records(self, frame_ids: List[int]) -> Dict[int, FrameRecord]:
+        """Stored FrameRecords by frame id (at their source's times)"""
+        if not frame_ids:
+            return {}
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT id, record FROM frames WHERE id IN ({','.join('?' * len(frame_ids))})", frame_ids
+            ).fetchall()
+        return {frame_id: FrameRecord(**dict(zip(FrameRecord.COLUMNS, json.loads(record)))) for frame_id, record in rows}
+
+
+class FrameReuse:
+    """One video's use of the index: matches its frames, collects its hashes, counts reuse"""
+
+    def __init__(self, index: FrameHashIndex, source: str):
+        self.index = index
+        self.source = source
+        self.hashes: Dict[float, int] = {}      # absolute seconds -> hash, for add_source
+        self.frames = 0
+        self.reused = 0
+        self.reused_from = set()
+        self._lock = threading.Lock()
+
+    def match(self, frames_data: List[dict], time_offset: float = 0.0) -> Tuple[List[FrameRecord], List[dict]]:
+        """
+        Split frames (each with 'seconds' and 'phash') into records reused from other
+        videos, re-timed to this one, and the frames that still need vision analysis.
+        """
+        for frame in frames_data:
+            self.hashes[time_offset + frame['seconds']] = frame['phash']
+
+        runs = self._runs([(time_offset + frame['seconds'], frame['phash']) for frame in frames_data])
+        matched = {seconds: (source, frame_id) for run in runs for seconds, source, frame_id in run}
+        stored = self.index.records([frame_id for _, frame_id in matched.values()])
+
+        reused = []
+        novel = []
+        for frame in frames_data:
+            seconds = time_offset + frame['seconds']
+            hit = matched.get(seconds)
+            source_record = stored.get(hit[1]) if hit else None
+            if source_record is None:
+                novel.append(frame)
+                continue
+            # Visual fields come from the source; speech belongs to this video's own soundtrack
+            audio = frame.get('audio_text') or ''
+            reused.append(FrameRecord(
+                seconds, source_record.scene, list(source_record.people), source_record.event_type,
+                speaking=bool(audio), audio=audio
+            ))
+
+        with self._lock:
+            self.frames += len(frames_data)
+            self.reused += len(reused)
+            self.reused_from.update(source for source, _ in matched.values())
+        return reused, novel
+
+    def _runs(self, frames: List[Tuple[float, int]]) -> List[List[Tuple[float, str, int]]]:
+        """Runs of consecutive frames matching one source at a consistent offset (>= MIN_RUN_FRAMES)"""
+        runs = []
+        current = []           # [(seconds, source, frame id)]
+        run_source, run_offset, last_seconds = None, 0.0, None
+
+        for seconds, value in frames:
+            candidates = self.index.candidates(value, exclude=self.source)
+            step = None
+            if current and seconds - last_seconds <= MAX_RUN_GAP:
+                # Continue the run with the candidate closest to its offset
+                same = [(abs(src_seconds - seconds - run_offset), frame_id)
+                        for source, src_seconds, frame_id, _ in candidates if source == run_source]
+                same = [entry for entry in same if entry[0] <= OFFSET_TOLERANCE]
+                if same:
+                    step = (seconds, run_source, min(same)[1])
+            if step is not None:
+                current.append(step)
+                last_seconds = seconds
+                continue
+
+            if len(current) >= MIN_RUN_FRAMES:
+                runs.append(current)
+            current = []
+            if candidates:
+                source, src_seconds, frame_id, _ = min(candidates, key=lambda c: c[3])
+                current = [(seconds, source, frame_id)]
+                run_source, run_offset, last_seconds = source, src_seconds - seconds, seconds
+
+        if len(current) >= MIN_RUN_FRAMES:
+            runs.append(current)
+        return runs
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused / self.frames if self.frames else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'frames': self.frames,
+                'reused_frames': self.reused,
+                'reuse_ratio': round(self.reuse_ratio, 3),
+                'sources': sorted(self.reused_from)
+            }
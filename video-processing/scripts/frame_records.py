@@ -0,0 +1,215 @@
+"""
+Frame Records - Structured Per-Frame Output of the Vision Stage
+One JSON record per analyzed frame instead of free-text prose.
+
+Part of the Pete Dye Story video processing system.
+
+Vision batches request FRAME_RECORDS_SCHEMA (strict JSON schema) and each
+returned frame becomes a FrameRecord with an absolute time in the video:
+
+    record.seconds, record.scene, record.people, record.event_type,
+    record.speaking, record.speaker, record.audio
+
+Per video the records are saved as a compact column/row table
+(analysis/frame_records.json). Synthesis receives a digest that collapses
+consecutive frames with the same event and people into one line, and clip
+extraction reads the fields directly instead of keyword regexes.
+"""
+
+import json
+import os
+from datetime import timedelta
+from typing import List, Optional
+
+
+FRAME_RECORDS_FILENAME = "frame_records.json"
+
+EVENT_TYPES = [
+    "construction", "golf_course", "interview", "ceremony", "award",
+    "tournament", "family_gathering", "social_event", "other"
+]
+
+# Structured output JSON schema for vision batches (strict: all fields required)
+FRAME_RECORDS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "frames": {
+            "type": "array",
+            "description": "One record per frame, in the order given",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "timestamp": {"type": "string", "description": "The frame's timestamp exactly as given"},
+                    "scene": {"type": "string", "description": "What is happening visually (setting, activity)"},
+                    "people": {
+                        "type": "array",
+                        "description": "People visible: names if identifiable, otherwise short descriptions",
+                        "items": {"type": "string"}
+                    },
+                    "event_type": {"type": "string", "enum": EVENT_TYPES},
+                    "speaking": {"type": "boolean", "description": "Someone is speaking during this frame"},
+                    "speaker": {"type": "string", "description": "Who is speaking (speaker label or name), or empty"},
+                    "audio": {"type": "string", "description": "Relevant spoken words for this frame, or empty"}
+                },
+                "required": ["timestamp", "scene", "people", "event_type", "speaking", "speaker", "audio"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["frames"],
+    "additionalProperties": False
+}
+
+FRAME_RECORDS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "frame_records",
+        "strict": True,
+        "schema": FRAME_RECORDS_SCHEMA
+    }
+}
+
+
+def format_seconds(seconds: float) -> str:
+    """H:MM:SS, matching the frame extraction timestamps"""
+    return str(timedelta(seconds=int(seconds)))
+
+
+class FrameRecord:
+    """Vision analysis of one frame at an absolute time in the video"""
+
+    __slots__ = ('seconds', 'scene', 'people', 'event_type', 'speaking', 'speaker', 'audio')
+
+    COLUMNS = list(__slots__)
+
+    def __init__(self, seconds: float, scene: str = '', people: List[str] = None, event_type: str = 'other',
+                 speaking: bool = False, speaker: str = '', audio: str = ''):
+        self.seconds = seconds
+        self.scene = scene
+        self.people = people or []
+        self.event_type = event_type
+        self.speaking = speaking
+        self.speaker = speaker
+        self.audio = audio
+
+    @property
+    def timestamp(self) -> str:
+        return format_seconds(self.seconds)
+
+    def to_row(self) -> list:
+        return [getattr(self, column) for column in self.COLUMNS]
+
+    def line(self) -> str:
+        """Readable one-line form (the old free-text format)"""
+        text = f"[{self.timestamp}] VISUAL: {self.scene} | PEOPLE: {', '.join(self.people) or 'none'}"
+        if self.speaking:
+            speaker = f"{self.speaker} says " if self.speaker else ''
+            text += f" | AUDIO: {speaker}\"{self.audio}\""
+        return text + f" | EVENT: {self.event_type}"
+
+    def __repr__(self):
+        return f"FrameRecord({self.timestamp}, {self.event_type!r}, {self.scene[:30]!r})"
+
+
+def match_frames(content: str, batch_data: List[dict]) -> List[tuple]:
+    """
+    (seconds within the batch's file, raw frame dict) for each frame of a
+    FRAME_RECORDS_SCHEMA-style response.
+
+    Frames are matched by the timestamp the model echoes back; if it altered
+    them but returned one record per frame, they are matched by position.
+    Raises ValueError on invalid JSON (e.g. a truncated response).
+    """
+    try:
+        frames = json.loads(content)['frames']
+    except (TypeError, KeyError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid frame records: {e}")
+
+    seconds_by_timestamp = {data['timestamp']: data['seconds'] for data in batch_data}
+    by_position = len(frames) == len(batch_data)
+
+    matched = []
+    for i, frame in enumerate(frames):
+        seconds = seconds_by_timestamp.get(frame.get('timestamp'))
+        if seconds is None:
+            if not by_position:
+                continue
+            seconds = batch_data[i]['seconds']
+        matched.append((seconds, frame))
+    return matched
+
+
+def record_from_frame(seconds: float, frame: dict) -> FrameRecord:
+    return FrameRecord(
+        seconds=seconds,
+        scene=frame.get('scene', ''),
+        people=list(frame.get('people', [])),
+        event_type=frame.get('event_type', 'other'),
+        speaking=bool(frame.get('speaking', False)),
+        speaker=frame.get('speaker', ''),
+        audio=frame.get('audio', '')
+    )
+
+
+def parse_frame_records(content: str, batch_data: List[dict], time_offset: float = 0.0) -> List[FrameRecord]:
+    """
+    Turn a FRAME_RECORDS_SCHEMA response into records with absolute times
+    (frames matched as in match_frames; raises ValueError on invalid JSON).
+    """
+    return [record_from_frame(time_offset + seconds, frame) for seconds, frame in match_frames(content, batch_data)]
+
+
+def render_lines(records: List[FrameRecord]) -> str:
+    return '\n'.join(record.line() for record in records)
+
+
+def digest(records: List[FrameRecord]) -> str:
+    """
+    Deduplicated summary for the synthesis prompt: consecutive frames with the
+    same event type, people and speaking state become one span line.
+    """
+    lines = []
+    span = []
+
+    def flush():
+        if not span:
+            return
+        first, last = span[0], span[-1]
+        people = ', '.join(first.people) or 'none'
+        text = f"[{first.timestamp}-{last.timestamp}] {first.event_type.upper()} | PEOPLE: {people} | {first.scene}"
+        if last.scene != first.scene and len(span) > 1:
+            text += f" ... {last.scene}"
+        speakers = sorted({record.speaker for record in span if record.speaking and record.speaker})
+        if speakers:
+            text += f" | SPEAKING: {', '.join(speakers)}"
+        lines.append(text)
+
+    for record in sorted(records, key=lambda r: r.seconds):
+        if span and (record.event_type, tuple(record.people), record.speaking) != \
+                (span[-1].event_type, tuple(span[-1].people), span[-1].speaking):
+            flush()
+            span = []
+        span.append(record)
+    flush()
+    return '\n'.join(lines)
+
+
+def save_frame_records(records: List[FrameRecord], analysis_dir: str):
+    """Write the per-video table (columns once, one row per frame)"""
+    table = {
+        'columns': FrameRecord.COLUMNS,
+        'rows': [record.to_row() for record in sorted(records, key=lambda r: r.seconds)]
+    }
+    with open(os.path.join(analysis_dir, FRAME_RECORDS_FILENAME), 'w') as f:
+        json.dump(table, f, separators=(',', ':'))
+
+
+def load_frame_records(analysis_dir: str) -> Optional[List[FrameRecord]]:
+    """Records saved by SimpleDirector, or None for videos processed before frame records existed"""
+    path = os.path.join(analysis_dir, FRAME_RECORDS_FILENAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        table = json.load(f)
+    columns = table['columns']
+    return [FrameRecord(**dict(zip(columns, row))) for row in table['rows']]
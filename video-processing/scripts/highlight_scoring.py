@@ -0,0 +1,431 @@
+"""
+Highlight Scoring Engine
+Local, vectorized scoring of candidate clip windows - no API calls.
+
+Part of the Pete Dye Story video processing system.
+
+Builds per-second feature arrays for a processed video and combines them
+with NumPy into a single "interest" curve:
+  - Audio energy and applause (from analysis/audio_labels.json)
+  - Motion (frame differencing at 1 fps, cached in analysis/motion_profile.json)
+  - Speech density (words per second from word timestamps)
+  - Character-name hits (names/aliases from characters.json in the transcript)
+  - Frame events (Pete Dye on screen, construction, ceremonies, interviews
+    from analysis/frame_records.json)
+
+Candidate clip windows are ranked by their summed score with non-maximum
+suppression so picks don't overlap. Used by extract_clips.py.
+
+Usage (score every processed video, no video decoding):
+    python scripts/highlight_scoring.py
+    python scripts/highlight_scoring.py --output-dir path/to/output
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from frame_records import FrameRecord, load_frame_records
+from timed_transcript import TimedTranscript
+
+# Relative weight of each feature in the combined score
+FEATURE_WEIGHTS = {
+    'audio_energy': 0.75,
+    'applause': 1.5,
+    'motion': 0.75,
+    'speech_density': 1.0,
+    'character_hits': 2.0,
+    'frame_events': 1.0,
+}
+
+# Per-frame interest of a vision record's event type (other types score 0)
+FRAME_EVENT_PRIORITY = {
+    'construction': 2,
+    'ceremony': 2,
+    'award': 2,
+    'interview': 1,
+    'golf_course': 1,
+    'tournament': 1,
+}
+
+# A frame record covers the seconds up to the next sampled frame, at most this long
+FRAME_RECORD_SPAN_SECONDS = 8
+
+# Name hits are spread over a few seconds so a mention lifts its surroundings
+NAME_HIT_SPREAD_SECONDS = 5
+
+
+@dataclass
+class HighlightScores:
+    """Per-second feature tracks and the combined score for one video"""
+    duration: int
+    tracks: Dict[str, np.ndarray] = field(default_factory=dict)
+    score: np.ndarray = None
+
+    def contributions(self, weights: Dict[str, float] = None) -> Dict[str, np.ndarray]:
+        """Each track's share of the combined score (weighted robust z units)"""
+        weights = weights or FEATURE_WEIGHTS
+        return {name: weights.get(name, 0.0) * _standardize(track) for name, track in self.tracks.items()}
+
+
+# ---------------------------------------------------------------------------
+# Feature extraction
+# ---------------------------------------------------------------------------
+
+def _fit_length(values, duration: int) -> np.ndarray:
+    """Pad or trim a per-second array to exactly `duration` entries"""
+    arr = np.zeros(duration, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32)[:duration]
+    arr[:len(values)] = values
+    return arr
+
+
+def audio_features(audio_labels: Optional[dict], duration: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-second (energy, applause) arrays from audio_labels.json data"""
+    if not audio_labels:
+        return np.zeros(duration, dtype=np.float32), np.zeros(duration, dtype=np.float32)
+
+    window = float(audio_labels.get('window_seconds', 1.0)) or 1.0
+    energy_db = np.asarray(audio_labels.get('energy_db', []), dtype=np.float32)
+    applause = np.asarray(audio_labels.get('applause_score', []), dtype=np.float32)
+    labels = np.asarray(audio_labels.get('labels', []))
+
+    # Only count applause where the classifier actually labeled applause
+    if len(labels) == len(applause):
+        applause = applause * (labels == 'applause')
+
+    # Resample window-indexed arrays onto whole seconds
+    seconds = (np.arange(duration) / window).astype(int)
+    valid = seconds < len(energy_db)
+    energy = np.full(duration, -90.0, dtype=np.float32)
+    energy[valid] = energy_db[seconds[valid]]
+    applause_track = np.zeros(duration, dtype=np.float32)
+    valid = seconds < len(applause)
+    applause_track[valid] = applause[seconds[valid]]
+
+    return energy, applause_track
+
+
+def compute_motion_profile(video_path: str, duration: int, sample_fps: float = 1.0) -> np.ndarray:
+    """Mean absolute difference between consecutive downscaled frames, one value per second"""
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    step = max(int(round(fps / sample_fps)), 1)
+
+    motion = np.zeros(duration, dtype=np.float32)
+    previous = None
+    frame_num = 0
+
+    while True:
+        # grab() advances without converting; only sampled frames are retrieved
+        if not cap.grab():
+            break
+        if frame_num % step == 0:
+            success, frame = cap.retrieve()
+            if success:
+                small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (64, 36)).astype(np.float32)
+                second = int(frame_num / fps)
+                if previous is not None and second < duration:
+                    motion[second] = np.mean(np.abs(small - previous))
+                previous = small
+        frame_num += 1
+
+    cap.release()
+    return motion
+
+
+def load_motion_profile(analysis_dir: str, video_path: Optional[str], duration: int) -> np.ndarray:
+    """Load the cached motion profile, computing (and caching) it when the video is available"""
+    cache_path = os.path.join(analysis_dir, 'motion_profile.json')
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r') as f:
+            return _fit_length(json.load(f).get('motion', []), duration)
+
+    if not video_path or not os.path.exists(video_path):
+        return np.zeros(duration, dtype=np.float32)
+
+    motion = compute_motion_profile(video_path, duration)
+    with open(cache_path, 'w') as f:
+        json.dump({'sample_fps': 1.0, 'motion': [round(float(v), 2) for v in motion]}, f)
+    return motion
+
+
+def speech_density(word_starts: np.ndarray, duration: int) -> np.ndarray:
+    """Words spoken per second"""
+    if len(word_starts) == 0:
+        return np.zeros(duration, dtype=np.float32)
+    seconds = np.clip(np.asarray(word_starts, dtype=np.float64).astype(int), 0, duration - 1)
+    return np.bincount(seconds, minlength=duration)[:duration].astype(np.float32)
+
+
+def _normalize_token(text: str) -> str:
+    return re.sub(r"[^a-z0-9']", '', text.lower())
+
+
+def character_name_patterns(characters: dict) -> List[Tuple[str, ...]]:
+    """Token sequences for every character name and alias (e.g. ('pete', 'dye'))"""
+    patterns = set()
+    for char in characters.get('characters', []):
+        for name in [char.get('name', '')] + list(char.get('aliases', [])):
+            tokens = tuple(t for t in (_normalize_token(p) for p in name.split()) if t)
+            # Skip very short single-token aliases ("Jim", "JDL") that over-match
+            if tokens and (len(tokens) > 1 or len(tokens[0]) > 3):
+                patterns.add(tokens)
+    return sorted(patterns)
+
+
+def character_hits(word_texts: List[str], word_starts: np.ndarray, characters: dict, duration: int) -> np.ndarray:
+    """Per-second count of character name/alias mentions in the word timeline"""
+    hits = np.zeros(duration, dtype=np.float32)
+    if len(word_texts) == 0:
+        return hits
+
+    tokens = np.array([_normalize_token(w) for w in word_texts])
+    matched = np.zeros(len(tokens), dtype=bool)
+
+    for pattern in character_name_patterns(characters):
+        n = len(pattern)
+        if n > len(tokens):
+            continue
+        # Compare shifted token arrays so multi-word names match in one pass
+        mask = np.ones(len(tokens) - n + 1, dtype=bool)
+        for offset, token in enumerate(pattern):
+            mask &= tokens[offset:len(tokens) - n + 1 + offset] == token
+        matched[:len(mask)] |= mask
+
+    seconds = np.clip(np.asarray(word_starts)[matched].astype(int), 0, duration - 1)
+    np.add.at(hits, seconds, 1.0)
+    return hits
+
+
+def segment_character_hits(raw_segments: List[dict], characters: dict, duration: int) -> np.ndarray:
+    """Fallback name hits from per-segment transcript excerpts, spread evenly over each segment"""
+    hits = np.zeros(duration, dtype=np.float32)
+    patterns = [' '.join(p) for p in character_name_patterns(characters)]
+
+    for segment in raw_segments:
+        match = re.match(r'(\d{1,2}):(\d{2}):(\d{2})\s*[-–]+\s*(\d{1,2}):(\d{2}):(\d{2})',
+                         segment.get('timestamp_range', ''))
+        if not match:
+            continue
+        h1, m1, s1, h2, m2, s2 = (int(g) for g in match.groups())
+        start, end = h1 * 3600 + m1 * 60 + s1, min(h2 * 3600 + m2 * 60 + s2, duration)
+        if end <= start:
+            continue
+
+        excerpt = ' '.join(_normalize_token(w) for w in
+                           segment.get('audio_transcript_excerpt', segment.get('audio_transcript', '')).split())
+        count = sum(excerpt.count(p) for p in patterns)
+        hits[start:end] += count / (end - start)
+
+    return hits
+
+
+def frame_record_priority(record: FrameRecord) -> int:
+    """Interest of one frame: Pete Dye on screen, its event type, and speech"""
+    priority = FRAME_EVENT_PRIORITY.get(record.event_type, 0)
+    if any('pete dye' in person.lower() for person in record.people):
+        priority += 3
+    if record.speaking and record.event_type != 'interview':
+        priority += 1
+    return priority
+
+
+def frame_event_track(records: Optional[List[FrameRecord]], duration: int) -> np.ndarray:
+    """Per-second frame-record priority, each record held until the next sampled frame"""
+    track = np.zeros(duration, dtype=np.float32)
+    if not records:
+        return track
+
+    records = sorted(records, key=lambda r: r.seconds)
+    for record, following in zip(records, records[1:] + [None]):
+        start = int(record.seconds)
+        end = start + FRAME_RECORD_SPAN_SECONDS
+        if following is not None:
+            end = min(end, max(int(following.seconds), start + 1))
+        track[max(start, 0):min(end, duration)] = frame_record_priority(record)
+    return track
+
+
+# ---------------------------------------------------------------------------
+# Combination and ranking
+# ---------------------------------------------------------------------------
+
+def _standardize(track: np.ndarray) -> np.ndarray:
+    """Robust z-score (median / MAD) clipped to [-3, 3]; flat tracks become zeros"""
+    median = np.median(track)
+    mad = np.median(np.abs(track - median)) * 1.4826
+    scale = mad if mad > 1e-6 else track.std()
+    if scale <= 1e-6:
+        return np.zeros_like(track, dtype=np.float32)
+    return np.clip((track - median) / scale, -3, 3).astype(np.float32)
+
+
+def _smooth(track: np.ndarray, width: int) -> np.ndarray:
+    if width <= 1 or len(track) == 0:
+        return track
+    kernel = np.ones(width, dtype=np.float32) / width
+    return np.convolve(track, kernel, mode='same').astype(np.float32)
+
+
+def combine_features(tracks: Dict[str, np.ndarray], weights: Dict[str, float] = None) -> np.ndarray:
+    """Weighted sum of standardized feature tracks"""
+    weights = weights or FEATURE_WEIGHTS
+    duration = len(next(iter(tracks.values()))) if tracks else 0
+    score = np.zeros(duration, dtype=np.float32)
+    for name, track in tracks.items():
+        score += weights.get(name, 0.0) * _standardize(track)
+    return score
+
+
+def window_sums(score: np.ndarray, window: int) -> np.ndarray:
+    """Sum of every `window`-second span, indexed by start second (cumulative-sum trick)"""
+    if len(score) == 0:
+        return np.zeros(0, dtype=np.float32)
+    window = max(1, min(window, len(score)))
+    csum = np.concatenate(([0.0], np.cumsum(score, dtype=np.float64)))
+    return (csum[window:] - csum[:-window]).astype(np.float32)
+
+
+def rank_windows(score: np.ndarray, window: int, top_k: int, min_gap: int = 0) -> List[Tuple[int, float]]:
+    """
+    Pick the top_k highest-scoring, non-overlapping windows.
+
+    Returns a list of (start_second, mean_score), best first.
+    """
+    sums = window_sums(score, window)
+    if len(sums) == 0:
+        return []
+
+    available = sums.astype(np.float64).copy()
+    picks = []
+    for _ in range(top_k):
+        best = int(np.argmax(available))
+        if not np.isfinite(available[best]):
+            break
+        picks.append((best, float(sums[best]) / window))
+        # Suppress every start whose window would overlap this pick
+        lo = max(0, best - window - min_gap + 1)
+        hi = min(len(available), best + window + min_gap)
+        available[lo:hi] = -np.inf
+
+    return picks
+
+
+def refine_start(scores: HighlightScores, start: int, window: int, search: int = 30) -> int:
+    """Move a clip start to the best-scoring window within +/- search seconds"""
+    sums = window_sums(scores.score, window)
+    if len(sums) == 0:
+        return start
+    lo = max(0, start - search)
+    hi = min(len(sums), start + search + 1)
+    if lo >= hi:
+        return start
+    return lo + int(np.argmax(sums[lo:hi]))
+
+
+# ---------------------------------------------------------------------------
+# Loading a processed video
+# ---------------------------------------------------------------------------
+
+def load_word_timeline(analysis_dir: str, transcript: Optional[TimedTranscript] = None) -> Tuple[List[str], np.ndarray]:
+    """Word texts and start times saved by SimpleDirector (empty if unavailable)"""
+    transcript = transcript or TimedTranscript.load(analysis_dir)
+    return transcript.words.texts(), transcript.word_starts()
+
+
+def load_characters(characters_path: str) -> dict:
+    if os.path.exists(characters_path):
+        with open(characters_path, 'r') as f:
+            return json.load(f)
+    return {"characters": []}
+
+
+def score_video(output_dir: str, duration: int, video_path: Optional[str] = None,
+                characters: Optional[dict] = None, analysis_data: Optional[dict] = None,
+                weights: Dict[str, float] = None,
+                transcript: Optional[TimedTranscript] = None,
+                frame_records: Optional[List[FrameRecord]] = None) -> Optional[HighlightScores]:
+    """
+    Build every feature track for one processed video and combine them.
+
+    Motion is read from cache, or computed from video_path when given.
+    The transcript and frame records are loaded from the analysis folder
+    unless passed in.
+    Returns None when the duration is unknown.
+    """
+    if duration <= 0:
+        return None
+
+    analysis_dir = os.path.join(output_dir, 'analysis')
+    characters = characters or {"characters": []}
+
+    audio_labels = None
+    labels_path = os.path.join(analysis_dir, 'audio_labels.json')
+    if os.path.exists(labels_path):
+        with open(labels_path, 'r') as f:
+            audio_labels = json.load(f)
+
+    energy, applause = audio_features(audio_labels, duration)
+    motion = load_motion_profile(analysis_dir, video_path, duration)
+    word_texts, word_starts = load_word_timeline(analysis_dir, transcript)
+
+    if word_texts:
+        name_hits = character_hits(word_texts, word_starts, characters, duration)
+    else:
+        raw_segments = (analysis_data or {}).get('raw_segments', [])
+        name_hits = segment_character_hits(raw_segments, characters, duration)
+
+    if frame_records is None:
+        frame_records = load_frame_records(analysis_dir)
+
+    tracks = {
+        'audio_energy': energy,
+        'applause': _smooth(applause, 3),
+        'motion': _smooth(motion, 3),
+        'speech_density': _smooth(speech_density(word_starts, duration), 5),
+        'character_hits': _smooth(name_hits, NAME_HIT_SPREAD_SECONDS),
+        'frame_events': _smooth(frame_event_track(frame_records, duration), 5),
+    }
+
+    return HighlightScores(duration=duration, tracks=tracks, score=combine_features(tracks, weights))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pete Dye Story - Highlight Scoring')
+    default_base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument('--output-dir', default=os.path.join(default_base, 'output'),
+                        help='Base output directory (default: video-processing/output)')
+    parser.add_argument('--window', type=int, default=90, help='Clip window in seconds (default: 90)')
+    parser.add_argument('--top', type=int, default=5, help='Windows to list per video (default: 5)')
+    args = parser.parse_args()
+
+    characters = load_characters(os.path.join(default_base, 'characters.json'))
+    pattern = os.path.join(args.output_dir, '*', 'analysis', 'audio_labels.json')
+
+    for labels_path in sorted(glob.glob(pattern)):
+        analysis_dir = os.path.dirname(labels_path)
+        with open(labels_path, 'r') as f:
+            labels = json.load(f)
+        duration = int(len(labels.get('labels', [])) * float(labels.get('window_seconds', 1.0)))
+
+        scores = score_video(os.path.dirname(analysis_dir), duration, characters=characters)
+        if scores is None:
+            continue
+
+        print(f"\n{os.path.basename(os.path.dirname(analysis_dir))} ({duration / 60:.1f} min)")
+        for start, mean_score in rank_windows(scores.score, args.window, args.top):
+            h, m, s = start // 3600, (start % 3600) // 60, start % 60
+            print(f"  {h:02d}:{m:02d}:{s:02d}  score {mean_score:+.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Interval Index - Overlap Queries over Timed Segments
+Static augmented interval tree for "which segments overlap [t0, t1]".
+
+Part of the Pete Dye Story video processing system.
+
+Built once per video over the diarization speaker turns (records with
+.start / .end in seconds) and shared by frame dialogue context and per-segment
+transcript slicing. Segments are sorted by start; an implicit balanced tree
+over that order stores the maximum end time of every subtree, so a query
+costs O(log n + k) instead of a scan over every turn.
+"""
+
+from typing import Iterator, List
+
+
+class IntervalIndex:
+    """Overlap queries over items with .start / .end attributes (inclusive bounds)"""
+
+    def __init__(self, items):
+        self.items = sorted(items or [], key=lambda item: item.start)
+        self.starts = [item.start for item in self.items]
+        self.ends = [item.end for item in self.items]
+
+        # max_end[mid] = max end over the subtree rooted at mid, i.e. items[lo:hi]
+        self._max_end = [0.0] * len(self.items)
+        self._build(0, len(self.items))
+
+    def _build(self, lo: int, hi: int) -> float:
+        if lo >= hi:
+            return float('-inf')
+        mid = (lo + hi) // 2
+        subtree_max = max(self.ends[mid], self._build(lo, mid), self._build(mid + 1, hi))
+        self._max_end[mid] = subtree_max
+        return subtree_max
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator:
+        """Items in start-time order"""
+        return iter(self.items)
+
+    def overlapping(self, start_time: float, end_time: float) -> List:
+        """Items with start <= end_time and end >= start_time, in start-time order"""
+        found = []
+        self._query(0, len(self.items), start_time, end_time, found)
+        return [self.items[i] for i in found]
+
+    def _query(self, lo: int, hi: int, start_time: float, end_time: float, found: List[int]):
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self._max_end[mid] < start_time:
+            return  # Nothing in this subtree reaches the query window
+        self._query(lo, mid, start_time, end_time, found)
+        if self.starts[mid] > end_time:
+            return  # This item and everything to its right start too late
+        if self.ends[mid] >= start_time:
+            found.append(mid)
+        self._query(mid + 1, hi, start_time, end_time, found)
@@ -0,0 +1,524 @@
+"""
+OpenAI Gateway - Adaptive Concurrency for Every API Call
+All transcription, vision and synthesis requests go through call_openai().
+
+Part of the Pete Dye Story video processing system.
+
+An in-process AIMD (additive increase, multiplicative decrease) controller
+decides how many requests may be in flight:
+  - Each healthy completion raises the limit by 1/limit (~ +1 per round trip)
+  - A 429, or a latency spike (> LATENCY_SPIKE_FACTOR x the running average
+    for that kind of call), halves it - at most once per cool-down
+  - x-ratelimit-remaining-* / retry-after headers pause new requests until
+    the window resets, and cap the limit to the remaining request budget
+
+This keeps the pipeline near the account's throughput ceiling instead of
+alternating between idle and throttled (the batch processor's old
+grep-stderr-and-sleep approach).
+
+Before taking a slot, each call also draws from the cross-process RPM/TPM
+budget in rate_budget.py, so parallel workers share one account limit.
+
+Failed requests are classified (classify_error) and the transient kinds -
+rate limit, timeout, connection, 5xx - are retried with jittered exponential
+backoff (never sooner than retry-after). Content and invalid-request errors
+are raised at once for the caller to handle.
+
+In offline batch mode (set_offline_session, see batch_submission.py) chat
+requests are replayed from the session or deferred to the next Batch API
+submission instead of being sent.
+
+acall_openai() is the same path for AsyncOpenAI resources: the request is
+awaited on the event loop, and only waits for a slot or rate budget are
+handed to a worker thread.
+
+Each response's usage.prompt_tokens_details.cached_tokens is tallied per
+kind (controller stats 'prompt_cache'), showing how much of every prompt
+was served from the provider's prefix cache.
+
+Clients come from get_client() / get_async_client(): one per API key (and
+per event loop for async), so every call site shares a keep-alive connection
+pool sized to the controller's ceiling (MAX_LIMIT), with explicit timeouts
+and HTTP/2 when the h2 package is installed. SDK-level retries are off -
+retrying is this module's job, and hidden retries would hide 429s from the
+controller.
+
+Usage:
+    response = call_openai('vision', client.chat.completions, model="gpt-5.1", messages=[...])
+    response = await acall_openai('synthesis', async_client.chat.completions, model="gpt-5.1", messages=[...])
+"""
+
+import asyncio
+import importlib.util
+import os
+import random
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from batch_submission import DEFERRED_KINDS, DeferredRequest
+from rate_budget import estimate_tokens, get_rate_budget, usage_tokens
+
+
+INITIAL_LIMIT = 4
+MIN_LIMIT = 1
+MAX_LIMIT = 32
+DECREASE_FACTOR = 0.5
+DECREASE_COOLDOWN = 5.0         # seconds between multiplicative decreases
+LATENCY_SPIKE_FACTOR = 2.5
+LATENCY_ALPHA = 0.2             # EWMA weight of the newest latency sample
+LATENCY_WARMUP = 5              # samples per kind before spikes count
+LOW_TOKEN_FRACTION = 0.05       # pause when fewer tokens than this remain
+
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 2.0              # seconds; attempt n waits up to BASE * 2^(n-1)
+BACKOFF_CAP = 60.0
+RETRYABLE_ERRORS = {'rate_limit', 'timeout', 'connection', 'server'}
+
+# Shared HTTP pool: never more requests in flight than the controller allows
+POOL_CONNECTIONS = MAX_LIMIT
+KEEPALIVE_EXPIRY = 60.0
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 600.0            # synthesis responses can take minutes
+WRITE_TIMEOUT = 120.0           # audio / batch file uploads
+POOL_TIMEOUT = 60.0
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for HTTP 429 / rate limit errors from the OpenAI SDK"""
+    if getattr(error, 'status_code', None) == 429:
+        return True
+    if type(error).__name__ == 'RateLimitError':
+        return True
+    return 'rate limit' in str(error).lower()
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Error kind of a failed request:
+    rate_limit, timeout, connection, server (5xx), content, invalid (other 4xx),
+    deferred (offline batch mode) or other
+    """
+    if isinstance(error, DeferredRequest):
+        return 'deferred'
+    if is_rate_limit_error(error):
+        return 'rate_limit'
+    name = type(error).__name__
+    status = getattr(error, 'status_code', None)
+    if name == 'APITimeoutError' or isinstance(error, TimeoutError):
+        return 'timeout'
+    if name == 'APIConnectionError' or isinstance(error, ConnectionError):
+        return 'connection'
+    if isinstance(status, int) and status >= 500:
+        return 'server'
+    if (getattr(error, 'code', None) == 'content_policy_violation'
+            or name in ('ContentFilterFinishReasonError', 'LengthFinishReasonError')
+            or isinstance(error, ValueError)):
+        # Refused, truncated or unparseable output
+        return 'content'
+    if isinstance(status, int) and 400 <= status < 500:
+        return 'invalid'
+    return 'other'
+
+
+def backoff_delay(attempt: int, retry_after: float = 0.0) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (1-based), at least retry_after"""
+    ceiling = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1))
+    return max(retry_after, random.uniform(0, ceiling))
+
+
+def parse_reset_seconds(value: Optional[str]) -> float:
+    """Parse OpenAI reset durations like '1s', '6m0s', '20ms', '1h2m3.5s' (or plain seconds)"""
+    if not value:
+        return 0.0
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    for amount, unit in re.findall(r'([\d.]+)(ms|h|m|s)', value):
+        total += float(amount) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}[unit]
+    return total
+
+
+def prompt_cache_usage(response) -> tuple:
+    """(prompt tokens, cached prompt tokens) reported by a parsed response; (0, 0) when absent"""
+    usage = getattr(response, 'usage', None)
+    prompt_tokens = getattr(usage, 'prompt_tokens', None)
+    details = getattr(usage, 'prompt_tokens_details', None)
+    cached_tokens = getattr(details, 'cached_tokens', None)
+    return (prompt_tokens if isinstance(prompt_tokens, int) else 0,
+            cached_tokens if isinstance(cached_tokens, int) else 0)
+
+
+def _header(headers, name: str) -> Optional[str]:
+    if headers is None:
+        return None
+    try:
+        return headers.get(name)
+    except AttributeError:
+        return None
+
+
+class AdaptiveConcurrencyController:
+    """AIMD limit on in-flight OpenAI requests, shared by every thread in the process"""
+
+    def __init__(self, initial: int = INITIAL_LIMIT, minimum: int = MIN_LIMIT, maximum: int = MAX_LIMIT):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(initial)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._latency = {}          # kind -> (ewma seconds, samples)
+        self.stats = {'calls': 0, 'rate_limited': 0, 'latency_spikes': 0, 'decreases': 0, 'peak_limit': float(initial),
+                      'retries': {}, 'prompt_cache': {}}
+
+    def acquire(self):
+        """Block until a request slot is free and no rate-limit pause is active"""
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.time()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                if self.in_flight < int(self.limit):
+                    break
+                self._cond.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        """acquire() for coroutines: takes a free slot at once, otherwise waits off the event loop"""
+        with self._cond:
+            if self._paused_until <= time.time() and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return
+        waiter = asyncio.get_running_loop().run_in_executor(_wait_executor, self.acquire)
+        try:
+            await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # The waiting thread still takes its slot; hand it back once it does
+            waiter.add_done_callback(self._abandon)
+            raise
+
+    def _abandon(self, waiter):
+        """Return a slot taken for a caller that was cancelled while waiting"""
+        if waiter.cancelled() or waiter.exception() is not None:
+            return
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def pause_remaining(self) -> float:
+        """Seconds until a rate-limit pause ends (0 when requests may start)"""
+        with self._cond:
+            return max(0.0, self._paused_until - time.time())
+
+    def release(self, kind: str, latency: float, rate_limited: bool = False, failed: bool = False, headers=None):
+        """Record a finished request and adjust the limit"""
+        with self._cond:
+            self.in_flight -= 1
+            self.stats['calls'] += 1
+            now = time.time()
+
+            if rate_limited:
+                self.stats['rate_limited'] += 1
+                self._decrease(now)
+                retry_after = parse_reset_seconds(_header(headers, 'retry-after'))
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            elif not failed:
+                if self._is_spike(kind, latency):
+                    self.stats['latency_spikes'] += 1
+                    self._decrease(now)
+                else:
+                    self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+                    self.stats['peak_limit'] = max(self.stats['peak_limit'], self.limit)
+
+            self._apply_headers(headers, now)
+            self._cond.notify_all()
+
+    def _decrease(self, now: float):
+        # Many requests fail together on one throttle; count that as a single signal
+        if now - self._last_decrease < DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * DECREASE_FACTOR)
+        self.stats['decreases'] += 1
+
+    def _is_spike(self, kind: str, latency: float) -> bool:
+        average, samples = self._latency.get(kind, (latency, 0))
+        spike = samples >= LATENCY_WARMUP and latency > LATENCY_SPIKE_FACTOR * average
+        self._latency[kind] = ((1 - LATENCY_ALPHA) * average + LATENCY_ALPHA * latency, samples + 1)
+        return spike
+
+    def _apply_headers(self, headers, now: float):
+        remaining_requests = _header(headers, 'x-ratelimit-remaining-requests')
+        if remaining_requests is not None and remaining_requests.isdigit():
+            remaining = int(remaining_requests)
+            if remaining <= self.in_flight:
+                reset = parse_reset_seconds(_header(headers, 'x-ratelimit-reset-requests'))
+                self._paused_until = max(self._paused_until, now + reset)
+            self.limit = max(self.minimum, min(self.limit, remaining + 1))
+
+        remaining_tokens = _header(headers, 'x-ratelimit-remaining-tokens')
+        limit_tokens = _header(headers, 'x-ratelimit-limit-tokens')
+        if (remaining_tokens and limit_tokens and remaining_tokens.isdigit() and limit_tokens.isdigit()
+                and int(remaining_tokens) < LOW_TOKEN_FRACTION * int(limit_tokens)):
+            reset = parse_reset_seconds(_header(headers, 'x-ratelimit-reset-tokens'))
+            self._paused_until = max(self._paused_until, now + reset)
+
+    def record_retry(self, error_kind: str):
+        with self._cond:
+            self.stats['retries'][error_kind] = self.stats['retries'].get(error_kind, 0) + 1
+
+    def record_usage(self, kind: str, response):
+        """Tally prompt and cached prompt tokens of a completed request"""
+        prompt_tokens, cached_tokens = prompt_cache_usage(response)
+        if not prompt_tokens:
+            return
+        with self._cond:
+            entry = self.stats['prompt_cache'].setdefault(kind, {'requests': 0, 'prompt_tokens': 0, 'cached_tokens': 0})
+            entry['requests'] += 1
+            entry['prompt_tokens'] += prompt_tokens
+            entry['cached_tokens'] += cached_tokens
+
+    def cache_hit_rate(self, kind: str) -> float:
+        """Fraction of prompt tokens of this kind served from the prompt cache"""
+        with self._cond:
+            entry = self.stats['prompt_cache'].get(kind)
+            return entry['cached_tokens'] / entry['prompt_tokens'] if entry else 0.0
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            prompt_cache = {
+                kind: dict(entry, hit_rate=round(entry['cached_tokens'] / entry['prompt_tokens'], 3))
+                for kind, entry in self.stats['prompt_cache'].items()
+            }
+            return dict(self.stats, limit=round(self.limit, 2), peak_limit=round(self.stats['peak_limit'], 2),
+                        retries=dict(self.stats['retries']), prompt_cache=prompt_cache)
+
+
+_controller = None
+_controller_lock = threading.Lock()
+_offline_session = None
+
+# Threads that sit in blocking waits (controller slot, rate budget) for acall_openai
+_wait_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="openai-wait")
+
+
+def get_controller() -> AdaptiveConcurrencyController:
+    """The process-wide controller shared by all OpenAI call sites"""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdaptiveConcurrencyController()
+        return _controller
+
+
+_clients = {}
+_async_clients = weakref.WeakKeyDictionary()    # event loop -> {api key: AsyncOpenAI}
+_clients_lock = threading.Lock()
+
+
+def _http_options() -> dict:
+    import httpx
+
+    return {
+        'limits': httpx.Limits(max_connections=POOL_CONNECTIONS, max_keepalive_connections=POOL_CONNECTIONS,
+                               keepalive_expiry=KEEPALIVE_EXPIRY),
+        'timeout': httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT, write=WRITE_TIMEOUT, pool=POOL_TIMEOUT),
+        'http2': importlib.util.find_spec('h2') is not None
+    }
+
+
+def get_client(api_key: str = None):
+    """The process-wide OpenAI client for api_key (default: OPENAI_API_KEY)"""
+    from openai import OpenAI, DefaultHttpxClient
+
+    api_key = api_key or os.environ.get('OPENAI_API_KEY')
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            options = _http_options()
+            client = _clients[api_key] = OpenAI(
+                api_key=api_key, max_retries=0, timeout=options['timeout'],
+                http_client=DefaultHttpxClient(**options)
+            )
+        return client
+
+
+def get_async_client(api_key: str = None):
+    """The AsyncOpenAI client for api_key in the running event loop (pooled connections belong to one loop)"""
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    api_key = api_key or os.environ.get('OPENAI_API_KEY')
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(api_key)
+        if client is None:
+            options = _http_options()
+            client = clients[api_key] = AsyncOpenAI(
+                api_key=api_key, max_retries=0, timeout=options['timeout'],
+                http_client=DefaultAsyncHttpxClient(**options)
+            )
+        return client
+
+
+def set_offline_session(session):
+    """Route calls through an OfflineBatchSession (None to send requests directly again)"""
+    global _offline_session
+    _offline_session = session
+
+
+def _retry_delay(kind: str, error: Exception, attempt: int, max_attempts: int) -> Optional[float]:
+    """Seconds to wait before retrying a failed attempt, or None when the error should be raised"""
+    error_kind = classify_error(error)
+    if error_kind not in RETRYABLE_ERRORS or attempt == max_attempts:
+        return None
+    response = getattr(error, 'response', None)
+    retry_after = parse_reset_seconds(_header(getattr(response, 'headers', None), 'retry-after'))
+    delay = backoff_delay(attempt, retry_after)
+    get_controller().record_retry(error_kind)
+    print(f"  OpenAI {kind} {error_kind} error, retry {attempt}/{max_attempts - 1} in {delay:.1f}s")
+    return delay
+
+
+def _offline_lookup(session, kind: str, kwargs: dict):
+    """(request key, stored response or None); raises DeferredRequest for kinds that wait for the batch"""
+    key = session.request_key(kwargs)
+    stored = session.lookup(key)
+    if stored is None and kind in DEFERRED_KINDS:
+        session.defer(key, kind, kwargs)
+        raise DeferredRequest(key)
+    return key, stored
+
+
+def call_openai(kind: str, resource, max_attempts: int = MAX_ATTEMPTS, **kwargs):
+    """
+    Call resource.create(**kwargs) under the adaptive controller, retrying transient errors.
+
+    kind groups latency statistics ('transcription', 'vision', 'synthesis').
+    resource is an SDK resource such as client.chat.completions or
+    client.audio.transcriptions; the raw response is used to read headers.
+    The last error is raised once max_attempts are used up.
+    """
+    session = _offline_session
+    if session is not None:
+        key, stored = _offline_lookup(session, kind, kwargs)
+        if stored is not None:
+            return stored
+
+    # Uploads (audio files) must be re-read from the same position on every attempt
+    file_positions = {name: value.tell() for name, value in kwargs.items() if hasattr(value, 'seek')}
+
+    for attempt in range(1, max_attempts + 1):
+        for name, position in file_positions.items():
+            kwargs[name].seek(position)
+        try:
+            parsed, text = _call_once(kind, resource, kwargs)
+            if session is not None:
+                session.record(key, kind, parsed, text)
+            return parsed
+        except Exception as e:
+            delay = _retry_delay(kind, e, attempt, max_attempts)
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+
+async def acall_openai(kind: str, resource, max_attempts: int = MAX_ATTEMPTS, run_stats=None, **kwargs):
+    """
+    call_openai() for AsyncOpenAI resources (e.g. async_client.chat.completions).
+
+    run_stats (analysis_stats.AnalysisStats) also gets the prompt-cache usage, for
+    counters scoped to one video rather than the whole process.
+    """
+    session = _offline_session
+    if session is not None:
+        key, stored = _offline_lookup(session, kind, kwargs)
+        if stored is not None:
+            return stored
+
+    file_positions = {name: value.tell() for name, value in kwargs.items() if hasattr(value, 'seek')}
+
+    for attempt in range(1, max_attempts + 1):
+        for name, position in file_positions.items():
+            kwargs[name].seek(position)
+        try:
+            parsed, text = await _acall_once(kind, resource, kwargs, run_stats)
+            if session is not None:
+                session.record(key, kind, parsed, text)
+            return parsed
+        except Exception as e:
+            delay = _retry_delay(kind, e, attempt, max_attempts)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+
+
+def _release_failed(controller: AdaptiveConcurrencyController, kind: str, start: float, error: BaseException):
+    response = getattr(error, 'response', None)
+    controller.release(
+        kind, time.time() - start,
+        rate_limited=is_rate_limit_error(error),
+        failed=True,
+        headers=getattr(response, 'headers', None)
+    )
+
+
+def _call_once(kind: str, resource, kwargs: dict):
+    """One request under the rate budget and controller; returns (parsed response, raw body text)"""
+    model = kwargs.get('model', 'default')
+    estimated = estimate_tokens(kwargs)
+    budget = get_rate_budget()
+    budget.acquire(model, estimated)
+
+    controller = get_controller()
+    controller.acquire()
+    start = time.time()
+    try:
+        raw = resource.with_raw_response.create(**kwargs)
+    except Exception as e:
+        _release_failed(controller, kind, start, e)
+        raise
+
+    controller.release(kind, time.time() - start, headers=raw.headers)
+    parsed = raw.parse()
+    controller.record_usage(kind, parsed)
+    budget.settle(model, estimated, usage_tokens(parsed))
+    return parsed, raw.text
+
+
+async def _acall_once(kind: str, resource, kwargs: dict, run_stats=None):
+    """_call_once() awaited on the event loop"""
+    model = kwargs.get('model', 'default')
+    estimated = estimate_tokens(kwargs)
+    budget = get_rate_budget()
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_wait_executor, budget.acquire, model, estimated)
+
+    controller = get_controller()
+    await controller.acquire_async()
+    start = time.time()
+    try:
+        raw = await resource.with_raw_response.create(**kwargs)
+    except BaseException as e:
+        # Cancellation must hand the slot back too
+        _release_failed(controller, kind, start, e)
+        raise
+
+    # with_raw_response is the legacy wrapper for AsyncOpenAI too: parse() and text are synchronous
+    controller.release(kind, time.time() - start, headers=raw.headers)
+    parsed = raw.parse()
+    controller.record_usage(kind, parsed)
+    if run_stats is not None:
+        run_stats.record_usage(kind, parsed)
+    await loop.run_in_executor(_wait_executor, budget.settle, model, estimated, usage_tokens(parsed))
+    return parsed, raw.text
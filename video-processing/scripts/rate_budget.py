@@ -0,0 +1,196 @@
+"""
+Rate Budget - Cross-Process Request/Token Buckets for OpenAI Calls
+Lets several workers on one machine share the account's rate limits.
+
+Part of the Pete Dye Story video processing system.
+
+Each run_video.py subprocess (and review_edit.py / cross_video_synthesis.py
+running alongside a batch) has its own AIMD controller and cannot see the
+others' traffic. Before every request, call_openai() draws from two token
+buckets per model kept in a small SQLite file:
+
+  - requests:  OPENAI_RPM_LIMIT per minute (default 500)
+  - tokens:    OPENAI_TPM_LIMIT per minute (default 200000)
+
+Buckets refill continuously and start full, so a short burst is allowed but
+the sustained rate across all processes stays under the limit. The token
+cost is estimated from the request (prompt text, images, output cap) and
+settled against the real usage once the response arrives.
+
+Usage:
+    python scripts/rate_budget.py status
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from typing import Optional
+
+
+RATE_BUDGET_FILENAME = "rate_budget.sqlite"
+DEFAULT_RPM = 500
+DEFAULT_TPM = 200000
+MAX_WAIT_STEP = 1.0             # seconds between re-checks while waiting
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = {'low': 85, 'high': 765, 'auto': 765}
+DEFAULT_OUTPUT_TOKENS = 1000
+
+
+def default_budget_path() -> str:
+    """video-processing/output/rate_budget.sqlite, shared by every entry point"""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, "output", RATE_BUDGET_FILENAME)
+
+
+def estimate_tokens(kwargs: dict) -> int:
+    """Rough token cost of a chat request: prompt text + images + output cap (0 for audio)"""
+    messages = kwargs.get('messages')
+    if not messages:
+        return 0
+
+    tokens = 0
+    for message in messages:
+        content = message.get('content') if isinstance(message, dict) else None
+        if isinstance(content, str):
+            tokens += len(content) // CHARS_PER_TOKEN
+        elif isinstance(content, list):
+            for part in content:
+                if part.get('type') == 'text':
+                    tokens += len(part.get('text', '')) // CHARS_PER_TOKEN
+                elif part.get('type') == 'image_url':
+                    detail = part.get('image_url', {}).get('detail', 'auto')
+                    tokens += IMAGE_TOKENS.get(detail, IMAGE_TOKENS['auto'])
+
+    output_cap = kwargs.get('max_completion_tokens') or kwargs.get('max_tokens') or DEFAULT_OUTPUT_TOKENS
+    return tokens + output_cap
+
+
+def usage_tokens(response) -> Optional[int]:
+    """Total tokens reported by a parsed response, or None (e.g. plain-text transcriptions)"""
+    usage = getattr(response, 'usage', None)
+    total = getattr(usage, 'total_tokens', None)
+    return total if isinstance(total, int) else None
+
+
+class RateBudget:
+    """Per-model RPM and TPM token buckets in SQLite, safe across processes"""
+
+    def __init__(self, path: str, rpm: int = None, tpm: int = None):
+        self.path = path
+        self.rpm = rpm or int(os.environ.get('OPENAI_RPM_LIMIT', DEFAULT_RPM))
+        self.tpm = tpm or int(os.environ.get('OPENAI_TPM_LIMIT', DEFAULT_TPM))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    name TEXT PRIMARY KEY,
+                    level REAL NOT NULL,
+                    capacity REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+        self.waited_seconds = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps this safe from any thread
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        return conn
+
+    def _level(self, conn, name: str, capacity: float, now: float) -> float:
+        """Current level of a bucket after refilling at capacity per minute"""
+        row = conn.execute("SELECT level, updated FROM buckets WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return capacity
+        level, updated = row
+        return min(capacity, level + (now - updated) * capacity / 60.0)
+
+    def _store(self, conn, name: str, level: float, capacity: float, now: float):
+        conn.execute(
+            "INSERT OR REPLACE INTO buckets (name, level, capacity, updated) VALUES (?, ?, ?, ?)",
+            (name, level, capacity, now)
+        )
+
+    def acquire(self, model: str, tokens: int = 0):
+        """Block until one request and `tokens` tokens are available for this model"""
+        # A single request larger than the whole bucket would wait forever
+        tokens = min(tokens, self.tpm)
+        request_key, token_key = f"{model}:requests", f"{model}:tokens"
+
+        while True:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                requests_left = self._level(conn, request_key, self.rpm, now)
+                tokens_left = self._level(conn, token_key, self.tpm, now)
+
+                if requests_left >= 1 and tokens_left >= tokens:
+                    self._store(conn, request_key, requests_left - 1, self.rpm, now)
+                    self._store(conn, token_key, tokens_left - tokens, self.tpm, now)
+                    conn.execute("COMMIT")
+                    return
+
+                conn.execute("ROLLBACK")
+            finally:
+                conn.close()
+
+            wait = max(
+                (1 - requests_left) * 60.0 / self.rpm,
+                (tokens - tokens_left) * 60.0 / self.tpm,
+                0.05
+            )
+            wait = min(wait, MAX_WAIT_STEP)
+            self.waited_seconds += wait
+            time.sleep(wait)
+
+    def settle(self, model: str, estimated: int, actual: Optional[int]):
+        """Refund (or charge) the difference between estimated and real token usage"""
+        if actual is None or actual == estimated:
+            return
+        token_key = f"{model}:tokens"
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            level = self._level(conn, token_key, self.tpm, now) + (estimated - actual)
+            # May go negative: an overrun delays the next callers instead of being lost
+            self._store(conn, token_key, min(self.tpm, level), self.tpm, now)
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def status(self) -> dict:
+        conn = self._connect()
+        try:
+            now = time.time()
+            rows = conn.execute("SELECT name, capacity FROM buckets ORDER BY name").fetchall()
+            return {name: round(self._level(conn, name, capacity, now), 1) for name, capacity in rows}
+        finally:
+            conn.close()
+
+
+_budget = None
+
+
+def get_rate_budget() -> RateBudget:
+    """The budget backed by the shared default file (limits from OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT)"""
+    global _budget
+    if _budget is None:
+        _budget = RateBudget(default_budget_path())
+    return _budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared OpenAI rate budget")
+    parser.add_argument('command', choices=['status'])
+    parser.parse_args()
+
+    budget = get_rate_budget()
+    print(f"RPM limit: {budget.rpm}  TPM limit: {budget.tpm}")
+    print(json.dumps(budget.status(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Transcript Records - Normalized Words and Speaker Turns
+Compact __slots__ records created once at the transcription boundary.
+
+Part of the Pete Dye Story video processing system.
+
+The OpenAI SDK returns TranscriptionWord / diarized segment objects (or
+plain dicts, depending on version and response format). Backends convert
+them here, once, so everything downstream uses plain attribute access:
+
+    word.word, word.start, word.end
+    turn.speaker, turn.text, turn.start, turn.end, turn.id
+
+Records are picklable (process pools) and convert to dicts for JSON output.
+"""
+
+from typing import List
+
+
+def _field(obj, name: str, default):
+    """Read a field from an SDK object or a dict"""
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+class Word:
+    """One transcribed word with absolute start/end seconds"""
+
+    __slots__ = ('word', 'start', 'end')
+
+    def __init__(self, word: str, start: float, end: float):
+        self.word = word
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def from_sdk(cls, obj) -> 'Word':
+        if isinstance(obj, cls):
+            return obj
+        text = _field(obj, 'word', None) or _field(obj, 'text', '') or ''
+        return cls(text, float(_field(obj, 'start', 0) or 0), float(_field(obj, 'end', 0) or 0))
+
+    def shifted(self, offset: float) -> 'Word':
+        return Word(self.word, self.start + offset, self.end + offset)
+
+    def to_dict(self) -> dict:
+        return {'word': self.word, 'start': self.start, 'end': self.end}
+
+    def __eq__(self, other):
+        return isinstance(other, Word) and (self.word, self.start, self.end) == (other.word, other.start, other.end)
+
+    def __hash__(self):
+        return hash((self.word, self.start, self.end))
+
+    def __repr__(self):
+        return f"Word({self.word!r}, {self.start:.2f}, {self.end:.2f})"
+
+
+class SpeakerTurn:
+    """One diarized speaker turn; voice / original_speaker are filled in by voiceprint matching"""
+
+    __slots__ = ('speaker', 'text', 'start', 'end', 'id', 'voice', 'original_speaker')
+
+    def __init__(self, speaker: str, text: str, start: float, end: float, id: str = '',
+                 voice: str = None, original_speaker: str = None):
+        self.speaker = speaker
+        self.text = text
+        self.start = start
+        self.end = end
+        self.id = id
+        self.voice = voice
+        self.original_speaker = original_speaker
+
+    @classmethod
+    def from_sdk(cls, obj) -> 'SpeakerTurn':
+        if isinstance(obj, cls):
+            return obj
+        return cls(
+            speaker=str(_field(obj, 'speaker', 'unknown') or 'unknown'),
+            text=_field(obj, 'text', '') or '',
+            start=float(_field(obj, 'start', 0) or 0),
+            end=float(_field(obj, 'end', 0) or 0),
+            id=_field(obj, 'id', '') or '',
+            voice=_field(obj, 'voice', None),
+            original_speaker=_field(obj, 'original_speaker', None)
+        )
+
+    def shifted(self, offset: float, id: str = None) -> 'SpeakerTurn':
+        return SpeakerTurn(self.speaker, self.text, self.start + offset, self.end + offset,
+                           id or self.id, self.voice, self.original_speaker)
+
+    @property
+    def label(self) -> str:
+        """Speaker label with the matched voice name, e.g. 'S1 (Pete Dye)'"""
+        return f"{self.speaker} ({self.voice})" if self.voice else self.speaker
+
+    def to_dict(self) -> dict:
+        data = {'speaker': self.speaker, 'text': self.text, 'start': self.start, 'end': self.end, 'id': self.id}
+        if self.original_speaker is not None:
+            data['original_speaker'] = self.original_speaker
+        if self.voice:
+            data['voice'] = self.voice
+        return data
+
+    def __repr__(self):
+        return f"SpeakerTurn({self.label!r}, {self.start:.2f}-{self.end:.2f}, {self.text[:30]!r})"
+
+
+def words_from_sdk(items) -> List[Word]:
+    return [Word.from_sdk(item) for item in items or []]
+
+
+def turns_from_sdk(items) -> List[SpeakerTurn]:
+    return [SpeakerTurn.from_sdk(item) for item in items or []]
@@ -11,10 +11,14 @@ Stream A overhaul:
 - Speaker diarization integration
 - Structured output schema with strict validation
 - Human-readable markdown report generated from structured data
+
+analyze_video never blocks its event loop: ffmpeg/ffprobe run as asyncio
+subprocesses, speech-to-text, vision and synthesis requests use AsyncOpenAI,
+and audio analysis and frame decoding run on an explicit executor, so
+several videos can be analyzed concurrently in one loop (analyze_videos).
 """
 
 import asyncio
-import subprocess
 import os
 import json
 import time
@@ -22,20 +26,35 @@ import re
 from datetime import timedelta
 from dataclasses import dataclass
 from typing import List, Optional
-from openai import OpenAI
 
 # Import sub-agent from same directory
 from fast_multimodal_transcript import FastMultimodalVideoTranscriber
+from audio_classifier import classify_audio, save_audio_labels
+from timed_transcript import TimedTranscript
+from interval_index import IntervalIndex
+from vision_dispatcher import configure_vision_dispatcher, DEFAULT_MAX_IN_FLIGHT
+from openai_gateway import acall_openai, get_controller, get_async_client
+from async_process import probe_duration
+from rate_budget import get_rate_budget
+from vision_cache import VisionCache, VISION_CACHE_DIRNAME
+from vision_cascade import VisionCascade, TRIAGE_MODEL
+from analysis_stats import AnalysisStats
+from frame_records import digest, save_frame_records
+from batch_submission import DeferredRequest
+from transcription_backends import create_transcription_backend
+from audio_fingerprint import AudioFingerprintIndex, fingerprint_audio, subtract_spans, INDEX_FILENAME as FINGERPRINT_INDEX_FILENAME
+from frame_index import FrameHashIndex, FrameReuse, INDEX_FILENAME as FRAME_INDEX_FILENAME
+from voiceprints import VoiceprintIndex, resolve_speakers, save_speaker_map, INDEX_FILENAME as VOICEPRINT_INDEX_FILENAME
 
 
 @dataclass
 class VideoSegment:
-    """Represents a video segment for processing"""
+    """A time range of the source video, analyzed in place (no segment file)"""
     segment_id: int
     start_time: float
     end_time: float
     duration: float
-    file_path: str
+    source_path: str
     timestamp_range: str
 
 
@@ -43,13 +62,17 @@ class SimpleDirector:
     """
     SIMPLE Director - 4-Phase Video Analysis Pipeline:
     1. Extract and transcribe FULL audio (with diarization) first
-    2. Create video segments for visual analysis
-    3. Process segments with visual analysis + sync to full transcript
+    2. Plan segment time ranges for visual analysis
+    3. Sample each range's frames from the source + sync to full transcript
     4. Send everything to GPT-5.1 for structured synthesis
 
     Uses OpenAI for everything - only one API key needed.
     """
 
+    # Above this share of speech windows, gating saves too little to be worth
+    # the extra per-span requests, so the whole track is transcribed
+    SPEECH_GATE_MAX_FRACTION = 0.85
+
     # Structured output JSON schema for GPT-5.1 response_format
     # All fields required, all objects have additionalProperties: false
     ANALYSIS_SCHEMA = {
@@ -175,11 +198,17 @@ class SimpleDirector:
         "additionalProperties": False
     }
 
-    def __init__(self, openai_api_key: str, base_dir: str = None, model: str = "gpt-5.1", skip_diarization: bool = True, enable_diarization: bool = False):
+    def __init__(self, openai_api_key: str, base_dir: str = None, model: str = "gpt-5.1", skip_diarization: bool = True, enable_diarization: bool = False, speech_gate: bool = True, transcriber: str = "openai", fingerprint_reuse: bool = True,
+                 vision_concurrency: int = DEFAULT_MAX_IN_FLIGHT, vision_cache: bool = True, vision_cascade: bool = True, frame_reuse: bool = True):
         self.openai_api_key = openai_api_key
-        self.openai_client = OpenAI(api_key=openai_api_key)
         self.model = model
         self.skip_diarization = skip_diarization and not enable_diarization
+        self.speech_gate = speech_gate
+        self.fingerprint_reuse = fingerprint_reuse
+        self.frame_reuse = frame_reuse
+
+        # Every vision batch of every segment shares one capped pool
+        self.vision_dispatcher = configure_vision_dispatcher(vision_concurrency)
 
         # Set base directory (defaults to video-processing folder)
         if base_dir:
@@ -187,19 +216,24 @@ class SimpleDirector:
         else:
             self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-        self.base_segments_dir = os.path.join(self.base_dir, "segments")
         self.base_output_dir = os.path.join(self.base_dir, "output")
 
         # Create base directories
-        for directory in [self.base_segments_dir, self.base_output_dir]:
-            if not os.path.exists(directory):
-                os.makedirs(directory)
+        if not os.path.exists(self.base_output_dir):
+            os.makedirs(self.base_output_dir)
 
         # Load character knowledge base
         self.characters = self._load_characters()
 
-        # Initialize sub-agent (now only needs OpenAI key)
-        self.sub_agent = FastMultimodalVideoTranscriber(openai_api_key)
+        # Initialize sub-agent (now only needs OpenAI key) with the chosen speech-to-text backend
+        self.transcriber = transcriber
+        transcription_backend = create_transcription_backend(transcriber, openai_api_key)
+        self.vision_cache = VisionCache(os.path.join(self.base_output_dir, VISION_CACHE_DIRNAME)) if vision_cache else None
+        self.vision_cascade = VisionCascade() if vision_cascade else None
+        self.sub_agent = FastMultimodalVideoTranscriber(
+            openai_api_key, transcription_backend=transcription_backend, vision_cache=self.vision_cache,
+            vision_cascade=self.vision_cascade
+        )
 
     def _load_characters(self) -> dict:
         """Load the character knowledge base from characters.json"""
@@ -250,14 +284,13 @@ class SimpleDirector:
 
         return "\n".join(lines)
 
-    def setup_video_folders(self, video_path: str) -> tuple:
+    def setup_video_folders(self, video_path: str) -> str:
         """Create organized folder structure for a specific video"""
         video_name = os.path.splitext(os.path.basename(video_path))[0]
         video_name = re.sub(r'[^\w\-_]', '_', video_name)  # Clean filename
 
         # Create video-specific directories
         video_output_dir = os.path.join(self.base_output_dir, video_name)
-        video_segments_dir = os.path.join(self.base_segments_dir, video_name)
 
         # Create subdirectories for organized output
         subdirs = [
@@ -265,28 +298,24 @@ class SimpleDirector:
             os.path.join(video_output_dir, "audio"),       # Extracted audio files
             os.path.join(video_output_dir, "frames"),      # Video frames
             os.path.join(video_output_dir, "segments"),    # Segment metadata
-            video_segments_dir                              # Temp segment videos
         ]
 
         for directory in subdirs:
             if not os.path.exists(directory):
                 os.makedirs(directory)
 
-        return video_output_dir, video_segments_dir
+        return video_output_dir
 
-    def get_video_duration(self, video_path: str) -> float:
+    async def get_video_duration(self, video_path: str) -> float:
         """Get video duration using ffprobe"""
-        try:
-            cmd = ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', '-of', 'csv=p=0', video_path]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            return float(result.stdout.strip())
-        except Exception as e:
-            print(f"Error getting video duration: {e}")
-            return 0.0
-
-    def create_segments(self, video_path: str, video_segments_dir: str, segment_duration: int = 150) -> List[VideoSegment]:
-        """Create video segment metadata"""
-        total_duration = self.get_video_duration(video_path)
+        duration = await probe_duration(video_path)
+        if not duration:
+            print(f"Error getting video duration: {video_path}")
+        return duration
+
+    async def create_segments(self, video_path: str, segment_duration: int = 150) -> List[VideoSegment]:
+        """Create video segment metadata (time ranges of the source; nothing is written)"""
+        total_duration = await self.get_video_duration(video_path)
         segments = []
 
         segment_id = 0
@@ -301,7 +330,7 @@ class SimpleDirector:
                 start_time=start_time,
                 end_time=end_time,
                 duration=duration,
-                file_path=f"{video_segments_dir}/segment_{segment_id:03d}_{int(start_time)}s-{int(end_time)}s.mp4",
+                source_path=video_path,
                 timestamp_range=f"{str(timedelta(seconds=int(start_time)))} - {str(timedelta(seconds=int(end_time)))}"
             )
 
@@ -311,119 +340,157 @@ class SimpleDirector:
 
         return segments
 
-    def extract_segment(self, video_path: str, segment: VideoSegment) -> bool:
-        """Extract a video segment using ffmpeg"""
-        cmd = [
-            'ffmpeg', '-i', video_path,
-            '-ss', str(segment.start_time),
-            '-t', str(segment.duration),
-            '-c', 'copy', '-avoid_negative_ts', 'make_zero',
-            '-y', segment.file_path
-        ]
+    async def process_segment_with_full_transcript_async(self, segment: VideoSegment, timed_transcript: TimedTranscript,
+                                                         diarization_index: Optional[IntervalIndex] = None,
+                                                         frame_reuse: Optional[FrameReuse] = None,
+                                                         run_stats: Optional[AnalysisStats] = None):
+        """
+        Process one segment with VISUAL analysis only, using full transcript for audio.
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return result.returncode == 0
+        Frames are sampled straight from the source for [start_time, end_time), so
+        frame times (and the timestamps in the prompts) are absolute.
+        """
+        # Quiet per-segment logging — progress shown at phase level
 
-    async def process_segment_async(self, segment: VideoSegment):
-        """Process one segment with our proven sub-agent"""
-        print(f"Processing segment {segment.segment_id}: {segment.timestamp_range}")
+        if diarization_index:
+            # Per-frame speaker turns come from the shared index (absolute times)
+            result = await self.sub_agent.process_video_visual_only_with_diarization(
+                segment.source_path,
+                4,  # frame_interval
+                timed_transcript,
+                diarization_index,
+                0.0,  # frame times are already absolute
+                frame_reuse,
+                start=segment.start_time,
+                end=segment.end_time,
+                run_stats=run_stats
+            )
+        else:
+            result = await self.sub_agent.process_video_visual_only(
+                segment.source_path,
+                4,  # frame_interval
+                timed_transcript,  # Shared transcript: full text + per-frame words
+                0.0,  # frame times are already absolute
+                frame_reuse,
+                start=segment.start_time,
+                end=segment.end_time,
+                run_stats=run_stats
+            )
 
-        # Use asyncio executor for true parallel processing
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            self.sub_agent.process_video_fast,
-            segment.file_path,
-            4  # frame_interval
-        )
+        excerpt = ''
+        if diarization_index:
+            excerpt = self.extract_speaker_turns_for_segment(diarization_index, segment)
 
         return {
             'segment_id': segment.segment_id,
             'timestamp_range': segment.timestamp_range,
             'multimodal_analysis': result.get('multimodal_analysis', ''),
-            'audio_transcript': result.get('audio_transcript', ''),
+            'frame_records': result.get('frame_records', []),
+            'failed_batches': result.get('failed_batches', []),
+            'audio_transcript_excerpt': excerpt or self.extract_transcript_for_segment(timed_transcript, segment),
             'processing_time': result.get('processing_time', 0)
         }
 
-    async def process_segment_with_full_transcript_async(self, segment: VideoSegment, full_transcript: dict):
-        """Process one segment with VISUAL analysis only, using full transcript for audio"""
-        # Quiet per-segment logging — progress shown at phase level
+    def _reuse_fingerprint_matches(self, fingerprint, video_name: str, audio_duration: float, spans: Optional[list]) -> Optional[dict]:
+        """Find spans already transcribed in other videos and what is left to transcribe"""
+        index = AudioFingerprintIndex(os.path.join(self.base_output_dir, FINGERPRINT_INDEX_FILENAME))
+        try:
+            matched = []
+            for match in index.find_matches(fingerprint, exclude=video_name):
+                piece = index.reuse_words(match)
+                if piece is not None:
+                    matched.append((match, piece))
+        finally:
+            index.close()
+
+        if not matched:
+            return None
+
+        if spans is None:
+            spans = [(0.0, audio_duration)]
+        remaining = subtract_spans(spans, [(m.start, m.end) for m, _ in matched])
+        reused_seconds = sum(e - s for s, e in spans) - sum(e - s for s, e in remaining)
+
+        print(f"   ├─ ♻️  Audio fingerprint: {reused_seconds/60:.1f} min already transcribed in {len(set(m.source for m, _ in matched))} other video(s)")
+        for match, piece in matched:
+            print(f"   │    {timedelta(seconds=int(match.start))}-{timedelta(seconds=int(match.end))} ← {match.source} ({len(piece['words'])} words)")
 
-        # Use asyncio executor for visual-only processing
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            self.sub_agent.process_video_visual_only,
-            segment.file_path,
-            4,  # frame_interval
-            full_transcript  # Pass the complete transcript
-        )
+        return {
+            'pieces': [piece for _, piece in matched],
+            'remaining_spans': remaining,
+            'reused_spans': [(m.start, m.end) for m, _ in matched],
+            'matches': [
+                {'source': m.source, 'start': round(m.start, 2), 'end': round(m.end, 2), 'offset': round(m.offset, 2)}
+                for m, _ in matched
+            ]
+        }
+
+    def _merge_reused_transcript(self, full_transcript: dict, reused: dict) -> dict:
+        """Interleave freshly transcribed chunks with reused spans in time order"""
+        pieces = list(full_transcript.get('text_chunks') or [])
+        if not pieces and full_transcript.get('high_quality_transcript'):
+            pieces = [{'start': 0.0, 'text': full_transcript['high_quality_transcript']}]
+        pieces = sorted(pieces + reused['pieces'], key=lambda p: p['start'])
+
+        words = list(full_transcript.get('timestamped_transcript') or [])
+        for piece in reused['pieces']:
+            words.extend(piece['words'])
 
         return {
-            'segment_id': segment.segment_id,
-            'timestamp_range': segment.timestamp_range,
-            'multimodal_analysis': result.get('multimodal_analysis', ''),
-            'audio_transcript_excerpt': self.extract_transcript_for_segment(full_transcript, segment),
-            'processing_time': result.get('processing_time', 0)
+            'high_quality_transcript': '\n\n'.join(p['text'] for p in pieces if p['text']),
+            'timestamped_transcript': words,
+            'text_chunks': [{'start': p['start'], 'text': p['text']} for p in pieces]
         }
 
-    def extract_transcript_for_segment(self, full_transcript: dict, segment: VideoSegment) -> str:
+    def extract_transcript_for_segment(self, timed_transcript: TimedTranscript, segment: VideoSegment) -> str:
         """Extract the relevant portion of full transcript for this segment"""
-        start_time = segment.start_time
-        end_time = segment.end_time
-
-        # Get high-quality and timestamped transcripts
-        high_quality = full_transcript.get('high_quality_transcript', '')
-        timestamped = full_transcript.get('timestamped_transcript', [])
-
-        # Extract relevant timestamped portions
-        # Note: timestamped items may be TranscriptionWord objects (with attributes)
-        # or dicts, depending on the OpenAI SDK version
-        relevant_chunks = []
-        for chunk in timestamped:
-            chunk_start = getattr(chunk, 'start', chunk.get('start', 0) if isinstance(chunk, dict) else 0)
-            chunk_end = getattr(chunk, 'end', chunk.get('end', 0) if isinstance(chunk, dict) else 0)
-
-            # If chunk overlaps with segment timeframe
-            if (chunk_start < end_time and chunk_end > start_time):
-                word_text = getattr(chunk, 'word', None) or getattr(chunk, 'text', None)
-                if word_text is None and isinstance(chunk, dict):
-                    word_text = chunk.get('word', chunk.get('text', ''))
-                relevant_chunks.append(word_text or '')
-
-        if relevant_chunks:
-            return ' '.join(relevant_chunks)
-        else:
-            # Fallback: estimate from high-quality transcript
-            total_duration = end_time
-            chars_per_second = len(high_quality) / total_duration if total_duration > 0 else 0
-            start_char = int(start_time * chars_per_second)
-            end_char = int(end_time * chars_per_second)
-            return high_quality[start_char:end_char]
-
-    def _format_diarization_for_prompt(self, diarization: Optional[dict]) -> str:
+        # Binary search over the word timeline; character-rate estimate when no words are timed
+        return timed_transcript.text_between(segment.start_time, segment.end_time)
+
+    def extract_speaker_turns_for_segment(self, diarization_index: IntervalIndex, segment: VideoSegment) -> str:
+        """Speaker-attributed dialogue overlapping this segment, one turn per line"""
+        lines = []
+        for seg in diarization_index.overlapping(segment.start_time, segment.end_time):
+            text = seg.text.strip()
+            if text:
+                lines.append(f"[{timedelta(seconds=int(seg.start))}] Speaker {seg.label}: {text}")
+        return "\n".join(lines)
+
+    def _format_diarization_for_prompt(self, diarization: Optional[dict], diarization_index: Optional[IntervalIndex] = None) -> str:
         """Format diarization results into a readable string for the synthesis prompt"""
         if not diarization or not diarization.get("segments"):
             return "No speaker diarization data available."
 
         lines = []
         lines.append("=== SPEAKER DIARIZATION ===")
-        lines.append("Speaker labels (A, B, C, etc.) represent distinct voices detected in the audio.")
-        lines.append("Use the character knowledge base to match speaker labels to real people.")
+        clusters = (diarization.get("speaker_map") or {}).get("clusters")
+        if clusters:
+            lines.append("Speaker labels (S1, S2, etc.) are voices unified across the whole video by voiceprint.")
+            lines.append("Names shown in the roster come from confirmed voiceprints — treat them as known.")
+            lines.append("Use the character knowledge base only to match the unresolved speakers.")
+            lines.append("")
+            lines.append("Speaker roster:")
+            for label, cluster in clusters.items():
+                minutes = cluster.get("seconds", 0) / 60
+                if cluster.get("name"):
+                    lines.append(f"  {label}: {cluster['name']} (voice match {cluster['similarity']:.2f}, {minutes:.1f} min)")
+                else:
+                    lines.append(f"  {label}: unresolved ({minutes:.1f} min)")
+        else:
+            lines.append("Speaker labels (A, B, C, etc.) represent distinct voices detected in the audio.")
+            lines.append("Use the character knowledge base to match speaker labels to real people.")
         lines.append("")
 
-        for seg in diarization["segments"]:
-            speaker = seg.get("speaker", "?")
-            text = seg.get("text", "")
-            start = seg.get("start", 0)
-            end = seg.get("end", 0)
-            start_ts = str(timedelta(seconds=int(start)))
-            end_ts = str(timedelta(seconds=int(end)))
-            lines.append(f"[{start_ts} - {end_ts}] Speaker {speaker}: {text}")
+        for seg in diarization_index or IntervalIndex(diarization["segments"]):
+            start_ts = str(timedelta(seconds=int(seg.start)))
+            end_ts = str(timedelta(seconds=int(seg.end)))
+            lines.append(f"[{start_ts} - {end_ts}] Speaker {seg.label}: {seg.text}")
 
         return "\n".join(lines)
 
-    def openai_synthesis(self, segment_results: List[dict], full_transcript: dict = None, diarization: Optional[dict] = None) -> dict:
+    async def openai_synthesis(self, segment_results: List[dict], full_transcript: dict = None, diarization: Optional[dict] = None,
+                         diarization_index: Optional[IntervalIndex] = None, segment_frames: Optional[dict] = None,
+                         run_stats: Optional[AnalysisStats] = None) -> dict:
         """Send all segment results to GPT-5.1 for structured synthesis with JSON schema output"""
         print(f"   ├─ Building synthesis prompt...")
 
@@ -431,7 +498,7 @@ class SimpleDirector:
         character_context = self._build_character_context()
 
         # Format the diarization data
-        diarization_text = self._format_diarization_for_prompt(diarization)
+        diarization_text = self._format_diarization_for_prompt(diarization, diarization_index)
 
         # Build the full transcript text (no truncation - GPT-5.1 has 400K context)
         full_transcript_text = ""
@@ -444,9 +511,13 @@ class SimpleDirector:
             segment_analysis_text += f"\n=== SEGMENT {result['segment_id']} ({result['timestamp_range']}) ===\n"
             audio_excerpt = result.get('audio_transcript_excerpt', result.get('audio_transcript', ''))
             segment_analysis_text += f"\nAUDIO EXCERPT:\n{audio_excerpt}\n"
-            segment_analysis_text += f"\nVISUAL ANALYSIS:\n{result['multimodal_analysis']}\n"
+            # Collapsed frame records (one line per unchanged span) instead of every frame's prose
+            frames = (segment_frames or {}).get(result['segment_id'])
+            visual_analysis = digest(frames) if frames else result['multimodal_analysis']
+            segment_analysis_text += f"\nVISUAL ANALYSIS:\n{visual_analysis}\n"
 
-        # System message: unbiased documentary analyst with character knowledge
+        # System message: unbiased documentary analyst, task and character knowledge. It is identical for
+        # every video, so it goes first and is served from the prompt cache after the first synthesis.
         system_message = (
             "You are a documentary film analyst reviewing archival footage from the Pete Dye Golf Club story "
             "(1978-2004). This archive contains diverse footage including: golf course construction, family "
@@ -454,24 +525,25 @@ class SimpleDirector:
             "tournaments, celebrity visits, Christmas parties, and social events. Analyze the content accurately "
             "based on what you actually see and hear. Do not assume everything is construction footage.\n\n"
             "You must return a structured JSON analysis following the provided schema exactly.\n\n"
+            "Based on ALL of the evidence in the user message (transcript, speaker diarization, and visual "
+            "analysis), produce a comprehensive video analysis. Identify the content type accurately (e.g., "
+            "construction footage, interview, ceremony, family gathering, tournament, etc.). Match speaker labels "
+            "from diarization to real people using the character knowledge base. Extract real quotes with accurate "
+            "speaker attribution. Create natural chapter breaks that follow the video's actual narrative flow.\n\n"
             f"{character_context}"
         )
 
-        # User message: all evidence for synthesis
+        # User message: this video's evidence only
         user_message = (
-            f"Analyze the following video evidence and produce a complete structured analysis.\n\n"
             f"=== COMPLETE AUDIO TRANSCRIPT ===\n{full_transcript_text}\n\n"
             f"{diarization_text}\n\n"
-            f"=== SEGMENT-BY-SEGMENT VISUAL ANALYSIS ===\n{segment_analysis_text}\n\n"
-            f"Based on ALL of the above evidence (transcript, speaker diarization, and visual analysis), "
-            f"produce a comprehensive video analysis. Identify the content type accurately (e.g., construction "
-            f"footage, interview, ceremony, family gathering, tournament, etc.). Match speaker labels from "
-            f"diarization to real people using the character knowledge base. Extract real quotes with accurate "
-            f"speaker attribution. Create natural chapter breaks that follow the video's actual narrative flow."
+            f"=== SEGMENT-BY-SEGMENT VISUAL ANALYSIS ===\n{segment_analysis_text}"
         )
 
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await acall_openai(
+                'synthesis', get_async_client(self.openai_api_key).chat.completions,
+                run_stats=run_stats,
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_message},
@@ -504,6 +576,8 @@ class SimpleDirector:
                     'characters_in_knowledge_base': len(self.characters.get('characters', []))
                 }
             }
+        except DeferredRequest:
+            raise  # Offline batch mode: analyze_video stops until the batch is answered
         except json.JSONDecodeError as e:
             print(f"   ├─ ❌ JSON parsing error: {e}")
             print(f"   ├─ Raw response: {raw_content[:300]}")
@@ -665,6 +739,25 @@ class SimpleDirector:
 
         return "\n".join(lines)
 
+    async def _run_cpu(self, fn, *args):
+        """Await CPU-bound work (audio labels, fingerprints, voiceprints) on the decode executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.sub_agent.cpu_executor, fn, *args)
+
+    async def analyze_videos(self, video_paths: List[str], segment_duration: int = 150, max_concurrent: int = 2) -> List[dict]:
+        """
+        Analyze several videos concurrently in this event loop (max_concurrent at a time).
+        They share the vision dispatcher and API controller; the vision cache and
+        cascade counters in each video's metadata cover every video in flight.
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def analyze(video_path):
+            async with semaphore:
+                return await self.analyze_video(video_path, segment_duration)
+
+        return await asyncio.gather(*(analyze(path) for path in video_paths), return_exceptions=True)
+
     async def analyze_video(self, video_path: str, segment_duration: int = 150) -> dict:
         """
         MAIN ENTRY POINT - 4-Phase Video Analysis Pipeline:
@@ -678,13 +771,17 @@ class SimpleDirector:
         print("🎬 ══════════════════════════════════════════════════")
         print(f"🎬  PETE DYE STORY — VIDEO ANALYSIS")
         print(f"🎬  {video_basename}")
-        print(f"🎬  Model: {self.model} | Characters loaded: {len(self.characters.get('characters', []))}")
+        print(f"🎬  Model: {self.model} | Transcriber: {self.transcriber} | Characters loaded: {len(self.characters.get('characters', []))}")
         print("🎬 ══════════════════════════════════════════════════")
         print()
         start_time = time.time()
 
         # Setup organized folders for this video
-        video_output_dir, video_segments_dir = self.setup_video_folders(video_path)
+        video_output_dir = self.setup_video_folders(video_path)
+        video_name = os.path.basename(video_output_dir)
+
+        # This video's cache/cascade/prompt-cache counters (the shared objects count every video in flight)
+        run_stats = AnalysisStats(self.vision_cascade.triage_model if self.vision_cascade is not None else TRIAGE_MODEL)
 
         # ── PHASE 1: AUDIO ─────────────────────────────────────
         phase1_start = time.time()
@@ -693,12 +790,71 @@ class SimpleDirector:
         full_audio_path = f"{video_output_dir}/audio/full_audio.mp3"
         os.makedirs(os.path.dirname(full_audio_path), exist_ok=True)
 
-        audio_path = self.sub_agent.extract_audio_from_video(video_path, full_audio_path)
+        audio_path = await self.sub_agent.extract_audio_async(video_path, full_audio_path)
         audio_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
+        audio_duration = await self.sub_agent.get_audio_duration_async(audio_path)
         print(f"   ├─ ✅ Audio extracted ({audio_size_mb:.1f} MB)")
 
-        print("   ├─ Transcribing with gpt-4o-transcribe...")
-        full_transcript = self.sub_agent.transcribe_audio_openai(audio_path)
+        # Label speech / music / applause / noise locally so only speech is transcribed
+        audio_labels = None
+        if self.speech_gate:
+            print("   ├─ Classifying audio (speech / music / applause / noise)...")
+            try:
+                audio_labels = await self._run_cpu(classify_audio, audio_path)
+                save_audio_labels(audio_labels, f"{video_output_dir}/analysis/audio_labels.json")
+                label_summary = audio_labels.summary()
+                print(f"   ├─ ✅ Audio labels: " + ", ".join(
+                    f"{label} {seconds/60:.1f}m" for label, seconds in label_summary.items()
+                ))
+            except Exception as e:
+                print(f"   ├─ ⚠️  Audio classification failed: {e} — transcribing full track")
+                audio_labels = None
+
+        # Spans to transcribe: speech only when gated, else the whole track (None)
+        transcribe_spans = None
+        if audio_labels and audio_labels.speech_fraction() < self.SPEECH_GATE_MAX_FRACTION:
+            transcribe_spans = audio_labels.speech_spans()
+            if not transcribe_spans:
+                # A misfiring classifier would otherwise leave the whole video without a transcript
+                print("   ├─ ⚠️  Speech gate found no speech — transcribing the full track instead "
+                      "(check audio_labels.json, or pass --no-speech-gate)")
+                transcribe_spans = None
+
+        # Reuse transcripts of audio already heard in other videos (multi-disc sets, compilations, re-transfers)
+        audio_fingerprint = None
+        reused_transcript = None
+        if self.fingerprint_reuse:
+            try:
+                audio_fingerprint = await self._run_cpu(fingerprint_audio, audio_path)
+                if transcribe_spans is None or transcribe_spans:
+                    reused_transcript = await self._run_cpu(
+                        self._reuse_fingerprint_matches, audio_fingerprint, video_name, audio_duration, transcribe_spans
+                    )
+            except Exception as e:
+                print(f"   ├─ ⚠️  Audio fingerprinting failed: {e}")
+                audio_fingerprint = None
+        if reused_transcript:
+            transcribe_spans = reused_transcript['remaining_spans']
+
+        if transcribe_spans is None:
+            print(f"   ├─ Transcribing with {self.transcriber} backend...")
+            full_transcript = await self.sub_agent.transcribe_audio_openai(audio_path, audio_duration)
+        elif transcribe_spans:
+            print(f"   ├─ Transcribing {len(transcribe_spans)} speech spans with {self.transcriber} backend...")
+            full_transcript = await self.sub_agent.transcribe_audio_spans(
+                audio_path, transcribe_spans, 600, reused_transcript['reused_spans'] if reused_transcript else None
+            )
+        else:
+            if not reused_transcript:
+                print("   ├─ 🔇 No speech detected — skipping transcription")
+            full_transcript = {
+                'high_quality_transcript': '',
+                'timestamped_transcript': [],
+                'text_chunks': []
+            }
+
+        if reused_transcript and full_transcript:
+            full_transcript = self._merge_reused_transcript(full_transcript, reused_transcript)
 
         if full_transcript and 'high_quality_transcript' in full_transcript:
             transcript_text = full_transcript['high_quality_transcript']
@@ -720,16 +876,22 @@ class SimpleDirector:
                 'timestamped_transcript': []
             }
 
+        # Build the shared time-indexed transcript once (columnar words + text for range queries)
+        timed_transcript = TimedTranscript.from_transcript(full_transcript, audio_duration)
+        full_transcript['timestamped_transcript'] = timed_transcript.words
+
         # Diarization (opt-in)
         diarization = None
         if self.skip_diarization:
             print("   ├─ 🔇 Speaker diarization: skipped (use --diarize to enable)")
+        elif not self.sub_agent.transcription_backend.supports_diarization:
+            print(f"   ├─ 🔇 Speaker diarization: not supported by the '{self.transcriber}' transcriber")
         elif hasattr(self.sub_agent, 'transcribe_audio_diarized'):
             print("   ├─ 🗣️  Running speaker diarization...")
             try:
-                diarization = self.sub_agent.transcribe_audio_diarized(audio_path)
+                diarization = await self.sub_agent.transcribe_audio_diarized(audio_path)
                 if diarization and diarization.get('segments'):
-                    num_speakers = len(set(seg.get('speaker', '') for seg in diarization['segments']))
+                    num_speakers = len(set(seg.speaker for seg in diarization['segments']))
                     print(f"   ├─ ✅ Diarization: {num_speakers} distinct speakers, {len(diarization['segments'])} segments")
                 else:
                     print("   ├─ ⚠️  Diarization returned no segments")
@@ -740,6 +902,25 @@ class SimpleDirector:
         else:
             pass  # silently skip if sub-agent doesn't support it
 
+        # Unify per-chunk speaker labels and match them to enrolled voiceprints
+        speaker_map = None
+        if diarization:
+            try:
+                voiceprint_index = VoiceprintIndex(os.path.join(self.base_output_dir, VOICEPRINT_INDEX_FILENAME))
+                speaker_map = await self._run_cpu(resolve_speakers, audio_path, diarization, voiceprint_index)
+                if speaker_map:
+                    diarization['speaker_map'] = speaker_map
+                    clusters = speaker_map['clusters']
+                    named = {label: c['name'] for label, c in clusters.items() if c['name']}
+                    print(f"   ├─ 🔊 Voiceprints: {len(clusters)} unified speakers, {len(named)} matched to known voices")
+                    for label, name in named.items():
+                        print(f"   │    {label} → {name} (similarity {clusters[label]['similarity']:.2f})")
+            except Exception as e:
+                print(f"   ├─ ⚠️  Voiceprint matching failed: {e}")
+
+        # Overlap index over speaker turns, shared by frame dialogue context and transcript slicing
+        diarization_index = IntervalIndex(diarization['segments']) if diarization else None
+
         phase1_time = time.time() - phase1_start
         print(f"   └─ 🕐 Phase 1 complete: {phase1_time:.0f}s")
         print()
@@ -747,20 +928,11 @@ class SimpleDirector:
         # ── PHASE 2: SEGMENTATION ──────────────────────────────
         phase2_start = time.time()
         print("✂️  PHASE 2 — VIDEO SEGMENTATION")
-        segments = self.create_segments(video_path, video_segments_dir, segment_duration)
+        segments = await self.create_segments(video_path, segment_duration)
         total_duration = sum(s.duration for s in segments)
         print(f"   ├─ Video duration: {total_duration/60:.1f} min")
-        print(f"   ├─ Segments: {len(segments)} × {segment_duration/60:.1f} min each")
-
-        print("   ├─ Extracting segments with ffmpeg...")
-        extract_failures = 0
-        for segment in segments:
-            if not self.extract_segment(video_path, segment):
-                extract_failures += 1
+        print(f"   ├─ Segments: {len(segments)} × {segment_duration/60:.1f} min each (read in place, no segment files)")
 
-        if extract_failures:
-            print(f"   ├─ ⚠️  {extract_failures} segments failed to extract")
-        
         phase2_time = time.time() - phase2_start
         print(f"   └─ 🕐 Phase 2 complete: {phase2_time:.0f}s")
         print()
@@ -768,10 +940,24 @@ class SimpleDirector:
         # ── PHASE 3: VISUAL ANALYSIS ───────────────────────────
         phase3_start = time.time()
         print(f"👁️  PHASE 3 — VISUAL ANALYSIS ({len(segments)} segments in parallel)")
-        print(f"   ├─ Extracting frames every 4s → sending to {self.model} vision...")
-
-        tasks = [self.process_segment_with_full_transcript_async(segment, full_transcript) for segment in segments]
-        segment_results = await asyncio.gather(*tasks, return_exceptions=True)
+        print(f"   ├─ Sampling frames every 4s from the source → sending to {self.model} vision "
+              f"(max {self.vision_dispatcher.max_in_flight} batches in flight)...")
+        if self.vision_cascade is not None:
+            print(f"   ├─ Cascade: {self.vision_cascade.triage_model} triages every batch, flagged frames escalate")
+
+        # Frames matching footage already analyzed in other videos reuse those records
+        frame_index = FrameHashIndex(os.path.join(self.base_output_dir, FRAME_INDEX_FILENAME)) if self.frame_reuse else None
+        frame_reuse = FrameReuse(frame_index, video_name) if frame_index is not None else None
+
+        tasks = [
+            self.process_segment_with_full_transcript_async(segment, timed_transcript, diarization_index, frame_reuse, run_stats)
+            for segment in segments
+        ]
+        try:
+            segment_results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            if frame_index is not None:
+                frame_index.close()
 
         valid_results = []
         errors = []
@@ -786,8 +972,28 @@ class SimpleDirector:
             for err in unique_errors[:3]:
                 print(f"   ├─ ⚠️  Segment error: {err[:100]}")
 
+        # Structured frame records leave the segment results (saved as their own table)
+        segment_frames = {r['segment_id']: r.pop('frame_records', []) for r in valid_results}
+        frame_records = [record for records in segment_frames.values() for record in records]
+
         phase3_time = time.time() - phase3_start
-        print(f"   ├─ ✅ Analyzed {len(valid_results)}/{len(segments)} segments")
+        print(f"   ├─ ✅ Analyzed {len(valid_results)}/{len(segments)} segments ({len(frame_records)} frame records)")
+        failed_batches = [batch for r in valid_results for batch in r.get('failed_batches', [])]
+        deferred_batches = [batch for batch in failed_batches if batch['error_kind'] == 'deferred']
+        failed_batches = [batch for batch in failed_batches if batch['error_kind'] != 'deferred']
+        if deferred_batches:
+            return self._defer_analysis(f"{len(deferred_batches)} vision batches")
+        if failed_batches:
+            print(f"   ├─ ⚠️  {len(failed_batches)} vision batch(es) failed after retries "
+                  f"({sum(b['frames'] for b in failed_batches)} frames without analysis)")
+        if self.vision_cache is not None and run_stats.cache_hits:
+            print(f"   ├─ ♻️  Vision cache: {run_stats.cache_hits} batch(es) reused, {run_stats.cache_misses} sent")
+        if self.vision_cascade is not None and run_stats.cascade.frames:
+            print(f"   ├─ 🪜 Cascade: {run_stats.cascade.escalated_frames}/{run_stats.cascade.frames} frames "
+                  f"escalated to GPT-5.1 ({run_stats.cascade.escalation_rate:.0%})")
+        if frame_reuse is not None and frame_reuse.reused:
+            print(f"   ├─ 🧩 Frame reuse: {frame_reuse.reused}/{frame_reuse.frames} frames ({frame_reuse.reuse_ratio:.0%}) "
+                  f"from {', '.join(sorted(frame_reuse.reused_from))}")
         print(f"   └─ 🕐 Phase 3 complete: {phase3_time:.0f}s ({phase3_time/len(segments):.0f}s avg per segment)")
         print()
 
@@ -795,13 +1001,23 @@ class SimpleDirector:
         phase4_start = time.time()
         print(f"🧠 PHASE 4 — {self.model.upper()} STRUCTURED SYNTHESIS")
         print(f"   ├─ Sending {len(valid_results)} visual analyses + full transcript to {self.model}...")
-        final_synthesis = self.openai_synthesis(valid_results, full_transcript, diarization)
+        try:
+            final_synthesis = await self.openai_synthesis(
+                valid_results, full_transcript, diarization, diarization_index, segment_frames, run_stats
+            )
+        except DeferredRequest:
+            return self._defer_analysis("synthesis")
 
         # Show what we learned
         va = final_synthesis.get('video_analysis', {})
         phase4_time = time.time() - phase4_start
 
         print(f"   ├─ ✅ Synthesis complete in {phase4_time:.0f}s")
+        prompt_cache = run_stats.prompt_cache()
+        if prompt_cache:
+            print("   ├─ 🧊 Prompt cache: " + ", ".join(
+                f"{kind} {entry['hit_rate']:.0%} of {entry['prompt_tokens']:,} tokens" for kind, entry in prompt_cache.items()
+            ))
         print(f"   │")
         print(f"   ├─ 📋 TITLE: {va.get('title', 'Unknown')}")
         print(f"   ├─ 🏷️  TYPE: {va.get('content_type', 'Unknown')}")
@@ -853,19 +1069,53 @@ class SimpleDirector:
             'processed_at': time.strftime('%Y-%m-%d %H:%M:%S'),
             'ai_provider': f'OpenAI ({self.model})',
             'diarization_available': diarization is not None,
+            'voiceprint_matches': {label: c['name'] for label, c in speaker_map['clusters'].items() if c['name']} if speaker_map else {},
+            'audio_labels': audio_labels.summary() if audio_labels else None,
+            'transcriber': self.transcriber,
+            'transcript_reuse': reused_transcript['matches'] if reused_transcript else [],
+            'vision_max_in_flight': self.vision_dispatcher.max_in_flight,
+            'api_concurrency': dict(get_controller().snapshot(), prompt_cache=run_stats.prompt_cache()),
+            'rate_budget_wait_seconds': round(get_rate_budget().waited_seconds, 1),
+            'vision_cache': dict(self.vision_cache.stats(), **run_stats.cache_stats()) if self.vision_cache is not None else None,
+            'vision_cascade': run_stats.cascade.stats() if self.vision_cascade is not None else None,
+            'frame_reuse': frame_reuse.stats() if frame_reuse is not None else None,
+            'failed_vision_batches': len(failed_batches),
             'characters_loaded': len(self.characters.get('characters', []))
         }
 
-        # Save full transcript separately
+        # Save full transcript text + word-level timestamps (.npz, reloaded by clip extraction)
         transcript_path = f"{video_output_dir}/analysis/full_transcript.txt"
-        with open(transcript_path, 'w') as f:
-            f.write(full_transcript.get('high_quality_transcript', ''))
+        timed_transcript.save(f"{video_output_dir}/analysis")
+
+        # Index this video's audio so later duplicates can reuse its transcript
+        if audio_fingerprint is not None:
+            fingerprint_index = AudioFingerprintIndex(os.path.join(self.base_output_dir, FINGERPRINT_INDEX_FILENAME))
+            try:
+                fingerprint_index.add_source(video_name, audio_fingerprint)
+            finally:
+                fingerprint_index.close()
+
+        # Per-frame vision records (read by extract_clips.py)
+        save_frame_records(frame_records, f"{video_output_dir}/analysis")
+
+        # Index this video's frames so footage re-used by later videos skips vision
+        if frame_reuse is not None and frame_records:
+            frame_index = FrameHashIndex(os.path.join(self.base_output_dir, FRAME_INDEX_FILENAME))
+            try:
+                frame_index.add_source(video_name, frame_reuse.hashes, frame_records)
+            finally:
+                frame_index.close()
 
         # Save diarization if available
         if diarization:
             diarization_path = f"{video_output_dir}/analysis/diarization.json"
             with open(diarization_path, 'w') as f:
-                json.dump(diarization, f, indent=2, default=str)
+                json.dump(dict(diarization, segments=[seg.to_dict() for seg in diarization['segments']]),
+                          f, indent=2, default=str)
+
+        # Save the speaker map so confirmed speakers can be enrolled (scripts/voiceprints.py enroll)
+        if speaker_map:
+            save_speaker_map(speaker_map, f"{video_output_dir}/analysis")
 
         analysis_json_path = f"{video_output_dir}/analysis/simple_director_analysis.json"
         analysis_md_path = f"{video_output_dir}/analysis/simple_director_analysis.md"
@@ -886,11 +1136,6 @@ class SimpleDirector:
         with open(analysis_md_path, 'w') as f:
             f.write(markdown_report)
 
-        # Cleanup segments
-        for segment in segments:
-            if os.path.exists(segment.file_path):
-                os.remove(segment.file_path)
-
         total_time = time.time() - start_time
         speed = (total_duration / total_time) if total_time > 0 else 0
 
@@ -909,13 +1154,11 @@ class SimpleDirector:
 
         return final_synthesis
 
-    def cleanup_segments(self):
-        """Clean up segment files"""
-        if os.path.exists(self.base_segments_dir):
-            for file in os.listdir(self.base_segments_dir):
-                file_path = os.path.join(self.base_segments_dir, file)
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
+    def _defer_analysis(self, waiting_for: str) -> dict:
+        """Stop an offline-batch pass: requests were queued for the Batch API, nothing is saved yet"""
+        print(f"   └─ 📨 Offline batch mode: {waiting_for} queued — run again once the batch is answered")
+        print()
+        return {'deferred': True, 'waiting_for': waiting_for}
 
 
 async def main():
@@ -0,0 +1,94 @@
+"""
+Timed Transcript - Shared Time-Indexed Transcript
+The full transcript text plus its word timeline, built once after Phase 1.
+
+Part of the Pete Dye Story video processing system.
+
+Answers "what was said between t0 and t1" with a binary search over the
+WordStore. When a range has no timed words (e.g. word timestamps failed),
+it falls back to slicing the high-quality text at the average character
+rate over the real audio duration.
+
+Shared by:
+  - SimpleDirector segment excerpts (Phase 3 / synthesis prompt)
+  - Vision prompt building (per-frame audio lines)
+  - Clip extraction / highlight scoring (loaded back from the analysis folder)
+"""
+
+import os
+
+import numpy as np
+
+from word_store import WordStore, WORDS_FILENAME
+
+
+TRANSCRIPT_FILENAME = "full_transcript.txt"
+
+
+class TimedTranscript:
+    """High-quality transcript text with a columnar word timeline"""
+
+    def __init__(self, text: str = '', words=None, duration: float = 0.0):
+        self.text = text or ''
+        self.words = WordStore.from_words(words if words is not None else [])
+        if not duration and len(self.words):
+            duration = float(self.words.ends.max())
+        self.duration = float(duration or 0.0)
+
+    @classmethod
+    def from_transcript(cls, full_transcript: dict, duration: float = 0.0) -> 'TimedTranscript':
+        """Build from the transcriber's {'high_quality_transcript', 'timestamped_transcript'} dict"""
+        full_transcript = full_transcript or {}
+        return cls(
+            full_transcript.get('high_quality_transcript', ''),
+            full_transcript.get('timestamped_transcript', []),
+            duration
+        )
+
+    @classmethod
+    def load(cls, analysis_dir: str, duration: float = 0.0) -> 'TimedTranscript':
+        """Load full_transcript.txt and the word .npz saved by SimpleDirector (either may be missing)"""
+        text = ''
+        text_path = os.path.join(analysis_dir, TRANSCRIPT_FILENAME)
+        if os.path.exists(text_path):
+            with open(text_path, 'r') as f:
+                text = f.read()
+
+        words_path = os.path.join(analysis_dir, WORDS_FILENAME)
+        words = WordStore.load(words_path) if os.path.exists(words_path) else []
+        return cls(text, words, duration)
+
+    def save(self, analysis_dir: str):
+        with open(os.path.join(analysis_dir, TRANSCRIPT_FILENAME), 'w') as f:
+            f.write(self.text)
+        self.words.save(os.path.join(analysis_dir, WORDS_FILENAME))
+
+    def __len__(self) -> int:
+        """Number of timed words"""
+        return len(self.words)
+
+    def word_starts(self) -> np.ndarray:
+        return self.words.starts.astype(np.float64)
+
+    def text_between(self, start_time: float, end_time: float, inclusive: bool = False, fallback: bool = True) -> str:
+        """
+        Words spoken in [start_time, end_time].
+
+        With no timed words in range, estimate the span of the high-quality
+        text from the average characters per second (unless fallback=False).
+        """
+        indices = self.words.overlapping(start_time, end_time, inclusive)
+        if len(indices):
+            return ' '.join(self.words.texts(indices))
+        if not fallback:
+            return ''
+        return self.estimate_text(start_time, end_time)
+
+    def estimate_text(self, start_time: float, end_time: float) -> str:
+        """Character-rate slice of the high-quality text"""
+        if self.duration <= 0 or not self.text:
+            return ''
+        chars_per_second = len(self.text) / self.duration
+        start_char = int(max(0.0, start_time) * chars_per_second)
+        end_char = int(end_time * chars_per_second)
+        return self.text[start_char:end_char]
@@ -0,0 +1,235 @@
+"""
+Transcription Backends
+Pluggable speech-to-text engines used by FastMultimodalVideoTranscriber.
+
+Part of the Pete Dye Story video processing system.
+
+Backends:
+  - openai: gpt-4o-transcribe (text) + whisper-1 (word timestamps)
+            + gpt-4o-transcribe-diarize (speaker labels)
+  - local:  faster-whisper on CPU (offline, no rate limits, no diarization)
+  - auto:   OpenAI first; while the API is rate-limited, overflow to the
+            local engine instead of sleeping
+
+Backend methods are coroutines: the OpenAI backend awaits AsyncOpenAI
+through acall_openai, the local engine runs its (CPU-bound) model on a
+worker thread. Every backend converts SDK output once into records (see
+records.py):
+  await transcribe()          -> (text, [Word, ...])
+  await transcribe_diarized() -> {'text': str, 'segments': [SpeakerTurn, ...]}
+"""
+
+import asyncio
+import importlib.util
+import threading
+import time
+from typing import List, Tuple
+
+from openai_gateway import (
+    acall_openai, classify_error, get_async_client, get_controller, is_rate_limit_error, MAX_ATTEMPTS, RETRYABLE_ERRORS
+)
+from records import Word, words_from_sdk, turns_from_sdk
+
+
+BACKEND_CHOICES = ('openai', 'local', 'auto')
+
+
+class TranscriptionBackend:
+    """Interface for speech-to-text engines"""
+
+    name = "base"
+    supports_diarization = False
+
+    async def transcribe(self, audio_path: str, prompt: str = "", word_prompt: str = "") -> Tuple[str, List[Word]]:
+        """Return (transcript text, Word records with start/end in seconds relative to the file)"""
+        raise NotImplementedError
+
+    async def transcribe_diarized(self, audio_path: str) -> dict:
+        """Return {'text', 'segments'} with SpeakerTurn records"""
+        raise NotImplementedError(f"{self.name} backend does not support diarization")
+
+
+class OpenAITranscriptionBackend(TranscriptionBackend):
+    """gpt-4o-transcribe for text, whisper-1 for word timestamps, gpt-4o-transcribe-diarize for speakers"""
+
+    name = "openai"
+    supports_diarization = True
+
+    def __init__(self, openai_api_key: str = None, max_attempts: int = MAX_ATTEMPTS):
+        # The AsyncOpenAI client is looked up per call: pooled connections belong to one event loop
+        self.openai_api_key = openai_api_key
+        # Attempts per transcribe() request; 1 when an overflow backend takes over instead of retrying
+        self.max_attempts = max_attempts
+
+    async def transcribe(self, audio_path, prompt="", word_prompt=""):
+        transcriptions = get_async_client(self.openai_api_key).audio.transcriptions
+        with open(audio_path, "rb") as audio_file:
+            high_quality_response = await acall_openai(
+                'transcription', transcriptions, max_attempts=self.max_attempts,
+                model="gpt-4o-transcribe",
+                file=audio_file,
+                response_format="text",
+                prompt=prompt
+            )
+
+            audio_file.seek(0)
+
+            timestamped_response = await acall_openai(
+                'transcription', transcriptions, max_attempts=self.max_attempts,
+                model="whisper-1",
+                file=audio_file,
+                response_format="verbose_json",
+                timestamp_granularities=["word"],
+                prompt=word_prompt or prompt
+            )
+
+        text = high_quality_response.text if hasattr(high_quality_response, 'text') else str(high_quality_response)
+        return text, words_from_sdk(getattr(timestamped_response, 'words', None))
+
+    async def transcribe_diarized(self, audio_path):
+        with open(audio_path, "rb") as audio_file:
+            response = await acall_openai(
+                'transcription', get_async_client(self.openai_api_key).audio.transcriptions,
+                model="gpt-4o-transcribe-diarize",
+                file=audio_file,
+                response_format="diarized_json",
+                chunking_strategy="auto"
+            )
+
+        # Parse the response
+        if hasattr(response, 'text'):
+            text = response.text
+        elif isinstance(response, dict) and 'text' in response:
+            text = response['text']
+        else:
+            text = str(response) if response else ""
+
+        raw_segments = None
+        if hasattr(response, 'segments'):
+            raw_segments = response.segments
+        elif isinstance(response, dict) and 'segments' in response:
+            raw_segments = response['segments']
+
+        return {"text": text, "segments": turns_from_sdk(raw_segments)}
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    Offline CPU transcription with faster-whisper (CTranslate2 Whisper).
+
+    One pass produces both the text and word timestamps. The model is loaded
+    lazily on first use and runs on a worker thread, one file at a time.
+    """
+
+    name = "local"
+
+    def __init__(self, model_size: str = "small", compute_type: str = "int8", cpu_threads: int = 0):
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self._model = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_available() -> bool:
+        return importlib.util.find_spec("faster_whisper") is not None
+
+    def _get_model(self):
+        if self._model is None:
+            from faster_whisper import WhisperModel
+            print(f"Loading local Whisper model '{self.model_size}' ({self.compute_type}, CPU)...")
+            self._model = WhisperModel(
+                self.model_size,
+                device="cpu",
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads
+            )
+        return self._model
+
+    async def transcribe(self, audio_path, prompt="", word_prompt=""):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._transcribe_blocking, audio_path, prompt)
+
+    def _transcribe_blocking(self, audio_path, prompt=""):
+        with self._lock:
+            model = self._get_model()
+            segments, _info = model.transcribe(
+                audio_path,
+                initial_prompt=prompt or None,
+                word_timestamps=True,
+                vad_filter=True
+            )
+
+            text_parts = []
+            words = []
+            for segment in segments:
+                text_parts.append(segment.text.strip())
+                for word in segment.words or []:
+                    words.append(Word(word.word.strip(), float(word.start), float(word.end)))
+
+        return ' '.join(text_parts), words
+
+
+class OverflowTranscriptionBackend(TranscriptionBackend):
+    """
+    Use the primary backend, overflowing to a secondary one while the primary
+    is rate-limited. After `cooldown` seconds the primary is tried again.
+
+    The primary should not retry on its own (create_transcription_backend builds
+    it with max_attempts=1): a throttled request goes to the overflow engine at
+    once, and while the gateway is pausing for a rate-limit reset the primary is
+    not tried at all.
+    """
+
+    name = "auto"
+
+    def __init__(self, primary: TranscriptionBackend, overflow: TranscriptionBackend, cooldown: float = 120.0):
+        self.primary = primary
+        self.overflow = overflow
+        self.cooldown = cooldown
+        self.supports_diarization = primary.supports_diarization
+        self._limited_until = 0.0
+        self.overflow_count = 0
+
+    async def transcribe(self, audio_path, prompt="", word_prompt=""):
+        if time.time() >= self._limited_until and get_controller().pause_remaining() <= 0:
+            try:
+                return await self.primary.transcribe(audio_path, prompt, word_prompt)
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    self._limited_until = time.time() + self.cooldown
+                    print(f"  {self.primary.name} rate-limited — overflowing to {self.overflow.name} for {self.cooldown:.0f}s")
+                elif classify_error(e) in RETRYABLE_ERRORS:
+                    # Not retried by the primary: this request goes to the overflow engine instead
+                    print(f"  {self.primary.name} {classify_error(e)} error — transcribing with {self.overflow.name}")
+                else:
+                    raise
+
+        self.overflow_count += 1
+        return await self.overflow.transcribe(audio_path, prompt, word_prompt)
+
+    async def transcribe_diarized(self, audio_path):
+        # Only the API backend can diarize; there is nothing to overflow to
+        return await self.primary.transcribe_diarized(audio_path)
+
+
+def create_transcription_backend(name: str, openai_api_key: str = None, local_model: str = "small") -> TranscriptionBackend:
+    """Build a backend by CLI name: 'openai', 'local' or 'auto'"""
+    if name == "openai":
+        return OpenAITranscriptionBackend(openai_api_key)
+
+    if name == "local":
+        if not LocalWhisperBackend.is_available():
+            raise Exception("Local transcription requires faster-whisper: pip install faster-whisper")
+        return LocalWhisperBackend(model_size=local_model)
+
+    if name == "auto":
+        if not LocalWhisperBackend.is_available():
+            print("faster-whisper not installed — 'auto' transcription will use OpenAI only")
+            return OpenAITranscriptionBackend(openai_api_key)
+        # One attempt per request: on a 429 the local engine takes over instead of sleeping through backoff
+        return OverflowTranscriptionBackend(
+            OpenAITranscriptionBackend(openai_api_key, max_attempts=1), LocalWhisperBackend(model_size=local_model)
+        )
+
+    raise ValueError(f"Unknown transcription backend: {name} (choose from {', '.join(BACKEND_CHOICES)})")
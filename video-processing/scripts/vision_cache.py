@@ -0,0 +1,139 @@
+"""
+Vision Cache - Content-Addressed Store for Vision Batch Responses
+Re-running a video only pays for the vision requests that actually changed.
+
+Part of the Pete Dye Story video processing system.
+
+A --reprocess run, a retry after a failed synthesis, or a second pass with
+different settings re-sends the same frames with the same prompt. Each
+response is stored under a key built from:
+
+  - the SHA-256 of every image in the request
+  - the exact prompt text parts, in order
+  - the model and generation parameters (temperature, max tokens, ...)
+
+Entries are small JSON files in output/vision_cache/. The directory is
+bounded (DEFAULT_MAX_BYTES); when it grows past the bound the least recently
+used entries (oldest modification time - hits touch the file) are evicted.
+
+Usage:
+    cache = VisionCache(os.path.join(output_dir, VISION_CACHE_DIRNAME))
+    key = cache.key(request_kwargs)
+    content = cache.get(key)
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+
+VISION_CACHE_DIRNAME = "vision_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _image_digest(url: str) -> str:
+    """SHA-256 of the image bytes behind a data URL (or of the URL itself)"""
+    if url.startswith('data:') and ',' in url:
+        data = base64.b64decode(url.split(',', 1)[1])
+    else:
+        data = url.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class VisionCache:
+    """Size-bounded on-disk LRU of vision responses keyed by request content"""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self):
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    @staticmethod
+    def key(request: dict) -> str:
+        """Cache key for chat.completions kwargs: image hashes + prompt text + model + parameters"""
+        parts = []
+        for message in request.get('messages', []):
+            content = message.get('content')
+            if isinstance(content, str):
+                content = [{'type': 'text', 'text': content}]
+            for part in content:
+                if part.get('type') == 'image_url':
+                    image = part['image_url']
+                    parts.append(['image', _image_digest(image['url']), image.get('detail', 'auto')])
+                else:
+                    parts.append(['text', part.get('text', '')])
+            parts.append(['role', message.get('role', '')])
+
+        params = {name: value for name, value in request.items() if name != 'messages'}
+        canonical = json.dumps({'params': params, 'parts': parts}, sort_keys=True)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                content = json.load(f)['content']
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return content
+
+    def put(self, key: str, content: str, model: str = None):
+        path = self._path(key)
+        data = json.dumps({'content': content, 'model': model, 'created': time.time()})
+        # Write then rename so concurrent readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+        try:
+            replaced_bytes = os.path.getsize(path)  # Overwriting an entry must not count it twice
+        except OSError:
+            replaced_bytes = 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total_bytes += len(data) - replaced_bytes
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is back under 90% of its bound"""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if total <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'bytes': self._total_bytes}
@@ -0,0 +1,130 @@
+"""
+Vision Cascade - Cheap Triage Before GPT-5.1 Frame Analysis
+A fast, inexpensive model looks at every vision batch first.
+
+Part of the Pete Dye Story video processing system.
+
+Most construction footage only needs "bulldozer moving dirt, no identifiable
+people". Each batch is first sent to TRIAGE_MODEL, which returns the normal
+frame record plus two flags per frame:
+
+  has_text   legible signs, captions, scoreboards, documents
+  uncertain  the model cannot tell what is happening or who is there
+
+A frame is escalated to GPT-5.1 when it shows people, has text, is
+uncertain, is a ceremony/award/interview, or the triage response left it
+out. Only escalated frames are re-sent (same prompt, fewer images); the rest
+keep their triage record. The escalation rate is saved per video as
+`vision_cascade` in the analysis metadata.
+
+Usage:
+    cascade = VisionCascade()
+    triaged = parse_triage(content, batch_data, time_offset)   # {seconds: (record, escalate)}
+    cascade.record(frames=len(batch_data), escalated=n)
+"""
+
+import copy
+import threading
+from typing import Dict, List, Tuple
+
+from frame_records import FRAME_RECORDS_SCHEMA, FrameRecord, match_frames, record_from_frame
+
+
+TRIAGE_MODEL = "gpt-4.1-mini"
+
+# Event types always worth the stronger model's reading of people and context
+ESCALATE_EVENT_TYPES = {'ceremony', 'award', 'interview'}
+
+# Frame records plus the triage flags
+TRIAGE_SCHEMA = copy.deepcopy(FRAME_RECORDS_SCHEMA)
+_triage_item = TRIAGE_SCHEMA['properties']['frames']['items']
+_triage_item['properties']['has_text'] = {
+    "type": "boolean", "description": "Legible text is visible (signs, captions, scoreboards, documents)"
+}
+_triage_item['properties']['uncertain'] = {
+    "type": "boolean", "description": "You cannot tell with confidence what is happening or who is present"
+}
+_triage_item['required'] = _triage_item['required'] + ['has_text', 'uncertain']
+
+TRIAGE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "frame_triage",
+        "strict": True,
+        "schema": TRIAGE_SCHEMA
+    }
+}
+
+TRIAGE_INSTRUCTIONS = {
+    "type": "text",
+    "text": """Keep each record brief (one short scene sentence). Also flag every frame:
+- has_text: legible text is visible (signs, captions, scoreboards, documents)
+- uncertain: you cannot tell with confidence what is happening or who is present
+List people whenever anyone is visible, even at a distance."""
+}
+
+
+def should_escalate(record: FrameRecord, frame: dict) -> bool:
+    """Send this frame on to the stronger model?"""
+    return bool(
+        record.people
+        or frame.get('has_text')
+        or frame.get('uncertain')
+        or record.event_type in ESCALATE_EVENT_TYPES
+    )
+
+
+def parse_triage(content: str, batch_data: List[dict], time_offset: float = 0.0) -> Dict[float, Tuple[FrameRecord, bool]]:
+    """
+    Triage response as {seconds within the batch's file: (FrameRecord, escalate)}.
+    Frames missing from the result must be escalated by the caller.
+    Raises ValueError on invalid JSON.
+    """
+    triaged = {}
+    for seconds, frame in match_frames(content, batch_data):
+        record = record_from_frame(time_offset + seconds, frame)
+        triaged[seconds] = (record, should_escalate(record, frame))
+    return triaged
+
+
+class VisionCascade:
+    """Triage model choice and escalation counters shared by all vision batches"""
+
+    def __init__(self, triage_model: str = TRIAGE_MODEL):
+        self.triage_model = triage_model
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.batches = 0
+            self.frames = 0
+            self.escalated_frames = 0
+            self.escalated_batches = 0
+            self.triage_failures = 0
+
+    def record(self, frames: int, escalated: int, triage_failed: bool = False):
+        with self._lock:
+            self.batches += 1
+            self.frames += frames
+            self.escalated_frames += escalated
+            if escalated:
+                self.escalated_batches += 1
+            if triage_failed:
+                self.triage_failures += 1
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalated_frames / self.frames if self.frames else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'triage_model': self.triage_model,
+                'batches': self.batches,
+                'frames': self.frames,
+                'escalated_frames': self.escalated_frames,
+                'escalated_batches': self.escalated_batches,
+                'triage_failures': self.triage_failures,
+                'escalation_rate': round(self.escalation_rate, 3)
+            }
@@ -0,0 +1,81 @@
+"""
+Vision Dispatcher - Pipeline-Wide Concurrency for Vision Batches
+One shared cap that every frame batch of every segment runs under.
+
+Part of the Pete Dye Story video processing system.
+
+SimpleDirector runs segments in parallel; each segment splits its frames
+into batches. Previously the batches of a segment ran one after another
+(so a 30-batch segment set the total wall time) while the number of
+segments in flight was unbounded. Now each segment fans its batches out to
+this dispatcher, which caps the number of vision requests in flight across
+the whole event loop (every video analyzed in it) and returns each
+segment's results in batch order.
+
+Batches are coroutines (AsyncOpenAI requests), so waiting batches hold no
+threads.
+
+Usage:
+    dispatcher = get_vision_dispatcher()
+    results = await dispatcher.run_ordered(send_batch, [(batch, 1, text), (batch, 2, text)])
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Awaitable, Callable, Iterable, List
+
+
+DEFAULT_MAX_IN_FLIGHT = 8
+
+
+class VisionDispatcher:
+    """Semaphore-bounded runner shared by all vision batch requests"""
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        self.max_in_flight = max(1, int(max_in_flight))
+        self._semaphores = weakref.WeakKeyDictionary()   # event loop -> Semaphore
+        self.submitted = 0
+        self.completed = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+        return semaphore
+
+    async def run(self, fn: Callable[..., Awaitable], *args):
+        """Await fn(*args) once a slot is free"""
+        self.submitted += 1
+        async with self._semaphore():
+            try:
+                return await fn(*args)
+            finally:
+                self.completed += 1
+
+    async def run_ordered(self, fn: Callable[..., Awaitable], arg_tuples: Iterable[tuple]) -> List:
+        """Start fn(*args) for every tuple at once and wait for all, results in input order"""
+        return await asyncio.gather(*(self.run(fn, *args) for args in arg_tuples))
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_vision_dispatcher() -> VisionDispatcher:
+    """The process-wide dispatcher (created with the default cap on first use)"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = VisionDispatcher(DEFAULT_MAX_IN_FLIGHT)
+        return _dispatcher
+
+
+def configure_vision_dispatcher(max_in_flight: int) -> VisionDispatcher:
+    """Set the pipeline-wide cap on vision requests in flight (replaces an idle dispatcher)"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None or _dispatcher.max_in_flight != max_in_flight:
+            _dispatcher = VisionDispatcher(max_in_flight)
+        return _dispatcher
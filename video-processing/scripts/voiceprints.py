@@ -0,0 +1,290 @@
+"""
+Voiceprints - Local Speaker Fingerprinting
+Maps per-chunk diarization labels ("A", "B") to consistent speakers and,
+where possible, to known characters - no API calls.
+
+Part of the Pete Dye Story video processing system.
+
+How it works:
+  1. Each diarized speaker turn is fingerprinted with MFCC statistics
+     (mean + standard deviation of 19 cepstral coefficients, NumPy only)
+  2. Turns are pooled per (10-minute chunk, diarization label), then the
+     pools are clustered across chunks so "A" in chunk 1 and "B" in chunk 3
+     become the same speaker (S1, S2, ...)
+  3. Each cluster is matched against the archive-wide voiceprint index
+     (output/voiceprints.json), which is seeded from confirmed attributions
+
+Usage (seed the index once a speaker has been confirmed by a human):
+    python scripts/voiceprints.py list
+    python scripts/voiceprints.py enroll output/<video_name> S1 "Pete Dye"
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_classifier import decode_audio_pcm
+
+
+SAMPLE_RATE = 16000
+N_MELS = 40
+N_MFCC = 20
+FRAME_LENGTH = 400          # 25ms
+FRAME_HOP = 160             # 10ms
+N_FFT = 512
+
+MIN_TURN_SECONDS = 1.0      # Shorter turns give unreliable fingerprints
+CHUNK_SECONDS = 600         # Diarization runs per 10-minute chunk
+CLUSTER_THRESHOLD = 0.90    # Cosine similarity to merge two speaker pools
+MATCH_THRESHOLD = 0.93      # Cosine similarity to accept a voiceprint match
+
+INDEX_FILENAME = "voiceprints.json"
+SPEAKER_MAP_FILENAME = "speaker_map.json"
+
+
+# ---------------------------------------------------------------------------
+# MFCC embedding
+# ---------------------------------------------------------------------------
+
+def _mel_filterbank(sample_rate: int = SAMPLE_RATE, n_fft: int = N_FFT, n_mels: int = N_MELS) -> np.ndarray:
+    """Triangular mel filters, shape (n_mels, n_fft // 2 + 1)"""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(60.0), hz_to_mel(sample_rate / 2), n_mels + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mel_points) / sample_rate).astype(int)
+
+    filters = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            filters[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            filters[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return filters
+
+
+_MEL_FILTERS = _mel_filterbank()
+_DCT = np.cos(np.pi / N_MELS * (np.arange(N_MELS)[None, :] + 0.5) * np.arange(N_MFCC)[:, None]).astype(np.float32)
+
+
+def mfcc(samples: np.ndarray) -> np.ndarray:
+    """MFCC matrix (frames, N_MFCC) for float32 mono samples at SAMPLE_RATE"""
+    if len(samples) < FRAME_LENGTH:
+        return np.zeros((0, N_MFCC), dtype=np.float32)
+
+    emphasized = np.append(samples[0], samples[1:] - 0.97 * samples[:-1])
+    num_frames = 1 + (len(emphasized) - FRAME_LENGTH) // FRAME_HOP
+    idx = np.arange(FRAME_LENGTH)[None, :] + FRAME_HOP * np.arange(num_frames)[:, None]
+    frames = emphasized[idx] * np.hamming(FRAME_LENGTH).astype(np.float32)
+
+    power = np.abs(np.fft.rfft(frames, n=N_FFT, axis=1)) ** 2 / N_FFT
+    log_mel = np.log(power @ _MEL_FILTERS.T + 1e-10)
+    return log_mel @ _DCT.T
+
+
+def embed_samples(samples: np.ndarray) -> Optional[np.ndarray]:
+    """L2-normalized voiceprint: mean and std of MFCC 1..19 (c0 loudness dropped)"""
+    coeffs = mfcc(samples)[:, 1:]
+    if len(coeffs) < 10:
+        return None
+    embedding = np.concatenate([coeffs.mean(axis=0), coeffs.std(axis=0)])
+    norm = np.linalg.norm(embedding)
+    return (embedding / norm).astype(np.float32) if norm > 0 else None
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    denom = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(np.dot(a, b) / denom) if denom > 0 else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Archive-wide voiceprint index
+# ---------------------------------------------------------------------------
+
+class VoiceprintIndex:
+    """Named voiceprints confirmed by a human, stored as JSON"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.voices: List[dict] = []
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.voices = json.load(f).get('voices', [])
+
+    def match(self, embedding: np.ndarray, threshold: float = MATCH_THRESHOLD) -> Tuple[Optional[str], float]:
+        """Best matching name and its similarity, or (None, best_similarity)"""
+        best_name, best_sim = None, 0.0
+        for voice in self.voices:
+            sim = _cosine(embedding, np.asarray(voice['embedding'], dtype=np.float32))
+            if sim > best_sim:
+                best_name, best_sim = voice['name'], sim
+        if best_sim >= threshold:
+            return best_name, best_sim
+        return None, best_sim
+
+    def enroll(self, name: str, embedding: np.ndarray, seconds: float, source: str):
+        """Add a confirmed voice, averaging with any existing print for that name"""
+        for voice in self.voices:
+            if voice['name'] == name:
+                total = voice['seconds'] + seconds
+                merged = (np.asarray(voice['embedding']) * voice['seconds'] + embedding * seconds) / total
+                voice['embedding'] = [round(float(v), 5) for v in merged / np.linalg.norm(merged)]
+                voice['seconds'] = total
+                if source not in voice['sources']:
+                    voice['sources'].append(source)
+                return
+
+        self.voices.append({
+            'name': name,
+            'embedding': [round(float(v), 5) for v in embedding],
+            'seconds': seconds,
+            'sources': [source]
+        })
+
+    def save(self):
+        with open(self.path, 'w') as f:
+            json.dump({'voices': self.voices}, f, indent=2)
+
+
+# ---------------------------------------------------------------------------
+# Resolving diarization labels
+# ---------------------------------------------------------------------------
+
+def _cluster_pools(pools: List[dict], threshold: float = CLUSTER_THRESHOLD) -> List[List[int]]:
+    """Greedy centroid clustering of speaker pools, longest pools first"""
+    order = sorted(range(len(pools)), key=lambda i: pools[i]['seconds'], reverse=True)
+    clusters: List[List[int]] = []
+    centroids: List[np.ndarray] = []
+
+    for i in order:
+        embedding = pools[i]['embedding']
+        sims = [_cosine(embedding, c) for c in centroids]
+        best = int(np.argmax(sims)) if sims else -1
+        if best >= 0 and sims[best] >= threshold:
+            clusters[best].append(i)
+            weights = np.array([pools[j]['seconds'] for j in clusters[best]])
+            stacked = np.stack([pools[j]['embedding'] for j in clusters[best]])
+            centroids[best] = (stacked * weights[:, None]).sum(axis=0) / weights.sum()
+        else:
+            clusters.append([i])
+            centroids.append(embedding)
+
+    return clusters
+
+
+def resolve_speakers(audio_path: str, diarization: dict, index: VoiceprintIndex) -> Optional[dict]:
+    """
+    Fingerprint every diarized turn, unify labels across chunks and match
+    clusters to known voices.
+
+    Rewrites the SpeakerTurn records in diarization['segments'] in place:
+    .speaker becomes the unified label (S1, S2, ...), the diarizer's label is
+    kept as .original_speaker and matched turns get .voice (character name).
+    Returns the speaker map.
+    """
+    segments = diarization.get('segments') or []
+    if not segments:
+        return None
+
+    samples = decode_audio_pcm(audio_path, SAMPLE_RATE).astype(np.float32) / 32768.0
+
+    # Pool turn audio per (chunk, label): the diarizer is consistent within a chunk
+    pool_audio: Dict[Tuple[int, str], List[np.ndarray]] = {}
+    for seg in segments:
+        if seg.end - seg.start < MIN_TURN_SECONDS:
+            continue
+        key = (int(seg.start // CHUNK_SECONDS), seg.speaker)
+        pool_audio.setdefault(key, []).append(samples[int(seg.start * SAMPLE_RATE):int(seg.end * SAMPLE_RATE)])
+
+    pools = []
+    for key, parts in pool_audio.items():
+        embedding = embed_samples(np.concatenate(parts))
+        if embedding is not None:
+            pools.append({'key': key, 'embedding': embedding, 'seconds': sum(len(p) for p in parts) / SAMPLE_RATE})
+
+    clusters = {}
+    label_for_key = {}
+    for n, members in enumerate(_cluster_pools(pools), 1):
+        label = f"S{n}"
+        seconds = sum(pools[i]['seconds'] for i in members)
+        weights = np.array([pools[i]['seconds'] for i in members])
+        centroid = (np.stack([pools[i]['embedding'] for i in members]) * weights[:, None]).sum(axis=0) / weights.sum()
+        centroid = centroid / np.linalg.norm(centroid)
+        name, similarity = index.match(centroid)
+
+        clusters[label] = {
+            'name': name,
+            'similarity': round(similarity, 3),
+            'seconds': round(seconds, 1),
+            'diarization_labels': [f"chunk{pools[i]['key'][0]}:{pools[i]['key'][1]}" for i in members],
+            'embedding': [round(float(v), 5) for v in centroid]
+        }
+        for i in members:
+            label_for_key[pools[i]['key']] = label
+
+    # Relabel every turn, including short ones, via their (chunk, label) pool
+    for seg in segments:
+        key = (int(seg.start // CHUNK_SECONDS), seg.speaker)
+        seg.original_speaker = seg.speaker
+        label = label_for_key.get(key)
+        if label:
+            seg.speaker = label
+            seg.voice = clusters[label]['name']
+
+    return {'clusters': clusters}
+
+
+def save_speaker_map(speaker_map: dict, analysis_dir: str):
+    with open(os.path.join(analysis_dir, SPEAKER_MAP_FILENAME), 'w') as f:
+        json.dump(speaker_map, f, indent=2)
+
+
+def main():
+    default_output = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+
+    parser = argparse.ArgumentParser(description='Pete Dye Story - Voiceprint Index')
+    parser.add_argument('--index', default=os.path.join(default_output, INDEX_FILENAME),
+                        help='Voiceprint index path (default: output/voiceprints.json)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='List enrolled voices')
+
+    enroll = subparsers.add_parser('enroll', help='Enroll a confirmed speaker cluster from a processed video')
+    enroll.add_argument('video_output_dir', help='Path to output/<video_name>')
+    enroll.add_argument('speaker', help='Unified speaker label from speaker_map.json (e.g. S1)')
+    enroll.add_argument('name', help='Character name as in characters.json')
+
+    args = parser.parse_args()
+    index = VoiceprintIndex(args.index)
+
+    if args.command == 'list':
+        for voice in index.voices:
+            print(f"{voice['name']}: {voice['seconds'] / 60:.1f} min from {len(voice['sources'])} videos")
+        if not index.voices:
+            print("No voices enrolled yet")
+        return
+
+    map_path = os.path.join(args.video_output_dir, 'analysis', SPEAKER_MAP_FILENAME)
+    with open(map_path, 'r') as f:
+        clusters = json.load(f).get('clusters', {})
+
+    if args.speaker not in clusters:
+        print(f"Speaker {args.speaker} not found in {map_path} (available: {', '.join(clusters)})")
+        return
+
+    cluster = clusters[args.speaker]
+    index.enroll(args.name, np.asarray(cluster['embedding'], dtype=np.float32), cluster['seconds'],
+                 os.path.basename(os.path.normpath(args.video_output_dir)))
+    index.save()
+    print(f"Enrolled {args.speaker} as {args.name} ({cluster['seconds'] / 60:.1f} min of speech)")
+
+
+if __name__ == "__main__":
+    main()
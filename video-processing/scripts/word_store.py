@@ -0,0 +1,105 @@
+"""
+Word Store - Columnar Word-Timestamp Transcript
+Compact, vectorized representation of word-level timestamps.
+
+Part of the Pete Dye Story video processing system.
+
+Word records (records.Word) from the transcription backends are converted
+once into parallel NumPy arrays:
+  - starts / ends: float32 seconds, sorted by start time
+  - tokens: int32 index into an interned word table (vocab)
+
+Time-range lookups are binary searches plus a vectorized slice, and the
+store saves/loads as a compressed .npz next to full_transcript.txt.
+"""
+
+from typing import Iterator, List
+
+import numpy as np
+
+from records import Word
+
+
+WORDS_FILENAME = "full_transcript_words.npz"
+
+
+class WordStore:
+    """Parallel start/end/token arrays with an interned word table"""
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, tokens: np.ndarray, vocab: np.ndarray):
+        order = np.argsort(starts, kind='stable')
+        self.starts = np.asarray(starts, dtype=np.float32)[order]
+        self.ends = np.asarray(ends, dtype=np.float32)[order]
+        self.tokens = np.asarray(tokens, dtype=np.int32)[order]
+        self.vocab = np.asarray(vocab, dtype=str)
+        # Running max of end times lets overlap queries binary-search the left edge
+        self._end_max = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+    @classmethod
+    def from_words(cls, words) -> 'WordStore':
+        """Build from a list of Word records"""
+        if isinstance(words, WordStore):
+            return words
+
+        vocab_index = {}
+        vocab = []
+        starts, ends, tokens = [], [], []
+
+        for word in words or []:
+            token = vocab_index.get(word.word)
+            if token is None:
+                token = vocab_index[word.word] = len(vocab)
+                vocab.append(word.word)
+
+            starts.append(word.start)
+            ends.append(word.end)
+            tokens.append(token)
+
+        return cls(np.array(starts), np.array(ends), np.array(tokens), np.array(vocab, dtype=str))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Word]:
+        """Yield words as Word records (compatibility with code expecting the list form)"""
+        for i in range(len(self)):
+            yield Word(str(self.vocab[self.tokens[i]]), round(float(self.starts[i]), 3), round(float(self.ends[i]), 3))
+
+    def overlapping(self, start_time: float, end_time: float, inclusive: bool = False) -> np.ndarray:
+        """
+        Indices of words overlapping [start_time, end_time].
+
+        Strict: word.start < end_time and word.end > start_time
+        Inclusive: word.start <= end_time and word.end >= start_time
+        """
+        if inclusive:
+            lo = int(np.searchsorted(self._end_max, start_time, side='left'))
+            hi = int(np.searchsorted(self.starts, end_time, side='right'))
+            if hi <= lo:
+                return np.zeros(0, dtype=np.int64)
+            keep = self.ends[lo:hi] >= start_time
+        else:
+            lo = int(np.searchsorted(self._end_max, start_time, side='right'))
+            hi = int(np.searchsorted(self.starts, end_time, side='left'))
+            if hi <= lo:
+                return np.zeros(0, dtype=np.int64)
+            keep = self.ends[lo:hi] > start_time
+        return lo + np.flatnonzero(keep)
+
+    def texts(self, indices: np.ndarray = None) -> List[str]:
+        """Word texts for the given indices (all words when None)"""
+        tokens = self.tokens if indices is None else self.tokens[indices]
+        return self.vocab[tokens].tolist() if len(tokens) else []
+
+    def text_between(self, start_time: float, end_time: float, inclusive: bool = False) -> str:
+        """Space-joined words overlapping the time range"""
+        return ' '.join(self.texts(self.overlapping(start_time, end_time, inclusive)))
+
+    def save(self, path: str):
+        """Save as a compressed .npz"""
+        np.savez_compressed(path, starts=self.starts, ends=self.ends, tokens=self.tokens, vocab=self.vocab)
+
+    @classmethod
+    def load(cls, path: str) -> 'WordStore':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['starts'], data['ends'], data['tokens'], data['vocab'])
@@ -0,0 +1,68 @@
+"""
+Spectral-peak fingerprints (audio_fingerprint): a re-used stretch of audio is found at the right offset.
+
+Run from video-processing/:  python -m pytest -q test
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from audio_fingerprint import (
+    FRAME_SECONDS, HOP, OFFSET_TOLERANCE, SAMPLE_RATE, AudioFingerprintIndex, fingerprint_samples, subtract_spans
+)
+
+
+def tone_sequence(seconds, seed):
+    """Random chords changing every 100 ms over low noise, as int16 PCM"""
+    rng = np.random.default_rng(seed)
+    step = SAMPLE_RATE // 10
+    t = np.arange(step) / SAMPLE_RATE
+    pieces = []
+    for _ in range(int(seconds * 10)):
+        freqs = rng.uniform(200, 3500, size=3)
+        pieces.append(sum(np.sin(2 * np.pi * f * t) for f in freqs))
+    signal = np.concatenate(pieces) * 0.2 + rng.normal(0, 0.01, size=len(pieces) * step)
+    return (signal * 32767).astype(np.int16)
+
+
+def test_reused_audio_matches_with_its_offset(tmp_path):
+    source = tone_sequence(60, seed=1)
+    # The new video: 470 hops of other audio, then the source from hop 312 on for ~40 s
+    prefix = tone_sequence(470 * HOP / SAMPLE_RATE, seed=2)[:470 * HOP]
+    reused = source[312 * HOP:312 * HOP + 40 * SAMPLE_RATE]
+    new_audio = np.concatenate([prefix, reused])
+
+    index = AudioFingerprintIndex(str(tmp_path / 'audio_fingerprints.sqlite'))
+    try:
+        index.add_source('Disc_1', fingerprint_samples(source))
+        matches = index.find_matches(fingerprint_samples(new_audio), exclude='Disc_2')
+        assert index.find_matches(fingerprint_samples(new_audio), exclude='Disc_1') == []
+    finally:
+        index.close()
+
+    assert len(matches) == 1
+    match = matches[0]
+    assert match.source == 'Disc_1'
+    # Votes within OFFSET_TOLERANCE frames of the true shift count as one offset
+    assert abs(match.offset - (312 - 470) * FRAME_SECONDS) <= OFFSET_TOLERANCE * FRAME_SECONDS + 1e-6
+    assert abs(match.start - 470 * FRAME_SECONDS) < 3.0
+    assert abs(match.end - len(new_audio) / SAMPLE_RATE) < 3.0
+
+
+def test_unrelated_audio_does_not_match(tmp_path):
+    index = AudioFingerprintIndex(str(tmp_path / 'audio_fingerprints.sqlite'))
+    try:
+        index.add_source('Disc_1', fingerprint_samples(tone_sequence(60, seed=1)))
+        assert index.find_matches(fingerprint_samples(tone_sequence(60, seed=3))) == []
+    finally:
+        index.close()
+
+
+def test_subtract_spans():
+    assert subtract_spans([(0, 100)], [(10, 20), (50, 60)]) == [(0, 10), (20, 50), (60, 100)]
+    assert subtract_spans([(0, 100)], [(0.5, 99.5)]) == []
+    assert subtract_spans([(0, 10), (20, 30)], []) == [(0, 10), (20, 30)]
@@ -0,0 +1,54 @@
+"""
+Token-budget packing of vision batches (batch_planner.plan_batches).
+
+Run from video-processing/:  python -m pytest -q test
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from batch_planner import (
+    MIN_COMPLETION_TOKENS, OUTPUT_OVERHEAD_TOKENS, OUTPUT_TOKENS_PER_FRAME, PROMPT_TOKENS,
+    completion_tokens_for, estimate_frame_tokens, plan_batches
+)
+
+
+def test_batches_cover_every_frame_in_order_under_the_input_ceiling():
+    frame_tokens = [estimate_frame_tokens('word ' * (i % 7) * 40) for i in range(200)]
+    plans = plan_batches(frame_tokens, PROMPT_TOKENS, input_ceiling=4000)
+
+    assert plans[0].start == 0 and plans[-1].end == len(frame_tokens)
+    assert all(a.end == b.start for a, b in zip(plans, plans[1:]))
+    for plan in plans:
+        assert plan.input_tokens == PROMPT_TOKENS + sum(frame_tokens[plan.start:plan.end])
+        assert plan.input_tokens <= 4000
+
+
+def test_batches_end_where_the_next_frame_would_overflow():
+    plans = plan_batches([100] * 10, 50, input_ceiling=360, max_frames=48)
+    # 50 + 3 * 100 fits, a fourth frame would not
+    assert [plan.frame_count for plan in plans] == [3, 3, 3, 1]
+
+
+def test_quiet_frames_are_limited_by_frame_count_and_expected_output():
+    plans = plan_batches([estimate_frame_tokens('')] * 100, PROMPT_TOKENS, max_frames=20)
+    assert [plan.frame_count for plan in plans] == [20] * 5
+
+    output_frames = (2000 - OUTPUT_OVERHEAD_TOKENS) // OUTPUT_TOKENS_PER_FRAME
+    plans = plan_batches([10] * 50, 0, output_ceiling=2000)
+    assert max(plan.frame_count for plan in plans) == output_frames
+
+
+def test_oversized_frame_gets_a_batch_of_its_own():
+    plans = plan_batches([100, 9000, 100], 0, input_ceiling=1000)
+    assert [(plan.start, plan.end) for plan in plans] == [(0, 1), (1, 2), (2, 3)]
+    assert plans[1].input_tokens == 9000
+
+
+def test_completion_tokens_scale_with_frames():
+    assert completion_tokens_for(1) == MIN_COMPLETION_TOKENS
+    assert completion_tokens_for(30) > completion_tokens_for(20) > (
+        OUTPUT_OVERHEAD_TOKENS + 20 * OUTPUT_TOKENS_PER_FRAME)
+    assert plan_batches([], PROMPT_TOKENS) == []
@@ -0,0 +1,113 @@
+"""
+Offline batch session: defer -> submit -> ingest -> replay, with a canned responder.
+
+Run from video-processing/:  python -m pytest -q test
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import openai_gateway
+import rate_budget
+from batch_submission import DeferredRequest, LocalBatchSubmitter, OfflineBatchSession
+
+
+def canned_completion(body: dict) -> dict:
+    """Chat completion answering with the request's last message, as the Batch API would return it"""
+    return {
+        'id': 'chatcmpl-canned',
+        'object': 'chat.completion',
+        'created': 0,
+        'model': body['model'],
+        'choices': [{
+            'index': 0,
+            'finish_reason': 'stop',
+            'message': {'role': 'assistant', 'content': f"answer to {body['messages'][-1]['content']}"}
+        }],
+        'usage': {'prompt_tokens': 10, 'completion_tokens': 3, 'total_tokens': 13}
+    }
+
+
+class NotSent:
+    """An SDK resource stand-in that fails if a deferred kind is ever sent live"""
+
+    @property
+    def with_raw_response(self):
+        raise AssertionError("request was sent instead of deferred or replayed")
+
+
+class RawTranscriptions:
+    """audio.transcriptions stand-in returning text, counting live calls"""
+
+    def __init__(self):
+        self.calls = 0
+        self.with_raw_response = self
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(headers={}, parse=lambda: 'spoken words', text='spoken words')
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_budget, '_budget', rate_budget.RateBudget(str(tmp_path / 'rate_budget.sqlite')))
+    monkeypatch.setattr(openai_gateway, '_controller', None)
+    session = OfflineBatchSession(str(tmp_path / 'offline'))
+    monkeypatch.setattr(openai_gateway, '_offline_session', session)
+    return session
+
+
+def vision_request(text):
+    return {'model': 'gpt-5.1', 'messages': [{'role': 'user', 'content': text}]}
+
+
+def test_deferred_requests_are_submitted_ingested_and_replayed(session, tmp_path):
+    pytest.importorskip('openai')
+
+    for text in ('frame batch 1', 'frame batch 2'):
+        with pytest.raises(DeferredRequest):
+            openai_gateway.call_openai('vision', NotSent(), **vision_request(text))
+    # Deferring the same request again does not queue it twice
+    with pytest.raises(DeferredRequest):
+        openai_gateway.call_openai('vision', NotSent(), **vision_request('frame batch 1'))
+    assert session.pending_count() == 2
+
+    submitter = LocalBatchSubmitter(str(tmp_path / 'local_batches'), canned_completion)
+    succeeded, failed = session.run_round(submitter, log=lambda message: None)
+    assert (succeeded, failed) == (2, 0)
+    assert session.pending_count() == 0
+
+    response = openai_gateway.call_openai('vision', NotSent(), **vision_request('frame batch 2'))
+    assert response.choices[0].message.content == 'answer to frame batch 2'
+    assert response.usage.total_tokens == 13
+
+
+def test_failed_batch_lines_are_submitted_again(session, tmp_path):
+    with pytest.raises(DeferredRequest):
+        openai_gateway.call_openai('synthesis', NotSent(), **vision_request('synthesize'))
+
+    def refuse(body):
+        raise RuntimeError("server error")
+
+    succeeded, failed = session.run_round(LocalBatchSubmitter(str(tmp_path / 'refused'), refuse), log=lambda message: None)
+    assert (succeeded, failed) == (0, 1)
+    assert session.pending_count() == 1
+    # Back in the unsubmitted pool for the next round
+    assert [len(keys) for _, keys in session.write_batch_files()] == [1]
+
+
+def test_transcription_runs_live_once_then_replays(session):
+    transcriptions = RawTranscriptions()
+    kwargs = {'model': 'gpt-4o-transcribe', 'response_format': 'text', 'prompt': 'archival footage'}
+
+    first = openai_gateway.call_openai('transcription', transcriptions, **kwargs)
+    second = openai_gateway.call_openai('transcription', transcriptions, **kwargs)
+
+    assert first == second == 'spoken words'
+    assert transcriptions.calls == 1
+    assert session.pending_count() == 0
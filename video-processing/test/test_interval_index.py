@@ -0,0 +1,49 @@
+"""
+Overlap queries over speaker turns (interval_index.IntervalIndex) against a linear scan.
+
+Run from video-processing/:  python -m pytest -q test
+"""
+
+import os
+import random
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from interval_index import IntervalIndex
+
+
+def turn(start, end, label='A'):
+    return SimpleNamespace(start=start, end=end, label=label)
+
+
+def test_overlapping_matches_a_linear_scan():
+    rng = random.Random(7)
+    turns = []
+    for _ in range(400):
+        start = rng.uniform(0, 3600)
+        turns.append(turn(start, start + rng.choice([0.0, rng.uniform(0.5, 30), rng.uniform(60, 600)])))
+    index = IntervalIndex(turns)
+
+    for _ in range(300):
+        start = rng.uniform(-10, 3700)
+        end = start + rng.uniform(0, 120)
+        expected = sorted((t for t in turns if t.start <= end and t.end >= start), key=lambda t: t.start)
+        assert index.overlapping(start, end) == expected
+
+
+def test_bounds_are_inclusive_and_results_in_start_order():
+    a, b, c = turn(10, 20, 'A'), turn(0, 100, 'B'), turn(20, 25, 'C')
+    index = IntervalIndex([a, c, b])
+
+    assert [t.label for t in index] == ['B', 'A', 'C']
+    assert index.overlapping(20, 20) == [b, a, c]
+    assert index.overlapping(25.5, 30) == [b]
+    assert index.overlapping(101, 200) == []
+
+
+def test_empty_index():
+    index = IntervalIndex(None)
+    assert len(index) == 0
+    assert index.overlapping(0, 10) == []
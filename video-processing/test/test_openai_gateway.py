@@ -0,0 +1,225 @@
+"""
+acall_openai() against in-memory raw-response resources and, when httpx is
+installed, the real SDK over a mock HTTP transport (no network, no API key).
+
+Run from video-processing/:  python -m pytest -q test
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import openai_gateway
+import rate_budget
+
+
+COMPLETION = {
+    'id': 'chatcmpl-test',
+    'object': 'chat.completion',
+    'created': 0,
+    'model': 'gpt-5.1',
+    'choices': [{
+        'index': 0,
+        'finish_reason': 'stop',
+        'message': {'role': 'assistant', 'content': '{"ok": true}'}
+    }],
+    'usage': {
+        'prompt_tokens': 2048,
+        'completion_tokens': 5,
+        'total_tokens': 2053,
+        'prompt_tokens_details': {'cached_tokens': 1024}
+    }
+}
+
+
+@pytest.fixture(autouse=True)
+def isolated_gateway(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_budget, '_budget', rate_budget.RateBudget(str(tmp_path / 'rate_budget.sqlite')))
+    monkeypatch.setattr(openai_gateway, '_controller', None)
+    monkeypatch.setattr(openai_gateway, '_offline_session', None)
+    monkeypatch.setattr(openai_gateway, 'backoff_delay', lambda attempt, retry_after=0.0: 0.0)
+
+
+class APIError(Exception):
+    """An SDK-style error carrying an HTTP status"""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+class AsyncRawResource:
+    """resource.with_raw_response.create() stand-in: fails with the queued errors, then answers"""
+
+    def __init__(self, *errors, delay=0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+        self.with_raw_response = self
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        usage = SimpleNamespace(prompt_tokens=2048, completion_tokens=5, total_tokens=2053,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=1024))
+        parsed = SimpleNamespace(content='{"ok": true}', usage=usage)
+        # Legacy raw-response wrapper: parse() and text are synchronous even on AsyncOpenAI
+        return SimpleNamespace(headers={'x-ratelimit-remaining-requests': '100'}, parse=lambda: parsed, text='{}')
+
+
+def test_acall_openai_parses_and_releases_its_slot():
+    resource = AsyncRawResource()
+    response = asyncio.run(openai_gateway.acall_openai('synthesis', resource, model='gpt-5.1', messages=[]))
+
+    assert response.content == '{"ok": true}'
+    controller = openai_gateway.get_controller()
+    assert controller.in_flight == 0
+    assert controller.snapshot()['prompt_cache']['synthesis']['cached_tokens'] == 1024
+
+
+def test_acall_openai_retries_transient_errors_only():
+    resource = AsyncRawResource(APIError(429, {'retry-after': '0'}), APIError(503))
+    asyncio.run(openai_gateway.acall_openai('vision', resource, model='gpt-5.1', messages=[]))
+    assert resource.calls == 3
+    assert openai_gateway.get_controller().stats['rate_limited'] == 1
+
+    invalid = AsyncRawResource(APIError(400))
+    with pytest.raises(APIError):
+        asyncio.run(openai_gateway.acall_openai('vision', invalid, model='gpt-5.1', messages=[]))
+    assert invalid.calls == 1
+    assert openai_gateway.get_controller().in_flight == 0
+
+
+def test_acall_openai_gives_up_after_max_attempts():
+    resource = AsyncRawResource(*[APIError(500) for _ in range(5)])
+    with pytest.raises(APIError):
+        asyncio.run(openai_gateway.acall_openai('vision', resource, max_attempts=2, model='gpt-5.1', messages=[]))
+    assert resource.calls == 2
+
+
+def test_cancelled_request_releases_its_slot():
+    resource = AsyncRawResource(delay=10.0)
+
+    async def run():
+        task = asyncio.ensure_future(openai_gateway.acall_openai('vision', resource, model='gpt-5.1', messages=[]))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert openai_gateway.get_controller().in_flight == 0
+
+
+def mock_client(handler):
+    httpx = pytest.importorskip('httpx')
+    openai = pytest.importorskip('openai')
+    return openai.AsyncOpenAI(
+        api_key='test', max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+
+def test_acall_openai_returns_parsed_completion():
+    httpx = pytest.importorskip('httpx')
+
+    def handler(request):
+        return httpx.Response(200, json=COMPLETION, headers={'x-ratelimit-remaining-requests': '100'})
+
+    async def run():
+        client = mock_client(handler)
+        return await openai_gateway.acall_openai(
+            'synthesis', client.chat.completions, model='gpt-5.1', messages=[{'role': 'user', 'content': 'hi'}]
+        )
+
+    response = asyncio.run(run())
+    assert response.choices[0].message.content == '{"ok": true}'
+
+    controller = openai_gateway.get_controller()
+    assert controller.in_flight == 0
+    assert controller.stats['calls'] == 1
+    assert controller.snapshot()['prompt_cache']['synthesis']['cached_tokens'] == 1024
+
+
+def test_acall_openai_retries_rate_limit():
+    httpx = pytest.importorskip('httpx')
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, json={'error': {'message': 'slow down', 'type': 'rate_limit'}})
+        return httpx.Response(200, json=COMPLETION)
+
+    async def run():
+        client = mock_client(handler)
+        return await openai_gateway.acall_openai(
+            'vision', client.chat.completions, model='gpt-5.1', messages=[{'role': 'user', 'content': 'hi'}]
+        )
+
+    response = asyncio.run(run())
+    assert response.choices[0].message.content == '{"ok": true}'
+    assert len(calls) == 2
+
+    controller = openai_gateway.get_controller()
+    assert controller.in_flight == 0
+    assert controller.stats['rate_limited'] == 1
+
+
+def test_cancelled_waiter_returns_its_slot():
+    controller = openai_gateway.AdaptiveConcurrencyController(initial=1, minimum=1, maximum=1)
+
+    async def run():
+        await controller.acquire_async()            # takes the only slot
+        waiter = asyncio.ensure_future(controller.acquire_async())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        controller.release('vision', 0.1)           # the waiting thread takes the slot, then hands it back
+        for _ in range(100):
+            if controller.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert controller.in_flight == 0
+
+
+def test_openai_transcription_backend_awaits_async_client(tmp_path, monkeypatch):
+    httpx = pytest.importorskip('httpx')
+    import transcription_backends
+
+    audio_path = tmp_path / 'chunk.mp3'
+    audio_path.write_bytes(b'\0' * 64)
+    models = []
+
+    def handler(request):
+        body = request.read()
+        if b'whisper-1' in body:
+            models.append('whisper-1')
+            return httpx.Response(200, json={
+                'text': 'Pete Dye', 'language': 'english', 'duration': 1.0,
+                'words': [{'word': 'Pete', 'start': 0.1, 'end': 0.4}, {'word': 'Dye', 'start': 0.4, 'end': 0.8}]
+            })
+        models.append('gpt-4o-transcribe')
+        return httpx.Response(200, text='Pete Dye', headers={'content-type': 'text/plain'})
+
+    client = mock_client(handler)
+    monkeypatch.setattr(transcription_backends, 'get_async_client', lambda api_key=None: client)
+
+    backend = transcription_backends.OpenAITranscriptionBackend('test')
+    text, words = asyncio.run(backend.transcribe(str(audio_path)))
+
+    assert models == ['gpt-4o-transcribe', 'whisper-1']
+    assert text.strip() == 'Pete Dye'
+    assert [(word.word, word.start) for word in words] == [('Pete', 0.1), ('Dye', 0.4)]
+    assert openai_gateway.get_controller().in_flight == 0
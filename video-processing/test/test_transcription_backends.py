@@ -0,0 +1,130 @@
+"""
+Transcription backends: the OpenAI backend on AsyncOpenAI, and overflow to the
+local engine while the API is rate-limited (OverflowTranscriptionBackend).
+
+Run from video-processing/:  python -m pytest -q test
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import openai_gateway
+import rate_budget
+import transcription_backends
+from records import Word
+from transcription_backends import OpenAITranscriptionBackend, OverflowTranscriptionBackend, TranscriptionBackend
+
+
+class APIError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FakeBackend(TranscriptionBackend):
+    def __init__(self, name, *errors):
+        self.name = name
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def transcribe(self, audio_path, prompt="", word_prompt=""):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"{self.name} text", [Word('word', 0.0, 0.5)]
+
+
+@pytest.fixture(autouse=True)
+def isolated_gateway(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_budget, '_budget', rate_budget.RateBudget(str(tmp_path / 'rate_budget.sqlite')))
+    monkeypatch.setattr(openai_gateway, '_controller', None)
+    monkeypatch.setattr(openai_gateway, '_offline_session', None)
+    monkeypatch.setattr(openai_gateway, 'backoff_delay', lambda attempt, retry_after=0.0: 0.0)
+
+
+def transcribe(backend):
+    return asyncio.run(backend.transcribe('audio.mp3'))[0]
+
+
+def test_primary_is_used_while_healthy():
+    primary, local = FakeBackend('openai'), FakeBackend('local')
+    backend = OverflowTranscriptionBackend(primary, local)
+
+    assert transcribe(backend) == 'openai text'
+    assert transcribe(backend) == 'openai text'
+    assert (primary.calls, local.calls, backend.overflow_count) == (2, 0, 0)
+
+
+def test_rate_limit_overflows_for_the_cooldown():
+    primary, local = FakeBackend('openai', APIError(429)), FakeBackend('local')
+    backend = OverflowTranscriptionBackend(primary, local, cooldown=60.0)
+
+    assert transcribe(backend) == 'local text'
+    # Inside the cooldown the primary is not tried at all
+    assert transcribe(backend) == 'local text'
+    assert (primary.calls, local.calls, backend.overflow_count) == (1, 2, 2)
+
+    backend._limited_until = time.time() - 1
+    assert transcribe(backend) == 'openai text'
+
+
+def test_other_transient_errors_overflow_one_request():
+    primary, local = FakeBackend('openai', APIError(503)), FakeBackend('local')
+    backend = OverflowTranscriptionBackend(primary, local)
+
+    assert transcribe(backend) == 'local text'
+    assert transcribe(backend) == 'openai text'
+
+
+def test_invalid_requests_are_raised():
+    backend = OverflowTranscriptionBackend(FakeBackend('openai', APIError(400)), FakeBackend('local'))
+    with pytest.raises(APIError):
+        transcribe(backend)
+    assert backend.overflow_count == 0
+
+
+def test_gateway_pause_skips_the_primary():
+    primary, local = FakeBackend('openai'), FakeBackend('local')
+    backend = OverflowTranscriptionBackend(primary, local)
+    openai_gateway.get_controller()._paused_until = time.time() + 60
+
+    assert transcribe(backend) == 'local text'
+    assert primary.calls == 0
+
+
+class RawTranscriptions:
+    """async audio.transcriptions with the legacy raw-response wrapper"""
+
+    def __init__(self):
+        self.models = []
+        self.with_raw_response = self
+
+    async def create(self, **kwargs):
+        self.models.append(kwargs['model'])
+        if kwargs['model'] == 'whisper-1':
+            parsed = SimpleNamespace(words=[{'word': 'Pete', 'start': 0.1, 'end': 0.4},
+                                            {'word': 'Dye', 'start': 0.4, 'end': 0.8}])
+        else:
+            parsed = 'Pete Dye'
+        return SimpleNamespace(headers={}, parse=lambda: parsed, text='')
+
+
+def test_openai_backend_awaits_the_async_client(tmp_path, monkeypatch):
+    transcriptions = RawTranscriptions()
+    client = SimpleNamespace(audio=SimpleNamespace(transcriptions=transcriptions))
+    monkeypatch.setattr(transcription_backends, 'get_async_client', lambda api_key=None: client)
+    audio_path = tmp_path / 'chunk.mp3'
+    audio_path.write_bytes(b'\0' * 64)
+
+    text, words = asyncio.run(OpenAITranscriptionBackend('test').transcribe(str(audio_path)))
+
+    assert transcriptions.models == ['gpt-4o-transcribe', 'whisper-1']
+    assert text == 'Pete Dye'
+    assert [(word.word, word.start, word.end) for word in words] == [('Pete', 0.1, 0.4), ('Dye', 0.4, 0.8)]
@@ -0,0 +1,75 @@
+"""
+On-disk LRU of vision responses (vision_cache.VisionCache).
+
+Run from video-processing/:  python -m pytest -q test
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from vision_cache import VisionCache
+
+
+def request(image_b64='aGVsbG8=', prompt='Describe the frames', **params):
+    return dict({
+        'model': 'gpt-5.1',
+        'messages': [{'role': 'user', 'content': [
+            {'type': 'text', 'text': prompt},
+            {'type': 'image_url', 'image_url': {'url': f"data:image/jpeg;base64,{image_b64}", 'detail': 'low'}}
+        ]}]
+    }, **params)
+
+
+def test_key_depends_on_images_prompt_and_parameters():
+    key = VisionCache.key(request())
+    assert VisionCache.key(request()) == key
+    assert VisionCache.key(request(image_b64='d29ybGQ=')) != key
+    assert VisionCache.key(request(prompt='Describe the scene')) != key
+    assert VisionCache.key(request(max_completion_tokens=2000)) != key
+
+
+def test_get_put_and_counters(tmp_path):
+    cache = VisionCache(str(tmp_path))
+    key = VisionCache.key(request())
+
+    assert cache.get(key) is None
+    cache.put(key, '{"frames": []}', model='gpt-5.1')
+    assert cache.get(key) == '{"frames": []}'
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    # A new cache over the same directory picks the entry up
+    assert VisionCache(str(tmp_path)).get(key) == '{"frames": []}'
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    content = 'x' * 900
+    probe = VisionCache(str(tmp_path / 'probe'))
+    probe.put('probe', content)
+    entry_bytes = probe.stats()['bytes']
+
+    # Room for three entries; the fourth forces eviction down to 90% of the bound
+    cache = VisionCache(str(tmp_path / 'cache'), max_bytes=int(entry_bytes * 3.5))
+    for age, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, content)
+        os.utime(os.path.join(cache.directory, f"{key}.json"), (1000 + age, 1000 + age))
+
+    assert cache.get('a') == content          # a is now the most recently used
+    cache.put('d', content)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == content
+    assert cache.get('c') == content
+    assert cache.get('d') == content
+    on_disk = sum(entry.stat().st_size for entry in os.scandir(cache.directory))
+    assert cache.stats()['bytes'] == on_disk
+
+
+def test_overwriting_an_entry_counts_its_bytes_once(tmp_path):
+    cache = VisionCache(str(tmp_path))
+    for content in ('first answer', 'a longer second answer', 'third'):
+        cache.put('same-key', content)
+
+    assert cache.get('same-key') == 'third'
+    on_disk = sum(entry.stat().st_size for entry in os.scandir(cache.directory))
+    assert cache.stats()['bytes'] == on_disk
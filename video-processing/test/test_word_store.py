@@ -0,0 +1,66 @@
+"""
+Columnar word timestamps (word_store.WordStore): .npz round trip and time-range slices.
+
+Run from video-processing/:  python -m pytest -q test
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from records import Word
+from word_store import WordStore
+
+
+def sample_words(count=500, seed=3):
+    rng = random.Random(seed)
+    words, t = [], 0.0
+    for _ in range(count):
+        t += rng.uniform(0.05, 1.5)
+        words.append(Word(rng.choice(['Pete', 'Dye', 'the', 'course', 'bulldozer', 'green']),
+                          round(t, 3), round(t + rng.uniform(0.1, 0.8), 3)))
+    return words
+
+
+def test_save_load_round_trip(tmp_path):
+    words = sample_words()
+    store = WordStore.from_words(list(reversed(words)))
+    path = str(tmp_path / 'words.npz')
+    store.save(path)
+    loaded = WordStore.load(path)
+
+    assert len(loaded) == len(words)
+    assert [w.word for w in loaded] == [w.word for w in words]
+    assert all(abs(a.start - b.start) < 1e-3 and abs(a.end - b.end) < 1e-3 for a, b in zip(loaded, words))
+    # The vocabulary is interned once per distinct word
+    assert sorted(loaded.vocab.tolist()) == sorted({w.word for w in words})
+
+
+def test_overlapping_matches_a_linear_scan():
+    words = sample_words()
+    store = WordStore.from_words(words)
+    rng = random.Random(11)
+
+    for _ in range(200):
+        start = rng.uniform(-5, words[-1].end + 5)
+        end = start + rng.uniform(0, 30)
+        strict = [i for i, w in enumerate(words) if w.start < end and w.end > start]
+        inclusive = [i for i, w in enumerate(words) if w.start <= end and w.end >= start]
+        assert store.overlapping(start, end).tolist() == strict
+        assert store.overlapping(start, end, inclusive=True).tolist() == inclusive
+
+
+def test_text_between_edges():
+    store = WordStore.from_words([Word('Pete', 1.0, 1.5), Word('Dye', 1.5, 2.0), Word('course', 4.0, 4.5)])
+
+    assert store.text_between(1.5, 4.0) == 'Dye'
+    assert store.text_between(1.5, 4.0, inclusive=True) == 'Pete Dye course'
+    assert store.text_between(2.5, 3.5) == ''
+    assert WordStore.from_words([]).text_between(0, 10) == ''
+
+
+def test_equal_words_hash_alike():
+    assert Word('Dye', 1.0, 1.5) == Word('Dye', 1.0, 1.5)
+    assert len({Word('Dye', 1.0, 1.5), Word('Dye', 1.0, 1.5), Word('Dye', 2.0, 2.5)}) == 2